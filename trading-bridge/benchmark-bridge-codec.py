@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Bridge Codec Benchmark
+Compares encode/decode cost and bytes-on-wire of bridge encodings for a
+100-signal GET_SIGNALS response
+"""
+import sys
+import json
+import timeit
+from dataclasses import asdict
+from pathlib import Path
+
+# Add python directory to path
+sys.path.insert(0, str(Path(__file__).parent / "python"))
+
+from bridge.signal_manager import TradeSignal
+from bridge.codec import CODECS
+
+BATCH_SIZE = 100
+ITERATIONS = 2000
+
+
+def build_signals(count: int):
+    """Build a realistic batch of signals"""
+    symbols = ['EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD', 'BTCUSD']
+    signals = []
+    for i in range(count):
+        signals.append(TradeSignal(
+            symbol=symbols[i % len(symbols)],
+            action='BUY' if i % 2 == 0 else 'SELL',
+            broker='EXNESS',
+            lot_size=0.01 * (1 + i % 10),
+            stop_loss=1.0850 if i % 2 == 0 else 1.0950,
+            take_profit=1.0950 if i % 2 == 0 else 1.0850,
+            comment=f"AI Signal #{i} (confidence: 0.{70 + i % 30})",
+            signal_id=f"signal_{i}"
+        ))
+    return signals
+
+
+def legacy_to_dict(signal: TradeSignal):
+    """Signal serialization used before the codec change (asdict)"""
+    data = asdict(signal)
+    data['timestamp'] = data['timestamp'].isoformat()
+    return data
+
+
+def bench(label: str, encode, decode):
+    """Time encode/decode and report payload size"""
+    payload = encode()
+    encode_us = timeit.timeit(encode, number=ITERATIONS) / ITERATIONS * 1e6
+    decode_us = timeit.timeit(lambda: decode(payload), number=ITERATIONS) / ITERATIONS * 1e6
+    print(f"  {label:<22} {encode_us:>10.1f} {decode_us:>10.1f} {len(payload):>10}")
+    return {'encode_us': encode_us, 'decode_us': decode_us, 'bytes': len(payload)}
+
+
+def main():
+    """Run benchmark"""
+    signals = build_signals(BATCH_SIZE)
+
+    print("=" * 60)
+    print(f"Bridge codec benchmark ({BATCH_SIZE}-signal GET_SIGNALS, {ITERATIONS} iterations)")
+    print("=" * 60)
+    print(f"  {'encoding':<22} {'encode us':>10} {'decode us':>10} {'bytes':>10}")
+
+    results = {}
+    results['json (asdict)'] = bench(
+        'json (asdict)',
+        lambda: json.dumps({
+            'status': 'OK',
+            'signals': [legacy_to_dict(s) for s in signals],
+            'queue_size': 0
+        }).encode('utf-8'),
+        json.loads
+    )
+
+    for name, codec in CODECS.items():
+        results[name] = bench(
+            name,
+            lambda codec=codec: codec.encode({
+                'status': 'OK',
+                'signals': [s.to_dict() for s in signals],
+                'queue_size': 0
+            }),
+            codec.decode
+        )
+
+    if 'msgpack' not in CODECS:
+        print("\n  msgpack not installed - pip install msgpack to compare binary encoding")
+
+    print()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Bridge Load Benchmark
+Runs MQL5Bridge in its own process, drives it with simulated EA clients
+(REQ or DEALER sockets speaking the PythonBridge.mqh protocol) at
+configurable signal, poll and heartbeat rates, and reports throughput,
+round-trip and signal delivery latency, and bridge CPU per request as JSON
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+# Add python directory to path
+sys.path.insert(0, str(Path(__file__).parent / "python"))
+
+import zmq
+
+from bridge.metrics import LatencyHistogram
+
+# Time allowed for spawned processes to import and connect before the run
+STARTUP_DELAY = 2.0
+BROKER = 'EXNESS'
+SYMBOLS = ['EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD']
+
+
+# ===== Bridge process =====
+
+def run_bridge(conn, port: int, mode: str, workers: int, use_async: bool,
+               signal_rate: float, log_level: str):
+    """
+    Serve the bridge and produce signals until told to stop
+
+    Protocol over `conn`: send 'ready' (or an error dict), receive the run
+    start time, produce signals from then on, receive 'stop', send results.
+    """
+    from bridge.mql5_bridge import MQL5Bridge
+    from bridge.async_bridge import AsyncMQL5Bridge
+    from bridge.signal_manager import TradeSignal
+    # The bridge logs every queued/sent signal at INFO, which would dominate CPU per request
+    logging.getLogger().setLevel(log_level)
+
+    bridge_class = AsyncMQL5Bridge if use_async else MQL5Bridge
+    bridge = bridge_class(port=port, mode=mode, workers=workers)
+    threading.Thread(target=bridge.start, daemon=True).start()
+    if not bridge.wait_ready(timeout=10) or not bridge.running:
+        conn.send({'error': f"bridge failed to start on port {port}"})
+        return
+    conn.send('ready')
+
+    start_at = conn.recv()
+    stop = threading.Event()
+    produced = {'sent': 0, 'rejected': 0, 'cpu': 0.0}
+
+    def producer():
+        if signal_rate <= 0:
+            return
+        interval = 1.0 / signal_rate
+        next_send = start_at
+        cpu_started = time.thread_time()
+        n = 0
+        while not stop.is_set():
+            delay = next_send - time.time()
+            if delay > 0:
+                stop.wait(delay)
+                continue
+            ok, _ = bridge.send_signal(TradeSignal(
+                symbol=SYMBOLS[n % len(SYMBOLS)], action='BUY' if n % 2 == 0 else 'SELL',
+                broker=BROKER, lot_size=0.01, signal_id=f"load_{n}"))
+            produced['sent' if ok else 'rejected'] += 1
+            n += 1
+            next_send += interval
+        produced['cpu'] = time.thread_time() - cpu_started
+
+    thread = threading.Thread(target=producer, daemon=True)
+    thread.start()
+    time.sleep(max(0.0, start_at - time.time()))
+    cpu_started = time.process_time()
+    bridge.request_latency.reset()
+
+    conn.recv()  # 'stop'
+    stop.set()
+    thread.join()
+    # Bridge CPU excludes the load producer; it is the caller's work, not the bridge's
+    cpu = time.process_time() - cpu_started - produced['cpu']
+    served = bridge.request_latency.count
+    results = {
+        'signals_sent': produced['sent'],
+        'signals_rejected': produced['rejected'],
+        'signals_queued': bridge.signal_manager.get_queue_size(),
+        'requests_served': served,
+        'cpu_seconds': round(cpu, 4),
+        'cpu_us_per_request': round(cpu / served * 1e6, 2) if served else None,
+        'server_latency': bridge.request_latency.snapshot(),
+        'stats': dict(bridge.stats)
+    }
+    bridge.stop()
+    conn.send(results)
+
+
+# ===== Simulated EAs =====
+
+class EAClient:
+    """One simulated EA: polls GET_SIGNALS, heartbeats and ACKs like PythonBridge.mqh"""
+
+    def __init__(self, context, index: int, port: int, options: dict):
+        """
+        Initialize EAClient
+
+        Args:
+            context: ZeroMQ context of the client process
+            index: Client number (used as terminal name)
+            port: Bridge port
+            options: Run options (see parse_args)
+        """
+        self.context = context
+        self.address = f"tcp://127.0.0.1:{port}"
+        self.dealer = options['socket'] == 'dealer'
+        self.options = options
+        self.terminal = f"load-{index}"
+        self.socket = None
+        self.round_trip = LatencyHistogram()
+        self.delivery = LatencyHistogram()
+        self.requests = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.signal_ids = []
+
+    def _connect(self):
+        """(Re)create the socket; a REQ socket is unusable after a lost reply"""
+        if self.socket is not None:
+            self.socket.close(linger=0)
+        self.socket = self.context.socket(zmq.DEALER if self.dealer else zmq.REQ)
+        self.socket.setsockopt(zmq.LINGER, 0)
+        self.socket.connect(self.address)
+
+    def _round_trip(self, request: dict):
+        """Send one request and wait for its reply (None on timeout)"""
+        payload = json.dumps(request).encode('utf-8')
+        started = time.perf_counter()
+        if self.dealer:
+            self.socket.send_multipart([b'', payload])
+        else:
+            self.socket.send(payload)
+        if not self.socket.poll(self.options['timeout_ms']):
+            self.timeouts += 1
+            self._connect()
+            return None
+        reply = self.socket.recv_multipart()[-1]
+        self.round_trip.record(time.perf_counter() - started)
+        self.requests += 1
+        response = json.loads(reply)
+        if response.get('status') != 'OK':
+            self.errors += 1
+        return response
+
+    def _receive(self, response: dict):
+        """Record signals from a GET_SIGNALS response"""
+        now = time.time()
+        for signal in response.get('signals', []):
+            self.signal_ids.append(signal['signal_id'])
+            sent = datetime.fromisoformat(signal['timestamp']).timestamp()
+            self.delivery.record(max(0.0, now - sent))
+
+    def run(self, start_at: float, end_at: float):
+        """Poll the bridge from start_at until end_at"""
+        options = self.options
+        self._connect()
+        poll_interval = 1.0 / options['poll_rate'] if options['poll_rate'] > 0 else 0.0
+        next_poll = next_heartbeat = start_at
+        pending_acks = []
+
+        get_signals = {'action': 'GET_SIGNALS', 'broker': BROKER, 'terminal': self.terminal}
+        if options['ack']:
+            get_signals['ack'] = True
+
+        while True:
+            now = time.time()
+            if now >= end_at:
+                break
+            if now < next_poll:
+                time.sleep(min(next_poll, end_at) - now)
+                continue
+            next_poll += poll_interval
+
+            # Status traffic the EA would send this tick
+            extra = []
+            if now >= next_heartbeat:
+                extra.append({'action': 'HEARTBEAT'})
+                next_heartbeat += options['heartbeat_interval']
+            if pending_acks:
+                extra.append({'action': 'ACK', 'signal_ids': pending_acks})
+                pending_acks = []
+
+            if options['batch'] and extra:
+                response = self._round_trip({'action': 'BATCH', 'broker': BROKER,
+                                             'terminal': self.terminal,
+                                             'requests': extra + [get_signals]})
+                response = response and response.get('responses', [{}])[-1]
+            else:
+                for request in extra:
+                    self._round_trip({**request, 'broker': BROKER, 'terminal': self.terminal})
+                response = self._round_trip(get_signals)
+
+            if response:
+                ids_before = len(self.signal_ids)
+                self._receive(response)
+                if options['ack']:
+                    pending_acks = self.signal_ids[ids_before:]
+
+        self.socket.close(linger=0)
+
+
+def run_clients(first_index: int, count: int, port: int, options: dict,
+                start_at: float, end_at: float) -> dict:
+    """Run `count` EA clients on threads of this process and merge their results"""
+    context = zmq.Context()
+    clients = [EAClient(context, first_index + i, port, options) for i in range(count)]
+    threads = [threading.Thread(target=client.run, args=(start_at, end_at)) for client in clients]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    context.term()
+
+    round_trip = LatencyHistogram()
+    delivery = LatencyHistogram()
+    for client in clients:
+        round_trip.merge(client.round_trip)
+        delivery.merge(client.delivery)
+    return {
+        'requests': sum(client.requests for client in clients),
+        'errors': sum(client.errors for client in clients),
+        'timeouts': sum(client.timeouts for client in clients),
+        'signal_ids': [signal_id for client in clients for signal_id in client.signal_ids],
+        'round_trip': round_trip,
+        'delivery': delivery
+    }
+
+
+# ===== Driver =====
+
+def free_port() -> int:
+    """Pick an unused local TCP port"""
+    context = zmq.Context.instance()
+    socket = context.socket(zmq.REP)
+    port = socket.bind_to_random_port('tcp://127.0.0.1')
+    socket.close(linger=0)
+    return port
+
+
+def run(args) -> dict:
+    """Run benchmark and return results"""
+    port = args.port or free_port()
+    options = {
+        'socket': args.socket,
+        'poll_rate': args.poll_rate,
+        'heartbeat_interval': args.heartbeat_interval,
+        'ack': args.ack,
+        'batch': args.batch,
+        'timeout_ms': args.timeout_ms
+    }
+    # spawn: same behaviour on Windows VPSes, and no forked ZMQ state
+    mp = multiprocessing.get_context('spawn')
+
+    conn, child_conn = mp.Pipe()
+    bridge_process = mp.Process(target=run_bridge, daemon=True, args=(
+        child_conn, port, args.mode, args.workers, args.use_async, args.signal_rate,
+        args.log_level))
+    bridge_process.start()
+    status = conn.recv()
+    if status != 'ready':
+        raise RuntimeError(status.get('error', 'bridge failed to start'))
+
+    processes = max(1, min(args.processes, args.clients))
+    start_at = time.time() + STARTUP_DELAY
+    end_at = start_at + args.duration
+    conn.send(start_at)
+
+    with ProcessPoolExecutor(max_workers=processes, mp_context=mp) as pool:
+        futures = []
+        first = 0
+        for index in range(processes):
+            count = args.clients // processes + (1 if index < args.clients % processes else 0)
+            futures.append(pool.submit(run_clients, first, count, port, options,
+                                       start_at, end_at))
+            first += count
+        parts = [future.result() for future in futures]
+
+    conn.send('stop')
+    bridge = conn.recv()
+    bridge_process.join(timeout=10)
+
+    round_trip = LatencyHistogram()
+    delivery = LatencyHistogram()
+    signal_ids = []
+    for part in parts:
+        round_trip.merge(part['round_trip'])
+        delivery.merge(part['delivery'])
+        signal_ids.extend(part['signal_ids'])
+    requests = sum(part['requests'] for part in parts)
+    unique = len(set(signal_ids))
+    sent = bridge['signals_sent']
+
+    return {
+        'config': {
+            'bridge': 'async' if args.use_async else 'sync',
+            'mode': args.mode,
+            'workers': args.workers,
+            'socket': args.socket,
+            'clients': args.clients,
+            'processes': processes,
+            'duration_s': args.duration,
+            'signal_rate': args.signal_rate,
+            'poll_rate': args.poll_rate,
+            'heartbeat_interval': args.heartbeat_interval,
+            'ack': args.ack,
+            'batch': args.batch
+        },
+        'requests': requests,
+        'requests_per_sec': round(requests / args.duration, 1),
+        'errors': sum(part['errors'] for part in parts),
+        'timeouts': sum(part['timeouts'] for part in parts),
+        'round_trip': round_trip.snapshot(),
+        'signals': {
+            'sent': sent,
+            'delivered': len(signal_ids),
+            'delivered_per_sec': round(len(signal_ids) / args.duration, 1),
+            'still_queued': bridge['signals_queued'],
+            'lost': sent - unique - bridge['signals_queued'],
+            'duplicates': len(signal_ids) - unique,
+            'delivery_latency': delivery.snapshot()
+        },
+        'bridge': {
+            'requests_served': bridge['requests_served'],
+            'cpu_seconds': bridge['cpu_seconds'],
+            'cpu_percent': round(bridge['cpu_seconds'] / args.duration * 100, 1),
+            'cpu_us_per_request': bridge['cpu_us_per_request'],
+            'server_latency': bridge['server_latency'],
+            'errors': bridge['stats'].get('errors', 0)
+        }
+    }
+
+
+def main():
+    """Parse arguments and run benchmark"""
+    parser = argparse.ArgumentParser(description="MQL5Bridge load benchmark")
+    parser.add_argument('--clients', type=int, default=8, help="Simulated EAs")
+    parser.add_argument('--processes', type=int, default=2,
+                        help="Client processes (EAs are spread across them)")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run")
+    parser.add_argument('--signal-rate', type=float, default=100.0,
+                        help="Signals per second produced by the Python side")
+    parser.add_argument('--poll-rate', type=float, default=50.0,
+                        help="GET_SIGNALS per second per EA (0 = as fast as possible)")
+    parser.add_argument('--heartbeat-interval', type=float, default=1.0,
+                        help="Seconds between heartbeats per EA")
+    parser.add_argument('--mode', choices=['rep', 'router'], default='router')
+    parser.add_argument('--workers', type=int, default=4, help="Router mode worker threads")
+    parser.add_argument('--socket', choices=['req', 'dealer'], default='req',
+                        help="EA socket type")
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                        help="Benchmark AsyncMQL5Bridge")
+    parser.add_argument('--ack', action='store_true', help="Fetch with ack and ACK signals")
+    parser.add_argument('--batch', action='store_true',
+                        help="Send heartbeats/ACKs with GET_SIGNALS in one BATCH")
+    parser.add_argument('--timeout-ms', type=int, default=5000, help="Reply timeout")
+    parser.add_argument('--port', type=int, default=0, help="Bridge port (0 = any free port)")
+    parser.add_argument('--log-level', default='WARNING', help="Bridge process log level")
+    parser.add_argument('--max-p99-ms', type=float, default=None,
+                        help="Exit non-zero if round-trip p99 exceeds this")
+    args = parser.parse_args()
+
+    results = run(args)
+    print(json.dumps(results, indent=2))
+
+    failed = (results['signals']['lost'] or results['signals']['duplicates'] or
+              results['timeouts'] or results['errors'])
+    if args.max_p99_ms is not None and results['round_trip']['p99_ms'] > args.max_p99_ms:
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Exness Transport Benchmark
+Drives ExnessAPI from several threads (like monitor_positions plus health
+checks) against a local mock Exness server, comparing the legacy transport
+(plain session: 10 pooled connections, no retries) with the tuned pooled
+transport: request latency, connections opened and failed calls
+"""
+import sys
+import json
+import time
+import random
+import logging
+import argparse
+import threading
+import multiprocessing
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add python directory to path
+sys.path.insert(0, str(Path(__file__).parent / "python"))
+
+from brokers.base_broker import BrokerConfig
+from brokers.exness_api import ExnessAPI
+from bridge.metrics import LatencyHistogram
+
+LEGACY_HTTP = {'pool_maxsize': 10, 'keep_alive': False, 'retries': 0,
+               'connect_timeout': 10, 'read_timeout': 10}
+
+
+# ===== Mock Exness server =====
+
+class MockExnessHandler(BaseHTTPRequestHandler):
+    """Answers account, position and order requests with a fixed delay (and failed reads)"""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def do_GET(self):
+        time.sleep(self.server.delay)
+        if random.random() < self.server.fail_rate:
+            self._reply(503, {'error': 'Service unavailable'})
+        elif self.path.startswith('/positions'):
+            self._reply(200, {'positions': self.server.positions})
+        else:
+            self._reply(200, {'balance': 10000.0, 'equity': 10012.5, 'margin': 120.0,
+                              'free_margin': 9892.5, 'margin_level': 8343.75})
+
+    def do_POST(self):
+        self._write('Order placed successfully')
+
+    def do_PATCH(self):
+        self._write('Position modified successfully')
+
+    def do_DELETE(self):
+        self._write('Position closed successfully')
+
+    def _write(self, message: str):
+        """Answer an order, modify or close request"""
+        self.rfile.read(int(self.headers.get('Content-Length') or 0))
+        time.sleep(self.server.delay)
+        with self.server.lock:
+            self.server.orders += 1
+            order_id = f"order_{self.server.orders}"
+        self._reply(200, {'order_id': order_id, 'message': message})
+
+    def _reply(self, status: int, body: dict):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(conn, delay_ms: float, fail_rate: float):
+    """Run the mock server in this process; send its port over `conn`, stop on any message"""
+    ThreadingHTTPServer.request_queue_size = 128
+    server = ThreadingHTTPServer(('127.0.0.1', 0), MockExnessHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.orders = 0
+    server.delay = delay_ms / 1000.0
+    server.fail_rate = fail_rate
+    server.positions = [
+        {'symbol': symbol, 'volume': 0.1, 'type': 'BUY', 'open_price': 1.1, 'current_price': 1.1005,
+         'profit': 5.0, 'swap': 0.0, 'commission': -0.7, 'position_id': f"pos_{index}"}
+        for index, symbol in enumerate(['EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD'] * 5)
+    ]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    conn.send(server.server_address[1])
+    conn.recv()
+    server.shutdown()
+    conn.send(server.connections)
+
+
+# ===== Clients =====
+
+def client(api: ExnessAPI, latency: LatencyHistogram, failures: list, deadline: float):
+    """Alternate position and account queries until the deadline"""
+    calls = 0
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        if calls % 4 == 3:
+            result = api._make_request('GET', f'/accounts/{api.account_id}')
+        else:
+            result = api._make_request('GET', '/positions')
+        latency.record(time.perf_counter() - started)
+        if 'error' in result:
+            failures.append(1)
+        calls += 1
+
+
+def run(name: str, http: dict, args) -> dict:
+    """Run one transport profile and return its results"""
+    conn, child_conn = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, daemon=True,
+                                     args=(child_conn, args.delay_ms, args.fail_rate))
+    server.start()
+    port = conn.recv()
+    # Measure the transport, not the rate limit (fresh account id: fresh bucket)
+    api = ExnessAPI(BrokerConfig(name='EXNESS', account_id=f"bench-{name}", http=http,
+                                 api_url=f"http://127.0.0.1:{port}",
+                                 rate_limit={'requests_per_minute': 60_000_000, 'burst': 1000}))
+    latency = LatencyHistogram()
+    failures: list = []
+    deadline = time.perf_counter() + args.duration
+    threads = [threading.Thread(target=client, args=(api, latency, failures, deadline))
+               for _ in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    stats = api.get_transport_stats()
+    api.close()
+    conn.send('stop')
+    server_connections = conn.recv()
+    server.join()
+    return {
+        'profile': name,
+        'http': http,
+        'calls': latency.count,
+        'calls_per_sec': round(latency.count / elapsed, 1),
+        'failed_calls': len(failures),
+        'retries': stats['retries'],
+        'server_connections': server_connections,
+        'connection_reuse': stats['connection_reuse'],
+        'latency': latency.snapshot()
+    }
+
+
+def main():
+    """Parse arguments and run benchmark"""
+    parser = argparse.ArgumentParser(description="ExnessAPI HTTP transport benchmark")
+    parser.add_argument('--threads', type=int, default=16, help="Concurrent callers")
+    parser.add_argument('--duration', type=float, default=5.0, help="Seconds per profile")
+    parser.add_argument('--delay-ms', type=float, default=2.0, help="Mock server response delay")
+    parser.add_argument('--fail-rate', type=float, default=0.01,
+                        help="Fraction of requests answered with 503")
+    parser.add_argument('--pool-maxsize', type=int, default=None,
+                        help="Tuned pool size (default: --threads)")
+    args = parser.parse_args()
+    logging.getLogger('urllib3').setLevel(logging.ERROR)  # "Connection pool is full" noise
+
+    tuned = {'pool_maxsize': args.pool_maxsize or args.threads, 'backoff_factor': 0.01}
+    results = {
+        'legacy': run('legacy', LEGACY_HTTP, args),
+        'tuned': run('tuned', tuned, args)
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
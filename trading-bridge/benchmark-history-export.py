@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+History Export Benchmark
+Exports bridge signal history with EXPORT_HISTORY while another EA sends
+heartbeats, comparing one giant page against cursor paging with chunked
+frames: export time, largest frame, and how long the other EA is stalled
+"""
+import sys
+import json
+import time
+import logging
+import argparse
+import threading
+from pathlib import Path
+
+# Add python directory to path
+sys.path.insert(0, str(Path(__file__).parent / "python"))
+
+import zmq
+
+from bridge.mql5_bridge import MQL5Bridge
+from bridge.signal_manager import TradeSignal, SignalManager
+from bridge.metrics import LatencyHistogram
+
+
+def build_bridge(port: int, mode: str, history: int) -> MQL5Bridge:
+    """Start a bridge whose history holds `history` delivered signals"""
+    manager = SignalManager(max_queue_size=history, max_history=history)
+    bridge = MQL5Bridge(port=port, mode=mode, signal_manager=manager)
+    threading.Thread(target=bridge.start, daemon=True).start()
+    bridge.wait_ready(timeout=10)
+    for i in range(history):
+        buy = i % 2 == 0
+        manager.add_signal(TradeSignal(
+            symbol='EURUSD', action='BUY' if buy else 'SELL', broker='EXNESS',
+            lot_size=0.01, stop_loss=1.0850 if buy else 1.0950,
+            take_profit=1.0950 if buy else 1.0850,
+            comment=f"history #{i}", signal_id=f"history_{i}"))
+    manager.get_signals()
+    return bridge
+
+
+def export(context, address: str, limit: int, chunk_size: int):
+    """Export all history; return (seconds, signals, largest frame bytes, requests)"""
+    sock = context.socket(zmq.REQ)
+    sock.setsockopt(zmq.LINGER, 0)
+    sock.connect(address)
+    cursor = 0
+    received = 0
+    largest = 0
+    requests = 0
+    started = time.perf_counter()
+    while True:
+        sock.send_json({'action': 'EXPORT_HISTORY', 'cursor': cursor,
+                        'limit': limit, 'chunk_size': chunk_size})
+        frames = sock.recv_multipart(copy=False)
+        requests += 1
+        header = json.loads(frames[0].bytes)
+        for frame in frames[1:]:
+            largest = max(largest, len(frame))
+            received += len(json.loads(frame.bytes))
+        cursor = header['next_cursor']
+        if not header['more']:
+            break
+    elapsed = time.perf_counter() - started
+    sock.close()
+    return elapsed, received, largest, requests
+
+
+def heartbeats(context, address: str, latency: LatencyHistogram, stop: threading.Event):
+    """Send heartbeats back to back, recording round-trip latency"""
+    sock = context.socket(zmq.REQ)
+    sock.setsockopt(zmq.LINGER, 0)
+    sock.connect(address)
+    while not stop.is_set():
+        started = time.perf_counter()
+        sock.send(b'{"action":"HEARTBEAT"}')
+        sock.recv()
+        latency.record(time.perf_counter() - started)
+    sock.close()
+
+
+def run(port: int, mode: str, history: int, limit: int, chunk_size: int):
+    """Export history under heartbeat load and return results"""
+    bridge = build_bridge(port, mode, history)
+    # The single-page baseline asks for everything at once
+    bridge.MAX_EXPORT_PAGE = max(bridge.MAX_EXPORT_PAGE, limit)
+    address = f"tcp://127.0.0.1:{port}"
+    context = zmq.Context()
+    latency = LatencyHistogram()
+    stop = threading.Event()
+    monitor = threading.Thread(target=heartbeats, args=(context, address, latency, stop))
+    monitor.start()
+    time.sleep(0.2)
+    latency.reset()
+
+    elapsed, received, largest, requests = export(context, address, limit, chunk_size)
+
+    stop.set()
+    monitor.join()
+    context.term()
+    bridge.stop()
+    return {
+        'limit': limit,
+        'chunk_size': chunk_size,
+        'signals': received,
+        'requests': requests,
+        'export_ms': round(elapsed * 1000, 1),
+        'largest_frame_bytes': largest,
+        'heartbeat_during_export': latency.snapshot()
+    }
+
+
+def main():
+    """Parse arguments and run benchmark"""
+    parser = argparse.ArgumentParser(description="EXPORT_HISTORY benchmark")
+    parser.add_argument('--history', type=int, default=10000, help="Signals in history")
+    parser.add_argument('--mode', choices=['rep', 'router'], default='rep')
+    parser.add_argument('--limit', type=int, default=500, help="Signals per request (paged)")
+    parser.add_argument('--chunk-size', type=int, default=100, help="Signals per frame (paged)")
+    parser.add_argument('--port', type=int, default=5599)
+    args = parser.parse_args()
+    logging.getLogger().setLevel(logging.WARNING)
+
+    results = {
+        'single_page': run(args.port, args.mode, args.history, args.history, args.history),
+        'paged': run(args.port + 1, args.mode, args.history, args.limit, args.chunk_size)
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
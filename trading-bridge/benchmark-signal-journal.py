@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Signal Journal Benchmark
+Compares journal append throughput with fsync-per-record and group commit,
+and measures startup replay time
+"""
+import sys
+import json
+import time
+import argparse
+import tempfile
+import threading
+from pathlib import Path
+
+# Add python directory to path
+sys.path.insert(0, str(Path(__file__).parent / "python"))
+
+from bridge.signal_manager import TradeSignal, SignalManager
+from bridge.journal import SignalJournal
+
+
+def signal_dict(i: int):
+    """Build a journal record payload"""
+    return TradeSignal(
+        symbol='EURUSD', action='BUY', broker='EXNESS', lot_size=0.01,
+        stop_loss=1.0850, take_profit=1.0950, comment=f"bench #{i}",
+        signal_id=f"bench_{i}"
+    ).to_dict()
+
+
+def bench_appends(directory: Path, sync: str, records: int, threads: int, wait: bool):
+    """Append records from several threads and return records/second"""
+    journal = SignalJournal(directory / f"{sync}_{threads}_{wait}.journal", sync=sync)
+    payloads = [signal_dict(i) for i in range(records)]
+    per_thread = records // threads
+
+    def writer(index: int):
+        for data in payloads[index * per_thread:(index + 1) * per_thread]:
+            journal.append_add(data, wait=wait)
+
+    workers = [threading.Thread(target=writer, args=(i,)) for i in range(threads)]
+    started = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    journal.flush()
+    elapsed = time.perf_counter() - started
+    stats = journal.get_stats()
+    journal.close()
+    return {
+        'records_per_sec': round(per_thread * threads / elapsed),
+        'syncs': stats['syncs'],
+        'records_per_sync': round(stats['appends'] / max(stats['syncs'], 1), 1)
+    }
+
+
+def bench_replay(directory: Path, pending: int):
+    """Journal pending signals, then time a SignalManager restart"""
+    path = directory / "replay.journal"
+    journal = SignalJournal(path, sync='none')
+    manager = SignalManager(max_queue_size=pending, journal=journal)
+    for i in range(pending):
+        manager.add_signal(TradeSignal.from_dict(signal_dict(i)))
+    journal.close()
+
+    started = time.perf_counter()
+    journal = SignalJournal(path)
+    manager = SignalManager(max_queue_size=pending, journal=journal)
+    elapsed = time.perf_counter() - started
+    restored = manager.get_queue_size()
+    journal.close()
+    return {'pending': pending, 'restored': restored, 'restart_ms': round(elapsed * 1000, 2)}
+
+
+def main():
+    """Parse arguments and run benchmark"""
+    parser = argparse.ArgumentParser(description="SignalJournal benchmark")
+    parser.add_argument('--records', type=int, default=2000)
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--pending', type=int, default=10000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        results = {
+            'fsync_per_record': bench_appends(directory, 'always', args.records, 1, False),
+            'group_commit_async': bench_appends(directory, 'group', args.records, 1, False),
+            'group_commit_durable': bench_appends(
+                directory, 'group', args.records, args.threads, True),
+            'replay': bench_replay(directory, args.pending)
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Signal Queue Benchmark
+Drives SignalManager with concurrent producers and blocking consumers at a
+target rate and reports throughput, queue latency and lost/duplicate signals
+"""
+import sys
+import json
+import time
+import argparse
+import threading
+from pathlib import Path
+
+# Add python directory to path
+sys.path.insert(0, str(Path(__file__).parent / "python"))
+
+from bridge.signal_manager import TradeSignal, SignalManager
+from bridge.metrics import LatencyHistogram
+
+
+def run(rate_per_min: int, duration: float, producers: int, consumers: int):
+    """Run benchmark and return results"""
+    manager = SignalManager(max_queue_size=1_000_000, max_history=10_000)
+    latency = LatencyHistogram()
+    enqueued_at = {}
+    received = []
+    received_lock = threading.Lock()
+    rejected = [0]
+    done = threading.Event()
+
+    per_producer_rate = rate_per_min / 60.0 / producers
+    symbols = ['EURUSD', 'GBPUSD', 'USDJPY', 'XAUUSD']
+
+    def producer(index: int):
+        interval = 1.0 / per_producer_rate
+        next_send = time.perf_counter()
+        end = next_send + duration
+        n = 0
+        while next_send < end:
+            now = time.perf_counter()
+            if now < next_send:
+                time.sleep(next_send - now)
+            signal_id = f"p{index}_{n}"
+            enqueued_at[signal_id] = time.perf_counter()
+            ok, _ = manager.add_signal(TradeSignal(
+                symbol=symbols[n % len(symbols)], action='BUY', broker='EXNESS',
+                lot_size=0.01, signal_id=signal_id))
+            if not ok:
+                rejected[0] += 1
+            n += 1
+            next_send += interval
+
+    def consumer():
+        while not done.is_set() or manager.get_queue_size():
+            signals = manager.wait_for_signals(timeout=0.1, count=500)
+            now = time.perf_counter()
+            for signal in signals:
+                latency.record(now - enqueued_at[signal.signal_id])
+            with received_lock:
+                received.extend(s.signal_id for s in signals)
+
+    consumer_threads = [threading.Thread(target=consumer) for _ in range(consumers)]
+    producer_threads = [threading.Thread(target=producer, args=(i,)) for i in range(producers)]
+
+    started = time.perf_counter()
+    for thread in consumer_threads + producer_threads:
+        thread.start()
+    for thread in producer_threads:
+        thread.join()
+    done.set()
+    for thread in consumer_threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    sent = len(enqueued_at)
+    return {
+        'target_per_min': rate_per_min,
+        'achieved_per_min': round(len(received) / elapsed * 60),
+        'sent': sent,
+        'received': len(received),
+        'lost': sent - rejected[0] - len(set(received)),
+        'duplicates': len(received) - len(set(received)),
+        'rejected': rejected[0],
+        'queue_latency': latency.snapshot()
+    }
+
+
+def main():
+    """Parse arguments and run benchmark"""
+    parser = argparse.ArgumentParser(description="SignalManager throughput benchmark")
+    parser.add_argument('--rate', type=int, default=100_000, help="Signals per minute")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds to run")
+    parser.add_argument('--producers', type=int, default=4)
+    parser.add_argument('--consumers', type=int, default=2)
+    args = parser.parse_args()
+
+    results = run(args.rate, args.duration, args.producers, args.consumers)
+    print(json.dumps(results, indent=2))
+    return 0 if results['lost'] == 0 and results['duplicates'] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
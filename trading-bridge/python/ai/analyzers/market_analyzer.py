@@ -15,8 +15,18 @@ class AIMarketAnalyzer:
     Analyzes market conditions using technical indicators and AI
     """
     
-    def __init__(self):
-        """Initialize market analyzer"""
+    def __init__(self, market_data=None, bar_count: int = 500, tick_count: int = 1000):
+        """
+        Initialize market analyzer
+        
+        Args:
+            market_data: MarketDataStore with ticks/bars pushed by the EA
+            bar_count: Bars per analysis
+            tick_count: Recent ticks per analysis
+        """
+        self.market_data = market_data
+        self.bar_count = bar_count
+        self.tick_count = tick_count
         self.indicators_enabled = False
         self._check_dependencies()
     
@@ -53,7 +63,7 @@ class AIMarketAnalyzer:
             - confidence: Analysis confidence
         """
         try:
-            # Get market data (placeholder - implement actual data fetching)
+            # Get market data streamed by the EA
             market_data = self._get_market_data(symbol, timeframe)
             
             if not market_data:
@@ -105,22 +115,27 @@ class AIMarketAnalyzer:
     
     def _get_market_data(self, symbol: str, timeframe: str) -> Optional[Dict]:
         """
-        Get market data for analysis
-        Placeholder - implement actual data fetching from broker or data source
+        Get market data for analysis from the bridge's market data store
         
         Args:
             symbol: Trading symbol
             timeframe: Timeframe
             
         Returns:
-            Market data dictionary
+            Market data dictionary ('data' is a zero-copy structured array
+            of OHLCV bars, 'ticks' of recent ticks), or None without bars
         """
-        # TODO: Implement actual data fetching
-        # This should fetch OHLCV data from broker API or data provider
+        if self.market_data is None:
+            return None
+        bars = self.market_data.bars(symbol, timeframe, self.bar_count)
+        if bars is None or len(bars) == 0:
+            return None
         return {
             'symbol': symbol,
             'timeframe': timeframe,
-            'data': []  # OHLCV data
+            'data': bars,  # OHLCV data
+            'ticks': self.market_data.ticks(symbol, self.tick_count),
+            'last_tick': self.market_data.latest_tick(symbol)
         }
     
     def _analyze_sentiment(self, market_data: Dict) -> str:
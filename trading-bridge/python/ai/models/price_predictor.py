@@ -16,14 +16,18 @@ class PricePredictor:
     Uses LSTM or Transformer-based neural network
     """
     
-    def __init__(self, model_type: str = "lstm"):
+    def __init__(self, model_type: str = "lstm", market_data=None, history_bars: int = 500):
         """
         Initialize price predictor
         
         Args:
             model_type: Model type ('lstm' or 'transformer')
+            market_data: MarketDataStore with bars pushed by the EA
+            history_bars: Bars of history used per prediction
         """
         self.model_type = model_type
+        self.market_data = market_data
+        self.history_bars = history_bars
         self.model = None
         self.is_trained = False
         self._check_dependencies()
@@ -120,11 +124,15 @@ class PricePredictor:
             timeframe: Timeframe
             
         Returns:
-            List of historical price data
+            List of historical price data (OHLCV dictionaries, oldest first)
         """
-        # TODO: Implement actual data fetching from broker or data provider
-        # Should return OHLCV data
-        return None
+        if self.market_data is None:
+            return None
+        bars = self.market_data.bars(symbol, timeframe, self.history_bars)
+        if bars is None:
+            return None
+        names = bars.dtype.names
+        return [dict(zip(names, row)) for row in bars.tolist()]
     
     def _make_prediction(self, historical_data: List, horizon: int) -> Dict:
         """
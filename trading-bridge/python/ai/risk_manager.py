@@ -15,14 +15,22 @@ class AIRiskManager:
     Provides intelligent risk assessment and position sizing
     """
     
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(self, config: Optional[Dict] = None, market_data=None, broker_state=None):
         """
         Initialize AI Risk Manager
         
         Args:
             config: Configuration dictionary
+            market_data: MarketDataStore with bars pushed by the EA (used
+                for correlation risk)
+            broker_state: BrokerStateCache of the trading account (used for
+                the account balance when none is given, and broker positions)
         """
         self.config = config or {}
+        self.market_data = market_data
+        self.broker_state = broker_state
+        self.correlation_timeframe = self.config.get('correlation_timeframe', 'H1')
+        self.correlation_bars = self.config.get('correlation_bars', 100)
         self.max_risk_per_trade = self.config.get('max_risk_per_trade', 1.0)  # 1% default
         self.max_portfolio_risk = self.config.get('max_portfolio_risk', 5.0)  # 5% default
         self.min_confidence = self.config.get('min_confidence', 0.6)  # Minimum confidence to trade
@@ -50,6 +58,9 @@ class AIRiskManager:
             - risk_reasoning: Risk assessment reasoning
         """
         try:
+            if account_balance is None:
+                account_balance = self._account_balance()
+            
             # Calculate risk score
             risk_score = self._calculate_risk_score(symbol, action, confidence)
             
@@ -237,12 +248,52 @@ class AIRiskManager:
         Returns:
             Correlation risk score (0-1)
         """
-        # TODO: Implement correlation analysis
-        # Check if symbol is highly correlated with existing positions
-        # Higher correlation = higher risk
+        # Higher correlation with an open position = higher risk
+        if self.market_data is None or not self.active_positions:
+            return 0.0
         
-        # Placeholder
-        return 0.0
+        try:
+            import numpy as np
+            returns = self._bar_returns(symbol)
+            if returns is None:
+                return 0.0
+            
+            max_correlation = 0.0
+            for other in self.active_positions:
+                if other == symbol:
+                    continue
+                other_returns = self._bar_returns(other)
+                if other_returns is None:
+                    continue
+                length = min(len(returns), len(other_returns))
+                if length < 10:
+                    continue
+                correlation = np.corrcoef(returns[-length:], other_returns[-length:])[0, 1]
+                if np.isfinite(correlation):
+                    max_correlation = max(max_correlation, abs(float(correlation)))
+            return max_correlation
+        except Exception as e:
+            logger.error(f"Error checking correlation risk: {e}")
+            return 0.0
+    
+    def _bar_returns(self, symbol: str):
+        """Get close-to-close returns of recent bars, or None without enough data"""
+        bars = self.market_data.bars(symbol, self.correlation_timeframe, self.correlation_bars + 1)
+        if bars is None or len(bars) < 11:
+            return None
+        close = bars['close']
+        return close[1:] / close[:-1] - 1.0
+    
+    def _account_balance(self) -> Optional[float]:
+        """Get the account balance from the broker state cache (None if unavailable)"""
+        if self.broker_state is None:
+            return None
+        try:
+            balance = self.broker_state.get_account_info().balance
+        except Exception as e:
+            logger.warning(f"Account balance unavailable: {e}")
+            return None
+        return balance
     
     def add_position(self, symbol: str, position_data: Dict):
         """
@@ -280,13 +331,22 @@ class AIRiskManager:
         total_risk = sum([pos.get('risk', 0.0) for pos in self.active_positions.values()])
         position_count = len(self.active_positions)
         
-        return {
+        status = {
             'total_risk': total_risk,
             'max_allowed_risk': self.max_portfolio_risk,
             'position_count': position_count,
             'risk_percentage': (total_risk / self.max_portfolio_risk * 100) if self.max_portfolio_risk > 0 else 0,
             'positions': list(self.active_positions.keys())
         }
+        
+        if self.broker_state is not None:
+            # Cached only: reporting never triggers a broker request
+            account = self.broker_state.peek_account_info()
+            positions = self.broker_state.peek_positions()
+            status['account_balance'] = account.balance if account else None
+            status['broker_position_count'] = len(positions) if positions is not None else None
+        
+        return status
 
 
 
@@ -16,16 +16,19 @@ class AIStrategyEngine:
     Coordinates all AI components for autonomous trading
     """
     
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(self, config: Optional[Dict] = None, market_data_store=None):
         """
         Initialize AI Strategy Engine
         
         Args:
             config: Configuration dictionary
+            market_data_store: MarketDataStore fed by the MQL5 bridge, shared
+                by the analyzer, predictor and risk manager
         """
         self.config = config or {}
         self.models = {}
         self.market_data = {}
+        self.market_data_store = market_data_store
         self.performance_history = []
         self.is_initialized = False
         
@@ -41,10 +44,10 @@ class AIStrategyEngine:
             from .models.signal_classifier import SignalClassifier
             from .risk_manager import AIRiskManager
             
-            self.market_analyzer = AIMarketAnalyzer()
-            self.price_predictor = PricePredictor()
+            self.market_analyzer = AIMarketAnalyzer(market_data=self.market_data_store)
+            self.price_predictor = PricePredictor(market_data=self.market_data_store)
             self.signal_classifier = SignalClassifier()
-            self.risk_manager = AIRiskManager()
+            self.risk_manager = AIRiskManager(market_data=self.market_data_store)
             
             self.is_initialized = True
             logger.info("AI Strategy Engine initialized successfully")
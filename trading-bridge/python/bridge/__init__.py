@@ -2,7 +2,9 @@
 Python-MQL5 Bridge Module
 """
 from .mql5_bridge import MQL5Bridge, start_bridge
+from .async_bridge import AsyncMQL5Bridge, serve_bridge
+from .supervisor import BridgeSupervisor, start_supervisor
 from .signal_manager import TradeSignal, SignalManager, TradeAction
 
-__all__ = ['MQL5Bridge', 'TradeSignal', 'SignalManager', 'TradeAction', 'start_bridge']
-
+__all__ = ['MQL5Bridge', 'AsyncMQL5Bridge', 'BridgeSupervisor', 'TradeSignal', 'SignalManager',
+           'TradeAction', 'start_bridge', 'serve_bridge', 'start_supervisor']
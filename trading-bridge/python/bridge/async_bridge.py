@@ -0,0 +1,229 @@
+"""
+Async MQL5 Bridge
+MQL5Bridge on zmq.asyncio: request handling, heartbeat monitoring and signal
+publishing run as coroutines on one event loop
+"""
+import asyncio
+import time
+import logging
+import threading
+from typing import Optional
+
+import zmq
+import zmq.asyncio
+
+# Import MQL5Bridge - handle both relative and absolute imports
+try:
+    from .mql5_bridge import MQL5Bridge
+except (ImportError, ValueError):
+    try:
+        from bridge.mql5_bridge import MQL5Bridge
+    except ImportError:
+        import sys
+        from pathlib import Path
+        bridge_dir = Path(__file__).parent
+        if str(bridge_dir) not in sys.path:
+            sys.path.insert(0, str(bridge_dir))
+        from mql5_bridge import MQL5Bridge
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncMQL5Bridge(MQL5Bridge):
+    """
+    Bridge between Python trading engine and MQL5 EA, on asyncio
+
+    Speaks the same protocol as MQL5Bridge and shares its request handling.
+    Embed it in an asyncio service with `await bridge.serve()` (awaiting
+    `bridge.ready` for startup), or call start() to run it on its own event
+    loop in the calling thread. In router mode requests are served inline on
+    the loop; `workers` is ignored.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread: Optional[int] = None
+        self._ready_future: Optional[asyncio.Future] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._outbox_event: Optional[asyncio.Event] = None
+
+    @property
+    def ready(self) -> asyncio.Future:
+        """Future resolved once the bridge is listening (raises if startup failed)"""
+        if self._ready_future is None:
+            self._ready_future = asyncio.get_running_loop().create_future()
+        return self._ready_future
+
+    def start(self):
+        """Start the bridge server on a new event loop (blocks until stopped)"""
+        asyncio.run(self.serve())
+
+    async def serve(self):
+        """Start the bridge server on the running event loop (returns when stopped)"""
+        if self._ready_future is not None and self._ready_future.done():
+            self._ready_future = None  # Left over from a failed start
+        ready = self.ready
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread = threading.get_ident()
+        self._stop_event = asyncio.Event()
+        self._outbox_event = asyncio.Event()
+        try:
+            self.context = zmq.asyncio.Context()
+            socket_type = zmq.ROUTER if self.mode == 'router' else zmq.REP
+            self.socket = self.context.socket(socket_type)
+            self.socket.setsockopt(zmq.LINGER, 0)
+            bind_address = f"tcp://{self.host}:{self.port}"
+            self.socket.bind(bind_address)
+
+            if self.publish_port:
+                self._publisher = self.context.socket(zmq.PUB)
+                self._publisher.setsockopt(zmq.LINGER, 0)
+                self._publisher.bind(f"tcp://{self.host}:{self.publish_port}")
+                logger.info(f"Publishing signals on tcp://{self.host}:{self.publish_port}")
+            
+            self._start_metrics_server()
+        except Exception as e:
+            logger.error(f"Failed to start bridge: {e}")
+            self._set_connection_status("error")
+            self._close()
+            if not ready.done():
+                ready.set_exception(e)
+                ready.exception()  # Raised by serve(); don't also log it as unretrieved
+            self._ready.set()
+            raise
+
+        self._mark_started()
+        ready.set_result(True)
+        logger.info(f"MQL5 Bridge started on {bind_address} ({self.mode} mode, asyncio)")
+
+        tasks = [
+            asyncio.ensure_future(self._serve_requests()),
+            asyncio.ensure_future(self._heartbeat_monitor()),
+            asyncio.ensure_future(self._publish_outbox())
+        ]
+        # Signals accepted before the loop started (EAs recover them via REPLAY)
+        self._outbox_event.set()
+        try:
+            await self._stop_event.wait()
+        finally:
+            self.running = False
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._close()
+            self._stopped.set()
+
+    async def _serve_requests(self):
+        """Receive, process and answer EA requests"""
+        while True:
+            try:
+                if self.mode == 'router':
+                    frames = await self.socket.recv_multipart()
+                    started = time.perf_counter()
+                    # REQ peers send [identity, '', payload]; DEALER peers may omit the delimiter
+                    if len(frames) < 2:
+                        continue
+                    envelope, message = frames[:-1], frames[-1]
+                    client = self._register_client(envelope[0])
+                    response = self._serve(message, client)
+                    frames = envelope + (response if isinstance(response, list) else [response])
+                    await self.socket.send_multipart(frames, copy=False)
+                else:
+                    message = await self.socket.recv()
+                    started = time.perf_counter()
+                    response = self._serve(message)
+                    if isinstance(response, list):
+                        await self.socket.send_multipart(response, copy=False)
+                    else:
+                        await self.socket.send(response)
+                self.request_latency.record(time.perf_counter() - started)
+
+            except asyncio.CancelledError:
+                raise
+            except zmq.ContextTerminated:
+                return
+            except Exception as e:
+                logger.error(f"Bridge error: {e}")
+                self._increment('errors')
+                await asyncio.sleep(1)
+
+    async def _heartbeat_monitor(self):
+        """Flag the EA disconnected as soon as its heartbeat deadline passes"""
+        while True:
+            await asyncio.sleep(self._check_heartbeat())
+
+    async def _publish_outbox(self):
+        """Publish signals accepted by send_signal(), in order"""
+        while True:
+            await self._outbox_event.wait()
+            self._outbox_event.clear()
+            if self._publisher is None:
+                continue
+            while self._outbox:
+                topic, seq, payload, expires = self._outbox.popleft()
+                if expires is not None and expires <= time.time():
+                    self._increment('signals_expired')
+                    continue
+                await self._publisher.send_multipart([topic, str(seq).encode('ascii'), payload])
+                self._increment('signals_published')
+
+    def _wake(self):
+        """Wake the publisher coroutine from any thread"""
+        loop = self._loop
+        if loop is None or loop.is_closed() or self._outbox_event is None:
+            return
+        try:
+            loop.call_soon_threadsafe(self._outbox_event.set)
+        except RuntimeError:
+            pass  # Loop closed between the check and the call
+
+    def _close(self):
+        """Close sockets and context (loop thread only)"""
+        if self.context:
+            self.context.destroy(linger=0)
+            self.context = None
+        self.socket = None
+        self._publisher = None
+
+    def stop(self):
+        """Stop the bridge (from any thread, or from a coroutine on the bridge loop)"""
+        was_running = self.running
+        self.running = False
+        self._ready.clear()
+        loop = self._loop
+        if loop is not None and not loop.is_closed() and self._stop_event is not None:
+            try:
+                loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass
+            # On the loop itself serve() finishes the shutdown once we yield
+            if was_running and threading.get_ident() != self._loop_thread:
+                self._stopped.wait(timeout=5)
+        self._ready_future = None
+        self._stop_metrics_server()
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+        self._heartbeat_deadline = None
+        self._set_connection_status("stopped")
+        logger.info("MQL5 Bridge stopped")
+
+
+# Convenience function for embedding in an asyncio application
+async def serve_bridge(port: int = 5555, host: str = "127.0.0.1", mode: str = "rep",
+                       publish_port: Optional[int] = None, metrics_port: Optional[int] = None):
+    """Run an AsyncMQL5Bridge on the current event loop until cancelled"""
+    bridge = AsyncMQL5Bridge(port=port, host=host, mode=mode, publish_port=publish_port,
+                             metrics_port=metrics_port)
+    try:
+        await bridge.serve()
+    finally:
+        bridge.stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(serve_bridge())
+    except KeyboardInterrupt:
+        logger.info("Stopping bridge...")
@@ -0,0 +1,116 @@
+"""
+Bridge Wire Codecs
+Message encodings negotiated between the bridge and MQL5 EAs
+"""
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class CodecError(ValueError):
+    """Raised when a payload cannot be decoded"""
+
+
+class JsonCodec:
+    """JSON encoding (default, understood by every EA)"""
+
+    name = 'json'
+
+    def encode(self, obj: Any) -> bytes:
+        """Encode object to bytes"""
+        return json.dumps(obj).encode('utf-8')
+
+    def decode(self, payload: bytes) -> Any:
+        """Decode bytes to object"""
+        try:
+            return json.loads(payload)
+        except ValueError as e:
+            raise CodecError(str(e)) from e
+
+
+class MsgpackCodec:
+    """MessagePack encoding (compact binary, requires msgpack)"""
+
+    name = 'msgpack'
+
+    def encode(self, obj: Any) -> bytes:
+        """Encode object to bytes"""
+        # packb rather than a shared Packer: router workers encode concurrently
+        return msgpack.packb(obj, use_bin_type=True, default=str)
+
+    def decode(self, payload: bytes) -> Any:
+        """Decode bytes to object"""
+        try:
+            return msgpack.unpackb(payload, raw=False)
+        except Exception as e:
+            raise CodecError(str(e)) from e
+
+
+# Available codecs, in order of preference
+CODECS: Dict[str, Any] = {}
+if msgpack is not None:
+    CODECS['msgpack'] = MsgpackCodec()
+CODECS['json'] = JsonCodec()
+
+DEFAULT_CODEC = CODECS['json']
+
+
+def available_encodings() -> List[str]:
+    """Get names of encodings this bridge can speak (preferred first)"""
+    return list(CODECS.keys())
+
+
+def get_codec(name: Optional[str]):
+    """
+    Get codec by name
+
+    Args:
+        name: Encoding name (None = default)
+
+    Returns:
+        Codec instance, or None if unknown/unavailable
+    """
+    if name is None:
+        return DEFAULT_CODEC
+    return CODECS.get(str(name).lower())
+
+
+def detect_codec(payload: bytes):
+    """
+    Detect the encoding of a request from its first byte
+
+    Requests are always maps: JSON objects start with '{' (possibly after
+    whitespace) while msgpack maps start with 0x80-0x8f, 0xde or 0xdf.
+
+    Args:
+        payload: Raw message
+
+    Returns:
+        Codec instance
+    """
+    if payload and 'msgpack' in CODECS:
+        first = payload[0]
+        if 0x80 <= first <= 0x8f or first in (0xde, 0xdf):
+            return CODECS['msgpack']
+    return DEFAULT_CODEC
+
+
+def negotiate(requested: Optional[List[str]]):
+    """
+    Pick the first encoding requested by an EA that the bridge supports
+
+    Args:
+        requested: EA's encodings in order of preference
+
+    Returns:
+        Codec instance (JSON if nothing matches)
+    """
+    for name in requested or []:
+        codec = get_codec(name)
+        if codec is not None:
+            return codec
+    return DEFAULT_CODEC
@@ -0,0 +1,393 @@
+"""
+Signal Journal
+Append-only, crash-safe journal of queued and delivered signals for fast
+restart replay
+"""
+import os
+import json
+import mmap
+import struct
+import zlib
+import threading
+import time
+import logging
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Segment layout: 8-byte file header, then records of
+#   [u32 payload length][u32 crc32 of type+payload][u8 type][payload]
+# A zero length marks the end of written data (segments are preallocated).
+MAGIC = b'SGJ1\x00\x00\x00\x00'
+RECORD_HEADER = struct.Struct('<IIB')
+
+RECORD_ADD = 1      # payload: signal dict (JSON)
+RECORD_REMOVE = 2   # payload: signal_id (UTF-8)
+RECORD_HISTORY = 3  # payload: delivered signal dict (JSON)
+
+
+class SignalJournal:
+    """
+    Append-only signal journal in a memory-mapped segment file
+
+    Records are written into a preallocated mmap and made durable by
+    msync. With sync='group' a background thread syncs everything written
+    in the last `commit_interval` seconds at once (group commit); with
+    sync='always' every append syncs before returning; with sync='none'
+    the OS decides when pages reach disk.
+
+    Besides pending signals the journal keeps the last `max_history`
+    delivered signals, so signal history survives restarts too. Compaction
+    runs on the background thread, never on the appending thread.
+    """
+
+    SYNC_MODES = ('group', 'always', 'none')
+
+    def __init__(self, path, segment_size: int = 16 * 1024 * 1024,
+                 sync: str = "group", commit_interval: float = 0.005,
+                 compact_ratio: float = 0.5, max_history: int = 10000):
+        """
+        Initialize SignalJournal
+
+        Args:
+            path: Segment file path
+            segment_size: Initial (and growth) size of the segment in bytes
+            sync: 'group', 'always' or 'none'
+            commit_interval: Seconds between group commits
+            compact_ratio: Compact when live records are below this share
+                of a segment that is at least half full
+            max_history: Delivered signals kept for history replay (match
+                the SignalManager's max_history)
+        """
+        if sync not in self.SYNC_MODES:
+            raise ValueError(f"Invalid sync mode: {sync}")
+
+        self.path = Path(path)
+        self.segment_size = segment_size
+        self.sync = sync
+        self.commit_interval = commit_interval
+        self.compact_ratio = compact_ratio
+        self.max_history = max_history
+
+        self._file = None
+        self._mm = None
+        self._offset = len(MAGIC)     # Next write position
+        self._synced = len(MAGIC)     # Everything before this is on disk
+        self._live_bytes = 0          # Bytes of ADD records still pending
+        self._live_sizes: Dict[str, int] = {}
+        self._pending: 'OrderedDict[str, Dict[str, Any]]' = OrderedDict()
+        self._history: Deque[Tuple[Dict[str, Any], int]] = deque()  # (signal dict, record size)
+
+        self._lock = threading.Lock()
+        self._committed = threading.Condition(self._lock)
+        self._closed = False
+        self._flusher = None
+        self._waiters = 0
+        self._compact_requested = False
+        self._compacting = False
+
+        self.stats = {
+            'appends': 0,
+            'syncs': 0,
+            'compactions': 0,
+            'replayed': 0
+        }
+
+        self._open()
+        self._flusher = threading.Thread(target=self._flush_loop, daemon=True,
+                                         name='signal-journal-commit')
+        self._flusher.start()
+
+    def _open(self):
+        """Open (or create) the segment and scan it to the end of valid data"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        exists = self.path.exists() and self.path.stat().st_size >= len(MAGIC)
+        self._file = open(self.path, 'r+b' if exists else 'w+b')
+        size = os.fstat(self._file.fileno()).st_size
+        if size < self.segment_size:
+            self._file.truncate(self.segment_size)
+            size = self.segment_size
+        self._mm = mmap.mmap(self._file.fileno(), size)
+
+        if not exists or self._mm[:len(MAGIC)] != MAGIC:
+            self._mm[:len(MAGIC)] = MAGIC
+            self._offset = len(MAGIC)
+        else:
+            self._scan()
+        self._synced = self._offset
+
+    def _scan(self):
+        """Rebuild pending and delivered signals from the segment, stopping at a torn/corrupt tail"""
+        mm = self._mm
+        offset = len(MAGIC)
+        end = len(mm)
+        while offset + RECORD_HEADER.size <= end:
+            length, crc, record_type = RECORD_HEADER.unpack_from(mm, offset)
+            if length == 0 and record_type == 0:
+                break
+            start = offset + RECORD_HEADER.size
+            if start + length > end:
+                break
+            payload = mm[start:start + length]
+            if zlib.crc32(payload, zlib.crc32(bytes([record_type]))) != crc:
+                logger.warning(f"Journal {self.path.name}: corrupt record at {offset}, truncating")
+                break
+            self._apply(record_type, payload, RECORD_HEADER.size + length)
+            offset = start + length
+
+        # Zero any torn tail so later appends start from clean space
+        if offset < end:
+            mm[offset:min(end, offset + RECORD_HEADER.size)] = bytes(
+                min(end, offset + RECORD_HEADER.size) - offset)
+        self._offset = offset
+        self.stats['replayed'] = len(self._pending)
+
+    def _apply(self, record_type: int, payload: bytes, size: int,
+               data: Optional[Dict[str, Any]] = None):
+        """Apply a record to the in-memory pending set and history"""
+        if record_type == RECORD_ADD:
+            if data is None:
+                data = json.loads(payload)
+            signal_id = data.get('signal_id')
+            self._pending[signal_id] = data
+            self._live_sizes[signal_id] = size
+            self._live_bytes += size
+        elif record_type == RECORD_REMOVE:
+            signal_id = payload.decode('utf-8')
+            if self._pending.pop(signal_id, None) is not None:
+                self._live_bytes -= self._live_sizes.pop(signal_id, 0)
+        elif record_type == RECORD_HISTORY:
+            if data is None:
+                data = json.loads(payload)
+            self._history.append((data, size))
+            self._live_bytes += size
+            while len(self._history) > self.max_history:
+                self._live_bytes -= self._history.popleft()[1]
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Signals added but not removed, in journal order"""
+        with self._lock:
+            return list(self._pending.values())
+
+    def history(self) -> List[Dict[str, Any]]:
+        """Delivered signals kept for history replay, oldest first"""
+        with self._lock:
+            return [data for data, _ in self._history]
+
+    def append_add(self, data: Dict[str, Any], wait: bool = False):
+        """
+        Journal a queued signal
+
+        Args:
+            data: Signal dictionary (TradeSignal.to_dict())
+            wait: Block until the record is durable (group mode)
+        """
+        self._append(RECORD_ADD, json.dumps(data).encode('utf-8'), wait, data)
+
+    def append_remove(self, signal_id: str, wait: bool = False):
+        """
+        Journal that a signal left the queue
+
+        Args:
+            signal_id: Signal ID
+            wait: Block until the record is durable (group mode)
+        """
+        self._append(RECORD_REMOVE, signal_id.encode('utf-8'), wait)
+
+    def append_history(self, data: Dict[str, Any], wait: bool = False):
+        """
+        Journal a signal delivered to a terminal (kept for history replay)
+
+        Args:
+            data: Signal dictionary (TradeSignal.to_dict())
+            wait: Block until the record is durable (group mode)
+        """
+        self._append(RECORD_HISTORY, json.dumps(data).encode('utf-8'), wait, data)
+
+    def _append(self, record_type: int, payload: bytes, wait: bool,
+                data: Optional[Dict[str, Any]] = None):
+        """Write a record and make it durable according to the sync mode"""
+        size = RECORD_HEADER.size + len(payload)
+        crc = zlib.crc32(payload, zlib.crc32(bytes([record_type])))
+        with self._lock:
+            if self._closed:
+                raise ValueError("Journal is closed")
+            if self._offset + size + RECORD_HEADER.size > len(self._mm):
+                self._grow(size)
+
+            start = self._offset + RECORD_HEADER.size
+            end = start + len(payload)
+            self._mm[start:end] = payload
+            # Keep an end marker after the record, then write the header last:
+            # a torn write leaves a zero/invalid header, never a bad payload
+            self._mm[end:end + RECORD_HEADER.size] = bytes(RECORD_HEADER.size)
+            RECORD_HEADER.pack_into(self._mm, self._offset, len(payload), crc, record_type)
+            self._offset = end
+            self._apply(record_type, payload, size, data)
+            self.stats['appends'] += 1
+            if not (self._compact_requested or self._compacting) and self._needs_compact():
+                # Hand the rewrite to the background thread
+                self._compact_requested = True
+                self._committed.notify_all()
+
+            if self.sync == 'always':
+                self._sync_locked()
+            elif self.sync == 'group':
+                self._committed.notify_all()
+                if wait:
+                    self._waiters += 1
+                    while self._synced < end and not self._closed:
+                        self._committed.wait()
+                    self._waiters -= 1
+
+    def _grow(self, needed: int):
+        """Extend the segment (caller holds lock)"""
+        new_size = len(self._mm) + max(self.segment_size, needed * 2)
+        self._mm.flush()
+        self._mm.close()
+        self._file.truncate(new_size)
+        self._mm = mmap.mmap(self._file.fileno(), new_size)
+
+    def _sync_locked(self):
+        """msync everything written since the last sync (caller holds lock)"""
+        if self._synced >= self._offset:
+            return
+        page_start = self._synced - (self._synced % mmap.ALLOCATIONGRANULARITY)
+        self._mm.flush(page_start, self._offset - page_start)
+        self._synced = self._offset
+        self.stats['syncs'] += 1
+        self._committed.notify_all()
+
+    def _flush_loop(self):
+        """Group commit: sync batches of appends every commit_interval; compact when due"""
+        group = self.sync == 'group'
+        while True:
+            with self._lock:
+                while (not self._closed and not self._compact_requested and
+                       not (group and self._synced < self._offset)):
+                    self._committed.wait()
+                if self._closed:
+                    return
+                waiting = self._waiters
+                commit = group and self._synced < self._offset
+            if commit:
+                # With nobody blocked, let more appends join this commit; blocked
+                # writers are synced at once and later arrivals join the next one
+                if not waiting:
+                    time.sleep(self.commit_interval)
+                with self._lock:
+                    if self._closed:
+                        return
+                    self._sync_locked()
+            if self._compact_requested:
+                try:
+                    self.compact()
+                except Exception as e:
+                    logger.error(f"Journal {self.path.name}: compaction failed: {e}")
+
+    def flush(self):
+        """Make everything written so far durable"""
+        with self._lock:
+            if not self._closed:
+                self._sync_locked()
+
+    def should_compact(self) -> bool:
+        """Check whether the segment is mostly dead records"""
+        with self._lock:
+            return self._needs_compact()
+
+    def _needs_compact(self) -> bool:
+        """Check whether the segment is mostly dead records (caller holds lock)"""
+        used = self._offset - len(MAGIC)
+        return (used > len(self._mm) // 2 and
+                self._live_bytes < used * self.compact_ratio)
+
+    def compact(self):
+        """
+        Rewrite the segment with only pending and history records
+
+        Live records are written and fsynced without holding the lock;
+        records appended meanwhile are copied over under the lock just
+        before the new segment replaces the old one.
+        """
+        with self._lock:
+            if self._closed or self._compacting:
+                return
+            self._compacting = True
+            self._compact_requested = False
+            records = [(RECORD_ADD, data) for data in self._pending.values()]
+            records += [(RECORD_HISTORY, data) for data, _ in self._history]
+            mark = self._offset
+
+        tmp_path = self.path.with_suffix(self.path.suffix + '.compact')
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(MAGIC)
+                for record_type, data in records:
+                    payload = json.dumps(data).encode('utf-8')
+                    crc = zlib.crc32(payload, zlib.crc32(bytes([record_type])))
+                    f.write(RECORD_HEADER.pack(len(payload), crc, record_type))
+                    f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+
+                with self._lock:
+                    if self._closed:
+                        return
+                    # Records appended since the snapshot, then headroom (zeros
+                    # also mark the end) so appends don't immediately remap
+                    f.write(self._mm[mark:self._offset])
+                    offset = f.tell()
+                    f.truncate(offset + self.segment_size)
+                    f.flush()
+                    os.fsync(f.fileno())
+                    f.close()
+
+                    # Windows cannot replace a file that is still mapped
+                    self._mm.close()
+                    self._file.close()
+                    try:
+                        os.replace(tmp_path, self.path)
+                    except OSError:
+                        self._file = open(self.path, 'r+b')
+                        self._mm = mmap.mmap(self._file.fileno(), 0)
+                        raise
+                    self._file = open(self.path, 'r+b')
+                    self._mm = mmap.mmap(self._file.fileno(), offset + self.segment_size)
+                    self._offset = offset
+                    self._synced = offset
+                    self._compact_requested = False
+                    self.stats['compactions'] += 1
+                    self._committed.notify_all()
+        finally:
+            with self._lock:
+                self._compacting = False
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+    def close(self):
+        """Sync and close the journal"""
+        with self._lock:
+            if self._closed:
+                return
+            self._sync_locked()
+            self._closed = True
+            self._committed.notify_all()
+        if self._flusher:
+            self._flusher.join(timeout=1)
+        self._mm.close()
+        self._file.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get journal statistics"""
+        with self._lock:
+            return {
+                **self.stats,
+                'pending': len(self._pending),
+                'history': len(self._history),
+                'bytes_used': self._offset,
+                'bytes_live': self._live_bytes,
+                'segment_size': len(self._mm) if not self._closed else 0
+            }
@@ -0,0 +1,364 @@
+"""
+Market Data Store
+Per-symbol tick and bar ring buffers fed by the EA through the bridge
+"""
+import threading
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+TICK_FIELDS = ('time', 'bid', 'ask', 'last', 'volume')
+BAR_FIELDS = ('time', 'open', 'high', 'low', 'close', 'volume')
+
+# Bar lengths in seconds of timeframes that can be resampled from shorter ones
+TIMEFRAME_SECONDS = {
+    'M1': 60, 'M5': 300, 'M15': 900, 'M30': 1800,
+    'H1': 3600, 'H4': 14400, 'D1': 86400
+}
+
+
+def to_records(rows: Sequence[Any], fields: Sequence[str]):
+    """
+    Convert EA rows to a structured array of float64 fields
+
+    Args:
+        rows: Lists in field order (missing trailing fields are 0) or
+            dictionaries keyed by field name
+        fields: Field names
+
+    Returns:
+        Structured array
+    """
+    records = np.zeros(len(rows), dtype=[(name, 'f8') for name in fields])
+    if not len(rows):
+        return records
+    if isinstance(rows[0], dict):
+        for name in fields:
+            records[name] = [row.get(name, 0.0) or 0.0 for row in rows]
+        return records
+    matrix = np.asarray(rows, dtype='f8')
+    if matrix.ndim != 2 or matrix.shape[1] > len(fields):
+        raise ValueError(f"Expected rows of up to {len(fields)} values ({', '.join(fields)})")
+    for index in range(matrix.shape[1]):
+        records[fields[index]] = matrix[:, index]
+    return records
+
+
+def resample_bars(bars, seconds: int, source_seconds: int):
+    """
+    Aggregate bars into longer bars aligned to multiples of `seconds`
+
+    Args:
+        bars: Structured array of bars ordered by time
+        seconds: Target bar length
+        source_seconds: Length of the input bars
+
+    Returns:
+        Structured array of complete target bars (a trailing bar whose
+        period has not ended yet is dropped)
+    """
+    if len(bars) == 0:
+        return np.zeros(0, dtype=bars.dtype)
+    buckets = bars['time'] // seconds * seconds
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    ends = np.r_[starts[1:], len(bars)] - 1
+    result = np.zeros(len(starts), dtype=bars.dtype)
+    result['time'] = buckets[starts]
+    result['open'] = bars['open'][starts]
+    result['high'] = np.maximum.reduceat(bars['high'], starts)
+    result['low'] = np.minimum.reduceat(bars['low'], starts)
+    result['close'] = bars['close'][ends]
+    result['volume'] = np.add.reduceat(bars['volume'], starts)
+    if bars['time'][-1] + source_seconds < result['time'][-1] + seconds:
+        result = result[:-1]
+    return result
+
+
+class RingBuffer:
+    """
+    Preallocated ring of structured NumPy records
+
+    Every record is written twice, at `i` and `i + capacity`, so the latest
+    `n` records are always one contiguous slice: appends are O(1) and
+    windows are zero-copy views. A view is only stable until `capacity`
+    further appends; pass copy=True to keep it longer.
+    """
+
+    def __init__(self, fields: Sequence[str], capacity: int):
+        """
+        Initialize RingBuffer
+
+        Args:
+            fields: Record field names (all float64)
+            capacity: Maximum number of records kept
+        """
+        if np is None:
+            raise ImportError("numpy is required for market data ring buffers")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.fields = tuple(fields)
+        self.dtype = np.dtype([(name, 'f8') for name in self.fields])
+        self.capacity = capacity
+        self._buffer = np.zeros(2 * capacity, dtype=self.dtype)
+        self._position = 0   # Next write slot in [0, capacity)
+        self.total = 0       # Records ever appended
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return min(self.total, self.capacity)
+
+    def extend(self, records) -> int:
+        """
+        Append records
+
+        Args:
+            records: Structured array with this ring's dtype
+
+        Returns:
+            Number of records appended
+        """
+        count = len(records)
+        if count == 0:
+            return 0
+        with self.lock:
+            self._write(records)
+        return count
+
+    def _write(self, records):
+        """Write records at the head of the ring (caller holds lock)"""
+        count = len(records)
+        if count > self.capacity:
+            records = records[-self.capacity:]
+        slots = (self._position + np.arange(len(records))) % self.capacity
+        self._buffer[slots] = records
+        self._buffer[slots + self.capacity] = records
+        self._position = (self._position + len(records)) % self.capacity
+        self.total += count
+
+    def window(self, count: Optional[int] = None, copy: bool = False):
+        """
+        Get the latest records, oldest first
+
+        Args:
+            count: Number of records (None = all kept)
+            copy: Return an independent copy instead of a read-only view
+
+        Returns:
+            Structured array
+        """
+        with self.lock:
+            available = len(self)
+            count = available if count is None else max(0, min(count, available))
+            end = self._position + self.capacity
+            view = self._buffer[end - count:end]
+            if copy:
+                return view.copy()
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    def last(self) -> Optional[Dict[str, float]]:
+        """Get the latest record as a dictionary"""
+        with self.lock:
+            if self.total == 0:
+                return None
+            record = self._buffer[self._position + self.capacity - 1]
+            return {name: float(record[name]) for name in self.fields}
+
+
+class BarRing(RingBuffer):
+    """Ring of OHLCV bars where a bar re-sent with the same open time replaces the last one"""
+
+    def extend(self, records) -> int:
+        """
+        Append closed bars (bars older than the latest one are ignored)
+
+        Args:
+            records: Structured array of bars ordered by time
+
+        Returns:
+            Number of bars stored (appended or replaced)
+        """
+        if len(records) == 0:
+            return 0
+        with self.lock:
+            if self.total:
+                last_slot = (self._position - 1) % self.capacity
+                last_time = self._buffer[last_slot]['time']
+                records = records[records['time'] >= last_time]
+                if len(records) and records[0]['time'] == last_time:
+                    self._buffer[last_slot] = records[0]
+                    self._buffer[last_slot + self.capacity] = records[0]
+                    records = records[1:]
+                    stored = 1
+                else:
+                    stored = 0
+            else:
+                stored = 0
+            if len(records):
+                self._write(records)
+            return stored + len(records)
+
+
+class MarketDataStore:
+    """
+    Low-latency market data pushed by EAs
+
+    Ticks are kept per symbol and bars per (symbol, timeframe), each in a
+    preallocated ring, so the analyzer, predictor and risk manager can read
+    recent history without polling a broker API.
+    """
+
+    def __init__(self, tick_capacity: int = 100_000, bar_capacity: int = 5_000):
+        """
+        Initialize MarketDataStore
+
+        Args:
+            tick_capacity: Ticks kept per symbol
+            bar_capacity: Bars kept per symbol and timeframe
+        """
+        if np is None:
+            raise ImportError("numpy is required for MarketDataStore")
+        self.tick_capacity = tick_capacity
+        self.bar_capacity = bar_capacity
+        self._ticks: Dict[str, RingBuffer] = {}
+        self._bars: Dict[Tuple[str, str], BarRing] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(symbol: str) -> str:
+        return str(symbol).upper()
+
+    def _tick_ring(self, symbol: str, create: bool = False) -> Optional[RingBuffer]:
+        key = self._key(symbol)
+        ring = self._ticks.get(key)
+        if ring is None and create:
+            with self._lock:
+                ring = self._ticks.get(key)
+                if ring is None:
+                    ring = self._ticks[key] = RingBuffer(TICK_FIELDS, self.tick_capacity)
+        return ring
+
+    def _bar_ring(self, symbol: str, timeframe: str, create: bool = False) -> Optional[BarRing]:
+        key = (self._key(symbol), str(timeframe).upper())
+        ring = self._bars.get(key)
+        if ring is None and create:
+            with self._lock:
+                ring = self._bars.get(key)
+                if ring is None:
+                    ring = self._bars[key] = BarRing(BAR_FIELDS, self.bar_capacity)
+        return ring
+
+    def push_ticks(self, symbol: str, ticks: List[Any]) -> int:
+        """
+        Store ticks for a symbol
+
+        Args:
+            symbol: Trading symbol
+            ticks: [time, bid, ask, last, volume] lists or dictionaries
+                (time in epoch seconds)
+
+        Returns:
+            Number of ticks stored
+        """
+        records = to_records(ticks, TICK_FIELDS)
+        return self._tick_ring(symbol, create=True).extend(records)
+
+    def push_bars(self, symbol: str, timeframe: str, bars: List[Any]) -> int:
+        """
+        Store closed bars for a symbol and timeframe
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe (e.g. 'M1', 'H1')
+            bars: [time, open, high, low, close, volume] lists or
+                dictionaries, oldest first (time = bar open, epoch seconds)
+
+        Returns:
+            Number of bars stored
+        """
+        records = to_records(bars, BAR_FIELDS)
+        return self._bar_ring(symbol, timeframe, create=True).extend(records)
+
+    def ticks(self, symbol: str, count: Optional[int] = None, copy: bool = False):
+        """
+        Get the latest ticks for a symbol (oldest first)
+
+        Args:
+            symbol: Trading symbol
+            count: Number of ticks (None = all kept)
+            copy: Return a copy instead of a zero-copy view
+
+        Returns:
+            Structured array (fields: time, bid, ask, last, volume), or None
+        """
+        ring = self._tick_ring(symbol)
+        return ring.window(count, copy) if ring is not None else None
+
+    def bars(self, symbol: str, timeframe: str, count: Optional[int] = None,
+             copy: bool = False):
+        """
+        Get the latest bars for a symbol and timeframe (oldest first)
+
+        A timeframe the EA doesn't push is resampled from the pushed
+        timeframe covering the longest history among those that divide
+        it (e.g. H1 from M1); only complete bars are returned then.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            count: Number of bars (None = all kept)
+            copy: Return a copy instead of a zero-copy view
+
+        Returns:
+            Structured array (fields: time, open, high, low, close, volume), or None
+        """
+        ring = self._bar_ring(symbol, timeframe)
+        if ring is not None and len(ring):
+            return ring.window(count, copy)
+        resampled = self._resampled_bars(symbol, timeframe)
+        if resampled is None:
+            return ring.window(count, copy) if ring is not None else None
+        return resampled if count is None else resampled[max(0, len(resampled) - count):]
+
+    def _resampled_bars(self, symbol: str, timeframe: str):
+        """Resample a shorter pushed timeframe to `timeframe` (None if none fits)"""
+        seconds = TIMEFRAME_SECONDS.get(str(timeframe).upper())
+        if seconds is None:
+            return None
+        key = self._key(symbol)
+        with self._lock:
+            candidates = [(TIMEFRAME_SECONDS[source], ring)
+                          for (ring_symbol, source), ring in self._bars.items()
+                          if ring_symbol == key and source in TIMEFRAME_SECONDS and len(ring)]
+        candidates = [(source_seconds, ring) for source_seconds, ring in candidates
+                      if source_seconds < seconds and seconds % source_seconds == 0]
+        if not candidates:
+            return None
+        source_seconds, ring = max(candidates, key=lambda item: len(item[1]) * item[0])
+        return resample_bars(ring.window(), seconds, source_seconds)
+
+    def latest_tick(self, symbol: str) -> Optional[Dict[str, float]]:
+        """Get the most recent tick for a symbol"""
+        ring = self._tick_ring(symbol)
+        return ring.last() if ring is not None else None
+
+    def symbols(self) -> List[str]:
+        """Get symbols with ticks or bars"""
+        with self._lock:
+            return sorted(set(self._ticks) | {symbol for symbol, _ in self._bars})
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get per-symbol record counts"""
+        with self._lock:
+            ticks = dict(self._ticks)
+            bars = dict(self._bars)
+        return {
+            'ticks': {symbol: {'kept': len(ring), 'received': ring.total}
+                      for symbol, ring in ticks.items()},
+            'bars': {f"{symbol}/{timeframe}": {'kept': len(ring), 'received': ring.total}
+                     for (symbol, timeframe), ring in bars.items()}
+        }
@@ -0,0 +1,383 @@
+"""
+Bridge Metrics
+Lightweight latency histograms, counters and gauges used for bridge
+instrumentation, with a Prometheus text exporter
+"""
+import bisect
+import logging
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+def _build_bounds(min_value: float, max_value: float, growth: float) -> List[float]:
+    """Build geometric bucket upper bounds (seconds)"""
+    bounds = []
+    value = min_value
+    while value < max_value:
+        bounds.append(value)
+        value *= growth
+    bounds.append(max_value)
+    return bounds
+
+
+class LatencyHistogram:
+    """
+    Log-bucketed latency histogram
+
+    Buckets grow geometrically from 1 microsecond to 60 seconds, so recording
+    is a single bisect and percentiles are accurate to the bucket growth
+    factor (~10%) regardless of how many samples are recorded.
+    """
+
+    _BOUNDS = _build_bounds(1e-6, 60.0, 1.1)
+
+    def __init__(self):
+        """Initialize empty histogram"""
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self._BOUNDS) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        """
+        Record a latency sample
+
+        Args:
+            seconds: Observed latency in seconds
+        """
+        index = bisect.bisect_left(self._BOUNDS, seconds)
+        with self._lock:
+            self._counts[index] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, percent: float) -> float:
+        """
+        Get latency percentile
+
+        Args:
+            percent: Percentile (0-100)
+
+        Returns:
+            Upper bound of the bucket holding the percentile, in seconds
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = max(1, int(round(self.count * percent / 100.0)))
+            seen = 0
+            for index, bucket_count in enumerate(self._counts):
+                seen += bucket_count
+                if seen >= target:
+                    if index < len(self._BOUNDS):
+                        return min(self._BOUNDS[index], self.max)
+                    return self.max
+            return self.max
+
+    def merge(self, other: 'LatencyHistogram'):
+        """
+        Add another histogram's samples to this one
+
+        Args:
+            other: Histogram to merge (e.g. from another thread or process)
+        """
+        with other._lock:
+            counts = list(other._counts)
+            count, total, maximum = other.count, other.total, other.max
+        with self._lock:
+            self._counts = [a + b for a, b in zip(self._counts, counts)]
+            self.count += count
+            self.total += total
+            self.max = max(self.max, maximum)
+
+    def __getstate__(self):
+        """Pickle without the lock (histograms are sent between processes)"""
+        state = self.__dict__.copy()
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def reset(self):
+        """Clear all samples"""
+        with self._lock:
+            self._counts = [0] * (len(self._BOUNDS) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+    def snapshot(self) -> Dict[str, float]:
+        """Get histogram summary (milliseconds)"""
+        count = self.count
+        mean = (self.total / count) if count else 0.0
+        return {
+            'count': count,
+            'mean_ms': round(mean * 1000, 4),
+            'p50_ms': round(self.percentile(50) * 1000, 4),
+            'p90_ms': round(self.percentile(90) * 1000, 4),
+            'p99_ms': round(self.percentile(99) * 1000, 4),
+            'p999_ms': round(self.percentile(99.9) * 1000, 4),
+            'max_ms': round(self.max * 1000, 4)
+        }
+
+
+class GaugeSeries:
+    """
+    Ring of timestamped gauge samples
+
+    Keeps the last `capacity` samples so a gauge (e.g. queue depth) can be
+    inspected over time, not just at the moment it is scraped.
+    """
+
+    def __init__(self, capacity: int = 360):
+        """
+        Initialize GaugeSeries
+
+        Args:
+            capacity: Number of samples kept
+        """
+        self._samples: deque = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def record(self, value: float, timestamp: Optional[float] = None):
+        """
+        Record a sample
+
+        Args:
+            value: Gauge value
+            timestamp: Epoch seconds (default: now)
+        """
+        with self._lock:
+            self.value = value
+            self._samples.append((time.time() if timestamp is None else timestamp, value))
+
+    def snapshot(self, limit: int = 60) -> Dict[str, Any]:
+        """Get current value, min/max/avg over the ring and the latest samples"""
+        with self._lock:
+            samples = list(self._samples)
+        values = [value for _, value in samples]
+        return {
+            'current': self.value,
+            'min': min(values) if values else 0,
+            'max': max(values) if values else 0,
+            'avg': round(sum(values) / len(values), 3) if values else 0,
+            'samples': [[round(ts, 3), value] for ts, value in samples[-limit:]]
+        }
+
+
+class BridgeMetrics:
+    """
+    Request instrumentation for the bridge
+
+    Tracks per-action request/error counters, per-action processing latency,
+    latency of each request phase (wait for a worker, decode, process,
+    encode, total), bytes in/out and sampled queue-depth gauges.
+    """
+
+    PHASES = ('wait', 'decode', 'process', 'encode', 'total')
+
+    def __init__(self, sample_interval: float = 1.0, gauge_capacity: int = 360):
+        """
+        Initialize BridgeMetrics
+
+        Args:
+            sample_interval: Minimum seconds between gauge samples
+            gauge_capacity: Number of gauge samples kept per gauge
+        """
+        self._lock = threading.Lock()
+        self.started = time.time()
+        self.sample_interval = sample_interval
+        self._gauge_capacity = gauge_capacity
+        self._next_sample = 0.0
+        self.actions: Dict[str, Dict[str, int]] = {}
+        self.action_latency: Dict[str, LatencyHistogram] = {}
+        self.phases = {phase: LatencyHistogram() for phase in self.PHASES}
+        self.gauges: Dict[str, GaugeSeries] = {}
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def count_action(self, action: str, error: bool = False,
+                     seconds: Optional[float] = None):
+        """
+        Count an executed action
+
+        Args:
+            action: Action name
+            error: Whether the action returned an error
+            seconds: Processing time of the action, if measured
+        """
+        with self._lock:
+            counters = self.actions.get(action)
+            if counters is None:
+                counters = self.actions[action] = {'requests': 0, 'errors': 0}
+                self.action_latency[action] = LatencyHistogram()
+            counters['requests'] += 1
+            if error:
+                counters['errors'] += 1
+            histogram = self.action_latency[action]
+        if seconds is not None:
+            histogram.record(seconds)
+
+    def record_phase(self, phase: str, seconds: float):
+        """Record the duration of a request phase"""
+        self.phases[phase].record(seconds)
+
+    def record_bytes(self, received: int, sent: int):
+        """Count bytes received from and sent to EAs"""
+        with self._lock:
+            self.bytes_in += received
+            self.bytes_out += sent
+
+    def sample_due(self) -> bool:
+        """Check (and claim) whether gauges should be sampled now"""
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_sample:
+                return False
+            self._next_sample = now + self.sample_interval
+            return True
+
+    def set_gauge(self, name: str, value: float):
+        """Record a gauge sample"""
+        with self._lock:
+            gauge = self.gauges.get(name)
+            if gauge is None:
+                gauge = self.gauges[name] = GaugeSeries(self._gauge_capacity)
+        gauge.record(value)
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get all metrics as a dictionary (latencies in milliseconds)"""
+        with self._lock:
+            actions = {name: dict(counters) for name, counters in self.actions.items()}
+            latency = dict(self.action_latency)
+            gauges = dict(self.gauges)
+            bytes_in, bytes_out = self.bytes_in, self.bytes_out
+        for name, histogram in latency.items():
+            actions[name]['process'] = histogram.snapshot()
+        return {
+            'uptime_seconds': round(time.time() - self.started, 3),
+            'actions': actions,
+            'phases': {phase: histogram.snapshot() for phase, histogram in self.phases.items()},
+            'bytes_in': bytes_in,
+            'bytes_out': bytes_out,
+            'gauges': {name: gauge.snapshot() for name, gauge in gauges.items()}
+        }
+
+    def prometheus(self, prefix: str = "mql5_bridge",
+                   counters: Optional[Dict[str, int]] = None) -> str:
+        """
+        Render metrics in the Prometheus text exposition format
+
+        Args:
+            prefix: Metric name prefix
+            counters: Extra monotonically increasing counters to export
+
+        Returns:
+            Exposition text
+        """
+        with self._lock:
+            actions = {name: dict(c) for name, c in self.actions.items()}
+            latency = dict(self.action_latency)
+            gauges = {name: gauge.value for name, gauge in self.gauges.items()}
+            bytes_in, bytes_out = self.bytes_in, self.bytes_out
+
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str,
+                   samples: List[Tuple[str, Dict[str, str], float]]):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for suffix, labels, value in samples:
+                label_text = ','.join(f'{key}="{val}"' for key, val in labels.items())
+                label_text = f"{{{label_text}}}" if label_text else ''
+                lines.append(f"{prefix}_{name}{suffix}{label_text} {value}")
+
+        def summary(histogram: LatencyHistogram, labels: Dict[str, str]):
+            samples = [('', {**labels, 'quantile': quantile}, histogram.percentile(percent))
+                       for quantile, percent in (('0.5', 50), ('0.9', 90),
+                                                 ('0.99', 99), ('0.999', 99.9))]
+            samples.append(('_sum', labels, histogram.total))
+            samples.append(('_count', labels, histogram.count))
+            return samples
+
+        metric('requests_total', 'counter', 'Actions executed, by action',
+               [('', {'action': name}, c['requests']) for name, c in sorted(actions.items())])
+        metric('request_errors_total', 'counter', 'Actions that returned an error, by action',
+               [('', {'action': name}, c['errors']) for name, c in sorted(actions.items())])
+        metric('action_seconds', 'summary', 'Processing time by action',
+               [sample for name, histogram in sorted(latency.items())
+                for sample in summary(histogram, {'action': name})])
+        metric('phase_seconds', 'summary', 'Request time by phase',
+               [sample for phase, histogram in self.phases.items()
+                for sample in summary(histogram, {'phase': phase})])
+        metric('received_bytes_total', 'counter', 'Request bytes received', [('', {}, bytes_in)])
+        metric('sent_bytes_total', 'counter', 'Response bytes sent', [('', {}, bytes_out)])
+        for name, value in sorted((counters or {}).items()):
+            metric(f"{name}_total", 'counter', f"Bridge {name.replace('_', ' ')}",
+                   [('', {}, value)])
+        for name, value in sorted(gauges.items()):
+            metric(name, 'gauge', f"Sampled {name.replace('_', ' ')}", [('', {}, value)])
+        return '\n'.join(lines) + '\n'
+
+
+class MetricsServer:
+    """Serves Prometheus text from a callable on http://host:port/metrics"""
+
+    def __init__(self, render: Callable[[], str], port: int, host: str = "127.0.0.1"):
+        """
+        Initialize MetricsServer
+
+        Args:
+            render: Returns the exposition text for each scrape
+            port: HTTP port
+            host: Bind address (default: localhost)
+        """
+        self.render = render
+        self.port = port
+        self.host = host
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        """Start serving in a daemon thread"""
+        render = self.render
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Scrapes every few seconds would flood the bridge log
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True,
+                                        name='mql5-bridge-metrics')
+        self._thread.start()
+        logger.info(f"Metrics available on http://{self.host}:{self.port}/metrics")
+
+    def stop(self):
+        """Stop serving"""
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
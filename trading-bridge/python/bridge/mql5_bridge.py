@@ -7,17 +7,27 @@ import json
 import time
 import threading
 import logging
-from typing import Dict, List, Optional, Any
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Any, Union
 from datetime import datetime
 from pathlib import Path
 
 # Import signal_manager - handle both relative and absolute imports
 try:
     from .signal_manager import SignalManager, TradeSignal
+    from .metrics import BridgeMetrics, MetricsServer
+    from .codec import CodecError, available_encodings, detect_codec, get_codec, negotiate
+    from .journal import SignalJournal
+    from .market_data import MarketDataStore, np
 except (ImportError, ValueError):
     # Fallback for when running as script or module
     try:
         from bridge.signal_manager import SignalManager, TradeSignal
+        from bridge.metrics import BridgeMetrics, MetricsServer
+        from bridge.codec import CodecError, available_encodings, detect_codec, get_codec, negotiate
+        from bridge.journal import SignalJournal
+        from bridge.market_data import MarketDataStore, np
     except ImportError:
         import sys
         from pathlib import Path
@@ -25,6 +35,10 @@ except (ImportError, ValueError):
         if str(bridge_dir) not in sys.path:
             sys.path.insert(0, str(bridge_dir))
         from signal_manager import SignalManager, TradeSignal
+        from metrics import BridgeMetrics, MetricsServer
+        from codec import CodecError, available_encodings, detect_codec, get_codec, negotiate
+        from journal import SignalJournal
+        from market_data import MarketDataStore, np
 
 
 # Setup logging
@@ -44,148 +58,723 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+class MultipartResponse:
+    """
+    Response sent as a header frame followed by data frames
+    
+    Used for bulk exports: each chunk is encoded and sent as its own frame
+    (zero-copy), so a large export never becomes one giant payload.
+    """
+    
+    __slots__ = ('header', 'chunks')
+    
+    def __init__(self, header: Dict[str, Any], chunks: Iterable[Any]):
+        """
+        Initialize MultipartResponse
+        
+        Args:
+            header: Response dictionary (sent first, in the reply encoding)
+            chunks: Objects encoded one per frame, lazily, after the header
+        """
+        self.header = header
+        self.chunks = chunks
+
+
 class MQL5Bridge:
     """Bridge between Python trading engine and MQL5 EA"""
     
-    def __init__(self, port: int = 5555, host: str = "127.0.0.1"):
+    MODES = ('rep', 'router')
+    MAX_BATCH = 64  # Sub-requests accepted in one BATCH
+    MAX_EXPORT_PAGE = 5000  # Signals per EXPORT_HISTORY request
+    EXPORT_CHUNK_SIZE = 250  # Signals per EXPORT_HISTORY frame
+    # Requests from monitoring tools rather than EAs; they don't prove an EA is alive
+    MONITOR_ACTIONS = frozenset({'GET_METRICS', 'GET_BRIDGE_STATUS', 'EXPORT_HISTORY'})
+    
+    def __init__(self, port: int = 5555, host: str = "127.0.0.1",
+                 mode: str = "rep", workers: int = 4,
+                 publish_port: Optional[int] = None, replay_size: int = 1000,
+                 signal_manager: Optional[SignalManager] = None,
+                 journal_path: Optional[str] = None,
+                 metrics_port: Optional[int] = None,
+                 market_data: Optional[MarketDataStore] = None):
         """
         Initialize MQL5 Bridge
         
         Args:
             port: ZeroMQ port number
             host: Host address (default: localhost)
+            mode: 'rep' (one request at a time) or 'router' (many EAs
+                served concurrently by a worker pool)
+            workers: Worker threads used in router mode
+            publish_port: If set, push signals to EAs over a PUB socket on
+                this port instead of queueing them for GET_SIGNALS. Topics
+                are upper-case "BROKER.SYMBOL". Published signals are
+                deduplicated, TTL-checked (expired ones are neither sent
+                nor replayed) and journaled to history, but the replay
+                ring and sequence numbers live in memory only: REPLAY
+                cannot return signals published before a restart
+            replay_size: Number of published signals kept for REPLAY
+            signal_manager: Pre-configured SignalManager (e.g. priority
+                ordering or coalescing); a FIFO one is created if omitted
+            journal_path: If set (and no signal_manager is given), queued and
+                delivered signals are journaled to this file and restored on
+                restart
+            metrics_port: If set, serve Prometheus metrics on
+                http://host:metrics_port/metrics
+            market_data: Store for ticks/bars pushed by EAs (PUSH_TICKS,
+                PUSH_BARS); one is created if omitted and numpy is installed
         """
+        if mode not in self.MODES:
+            raise ValueError(f"Invalid bridge mode: {mode}")
+        
         self.port = port
         self.host = host
+        self.mode = mode
+        self.workers = workers
         self.context = None
         self.socket = None
         self.running = False
-        self.signal_manager = SignalManager()
+        self._journal = None
+        if signal_manager is None and journal_path:
+            self._journal = SignalJournal(journal_path)
+            signal_manager = SignalManager(journal=self._journal)
+        self.signal_manager = signal_manager or SignalManager()
+        if market_data is None and np is not None:
+            market_data = MarketDataStore()
+        self.market_data = market_data
         self.connection_status = "disconnected"
         self.last_heartbeat = None
         self.heartbeat_timeout = 30  # seconds
         
+        # Connection state: every EA request pushes a monotonic deadline
+        # forward; the poll loop sleeps until it and flags the EA
+        # disconnected the moment it passes. Listeners hear every change.
+        self._heartbeat_deadline: Optional[float] = None
+        self._status_lock = threading.Lock()
+        self._status_changed = threading.Condition(self._status_lock)
+        self._status_listeners: List[Callable[[str, str], None]] = []
+        
+        # Poll loop control
+        self._control = None
+        self._control_address = f"inproc://mql5-bridge-control-{id(self)}"
+        self._local = threading.local()
+        self._stopped = threading.Event()
+        self._ready = threading.Event()
+        
+        # Sockets live on our own context, or on one shared by a BridgeSupervisor
+        self._owns_context = True
+        
+        # Router mode: worker pool and the pipe carrying their replies back
+        self._executor = None
+        self._owns_executor = True
+        self._replies = None
+        self._replies_address = f"inproc://mql5-bridge-replies-{id(self)}"
+        
+        # Push delivery: PUB socket, ordered outbox drained by the loop and
+        # a replay ring of recently published signals; both hold the
+        # signal's expiry (epoch seconds or None) so expired ones are dropped
+        self.publish_port = publish_port
+        self._publisher = None
+        self._outbox = deque()
+        self._replay = deque(maxlen=replay_size)
+        self._publish_seq = 0
+        self._publish_lock = threading.Lock()
+        
+        # Connected EAs keyed by ZMQ identity (router mode)
+        self.clients: Dict[str, Dict[str, Any]] = {}
+        self._clients_lock = threading.Lock()
+        
+        # Per-action counters, phase latencies, bytes and gauges; total
+        # request turnaround (receive -> response sent) is the 'total' phase
+        self.metrics = BridgeMetrics()
+        self.request_latency = self.metrics.phases['total']
+        self.metrics_port = metrics_port
+        self._metrics_server = None
+        
         # Statistics
         self.stats = {
             'signals_sent': 0,
             'signals_received': 0,
+            'signals_published': 0,
+            'signals_expired': 0,
+            'signals_acked': 0,
+            'batches': 0,
+            'ticks_received': 0,
+            'bars_received': 0,
             'errors': 0,
             'reconnections': 0
         }
+        self._stats_lock = threading.Lock()
     
     def start(self):
         """Start the bridge server"""
         try:
             self.context = zmq.Context()
-            self.socket = self.context.socket(zmq.REP)
-            bind_address = f"tcp://{self.host}:{self.port}"
-            self.socket.bind(bind_address)
-            self.socket.setsockopt(zmq.RCVTIMEO, 5000)  # 5 second timeout
-            
-            self.running = True
-            self.connection_status = "listening"
-            logger.info(f"MQL5 Bridge started on {bind_address}")
-            
-            # Start heartbeat monitor
-            heartbeat_thread = threading.Thread(target=self._monitor_heartbeat, daemon=True)
-            heartbeat_thread.start()
+            self._owns_context = True
+            self._open()
+            self._start_metrics_server()
+            self._mark_started()
+            logger.info(f"MQL5 Bridge started on tcp://{self.host}:{self.port} ({self.mode} mode)")
             
             # Main loop
             self._run()
             
         except Exception as e:
             logger.error(f"Failed to start bridge: {e}")
-            self.connection_status = "error"
+            self._set_connection_status("error")
+            # Release wait_ready() callers instead of letting them time out
+            self._ready.set()
             raise
     
+    def _open(self, executor: Optional[ThreadPoolExecutor] = None):
+        """
+        Bind this endpoint's sockets on self.context
+        
+        Args:
+            executor: Worker pool for router mode (e.g. shared by a
+                BridgeSupervisor); the bridge creates and owns one if omitted
+        """
+        try:
+            socket_type = zmq.ROUTER if self.mode == 'router' else zmq.REP
+            self.socket = self.context.socket(socket_type)
+            self.socket.setsockopt(zmq.LINGER, 0)
+            self.socket.bind(f"tcp://{self.host}:{self.port}")
+            
+            # Control pipe used by stop() (and other threads) to wake the poller
+            self._control = self.context.socket(zmq.PULL)
+            self._control.setsockopt(zmq.LINGER, 0)
+            self._control.bind(self._control_address)
+            
+            if self.mode == 'router':
+                self._replies = self.context.socket(zmq.PULL)
+                self._replies.setsockopt(zmq.LINGER, 0)
+                self._replies.bind(self._replies_address)
+                self._owns_executor = executor is None
+                self._executor = executor or ThreadPoolExecutor(
+                    max_workers=self.workers, thread_name_prefix='mql5-bridge-worker')
+            
+            if self.publish_port:
+                self._publisher = self.context.socket(zmq.PUB)
+                self._publisher.setsockopt(zmq.LINGER, 0)
+                self._publisher.bind(f"tcp://{self.host}:{self.publish_port}")
+                logger.info(f"Publishing signals on tcp://{self.host}:{self.publish_port}")
+        except Exception:
+            # A shared context outlives this endpoint, so don't leave sockets bound
+            self._close_sockets()
+            raise
+    
+    def _mark_started(self):
+        """Flag the endpoint as listening and release wait_ready() callers"""
+        self.running = True
+        self._stopped.clear()
+        self._heartbeat_deadline = None
+        self._set_connection_status("listening")
+        self._ready.set()
+    
+    def _poll_sockets(self) -> List[Any]:
+        """Sockets the poll loop must watch for this endpoint"""
+        sockets = [self.socket, self._control]
+        if self._replies is not None:
+            sockets.append(self._replies)
+        return sockets
+    
+    def _handle_events(self, events: Dict[Any, int]):
+        """
+        Handle poll events for this endpoint's sockets (loop thread only)
+        
+        Args:
+            events: Result of zmq.Poller.poll() as a dictionary
+        """
+        if self._control in events:
+            self._drain_control()
+            self._flush_outbox()
+        
+        if self._replies is not None and self._replies in events:
+            self._forward_replies()
+        
+        if self.socket in events:
+            if self.mode == 'router':
+                self._dispatch_requests()
+            else:
+                self._handle_request()
+    
+    def _close_sockets(self):
+        """Close this endpoint's sockets (loop thread only)"""
+        for sock in (self.socket, self._control, self._replies, self._publisher):
+            if sock is not None and not sock.closed:
+                sock.close(linger=0)
+        self.socket = None
+        self._control = None
+        self._replies = None
+        self._publisher = None
+    
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the bridge is listening (for callers on other threads)
+        
+        Args:
+            timeout: Maximum seconds to wait (None = wait forever)
+            
+        Returns:
+            True if the bridge is running, False on timeout or startup failure
+        """
+        return self._ready.wait(timeout) and self.running
+    
     def _run(self):
-        """Main bridge loop"""
-        while self.running:
-            try:
-                # Wait for request from MQL5 EA
-                try:
-                    message = self.socket.recv_string(zmq.NOBLOCK)
-                except zmq.Again:
-                    time.sleep(0.1)
-                    continue
-                
-                # Parse request
+        """Main bridge loop - blocks in zmq.Poller until a request or wake-up arrives"""
+        poller = zmq.Poller()
+        for sock in self._poll_sockets():
+            poller.register(sock, zmq.POLLIN)
+        
+        # Signals accepted before the loop started (EAs recover them via REPLAY)
+        self._flush_outbox()
+        
+        try:
+            while self.running:
                 try:
-                    request = json.loads(message)
-                except json.JSONDecodeError as e:
-                    logger.error(f"Invalid JSON received: {e}")
-                    response = {'status': 'ERROR', 'message': 'Invalid JSON'}
-                    self.socket.send_string(json.dumps(response))
-                    continue
-                
-                # Process request
-                response = self._process_request(request)
-                
-                # Send response
-                self.socket.send_string(json.dumps(response))
-                
-            except Exception as e:
-                logger.error(f"Bridge error: {e}")
-                self.stats['errors'] += 1
-                if self.running:
-                    response = {'status': 'ERROR', 'message': str(e)}
-                    try:
-                        self.socket.send_string(json.dumps(response))
-                    except:
-                        pass
-                time.sleep(1)
-    
-    def _process_request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+                    # Sleep no longer than the heartbeat deadline
+                    timeout = self._check_heartbeat()
+                    self._handle_events(dict(poller.poll(timeout * 1000)))
+                except zmq.ContextTerminated:
+                    break
+                except Exception as e:
+                    logger.error(f"Bridge error: {e}")
+                    self._increment('errors')
+                    time.sleep(1)
+        finally:
+            self._stopped.set()
+    
+    def _handle_request(self):
+        """Receive one request from the EA, process it and send the response (rep mode)"""
+        try:
+            message = self.socket.recv(zmq.NOBLOCK)
+        except zmq.Again:
+            return
+        
+        started = time.perf_counter()
+        response = self._serve(message)
+        
+        # Send response (REP socket must always answer before the next recv)
+        if isinstance(response, list):
+            self.socket.send_multipart(response, copy=False)
+        else:
+            self.socket.send(response)
+        self.request_latency.record(time.perf_counter() - started)
+    
+    def _dispatch_requests(self):
+        """Hand every pending ROUTER request to the worker pool (router mode)"""
+        while True:
+            try:
+                frames = self.socket.recv_multipart(zmq.NOBLOCK)
+            except zmq.Again:
+                return
+            
+            # REQ peers send [identity, '', payload]; DEALER peers may omit the delimiter
+            if len(frames) < 2:
+                continue
+            envelope, message = frames[:-1], frames[-1]
+            self._executor.submit(self._serve_routed, envelope, message, time.perf_counter())
+    
+    def _serve_routed(self, envelope: List[bytes], message: bytes, started: float):
+        """Process a routed request on a worker thread and queue the reply"""
+        self.metrics.record_phase('wait', time.perf_counter() - started)
+        client = self._register_client(envelope[0])
+        response = self._serve(message, client)
+        frames = envelope + (response if isinstance(response, list) else [response])
+        self._local_socket('replies', self._replies_address).send_multipart(frames, copy=False)
+        self.request_latency.record(time.perf_counter() - started)
+    
+    def _forward_replies(self):
+        """Send worker replies out through the ROUTER socket"""
+        while True:
+            try:
+                # Frames (not bytes): export chunks are passed on without copying
+                frames = self._replies.recv_multipart(zmq.NOBLOCK, copy=False)
+            except zmq.Again:
+                return
+            try:
+                self.socket.send_multipart(frames, zmq.NOBLOCK, copy=False)
+            except zmq.Again:
+                logger.warning("Dropped reply: EA not reachable")
+    
+    def _serve(self, message: bytes,
+               client: Optional[Dict[str, Any]] = None) -> Union[bytes, List[bytes]]:
+        """
+        Decode, process and encode a single request
+        
+        Args:
+            message: Raw request payload
+            client: Connected EA record (router mode)
+            
+        Returns:
+            Encoded response payload, or a list of frames for multipart
+            responses (send with send_multipart(..., copy=False))
+        """
+        metrics = self.metrics
+        started = time.perf_counter()
+        
+        # Parse request (JSON from old EAs, or the negotiated binary encoding)
+        codec = detect_codec(message)
+        try:
+            request = codec.decode(message)
+        except CodecError as e:
+            logger.error(f"Invalid {codec.name.upper()} received: {e}")
+            metrics.count_action('INVALID', error=True)
+            payload = codec.encode({'status': 'ERROR', 'message': f'Invalid {codec.name.upper()}'})
+            metrics.record_bytes(len(message), len(payload))
+            return payload
+        decoded = time.perf_counter()
+        metrics.record_phase('decode', decoded - started)
+        
+        # Reply in the encoding asked for by the request, else the one
+        # negotiated by HELLO, else the one the request arrived in
+        response_codec = codec
+        if isinstance(request, dict) and request.get('encoding'):
+            response_codec = get_codec(request['encoding']) or codec
+        elif client is not None and client['encoding']:
+            response_codec = get_codec(client['encoding']) or codec
+        
+        # Process request
+        try:
+            response = self._process_request(request, client)
+        except Exception as e:
+            logger.error(f"Bridge error: {e}")
+            self._increment('errors')
+            response = {'status': 'ERROR', 'message': str(e)}
+        processed = time.perf_counter()
+        metrics.record_phase('process', processed - decoded)
+        action = str(request.get('action', '')).upper() if isinstance(request, dict) else ''
+        multipart = isinstance(response, MultipartResponse)
+        header = response.header if multipart else response
+        metrics.count_action(action or 'UNKNOWN', header.get('status') == 'ERROR',
+                             processed - decoded)
+        
+        payload = response_codec.encode(header)
+        if multipart:
+            payload = [payload] + [response_codec.encode(chunk) for chunk in response.chunks]
+        metrics.record_phase('encode', time.perf_counter() - processed)
+        metrics.record_bytes(len(message),
+                             sum(map(len, payload)) if multipart else len(payload))
+        if metrics.sample_due():
+            self._sample_gauges()
+        return payload
+    
+    def _sample_gauges(self):
+        """Record queue-depth gauges"""
+        self.metrics.set_gauge('queue_depth', self.signal_manager.get_queue_size())
+        self.metrics.set_gauge('in_flight', self.signal_manager.get_in_flight_count())
+        self.metrics.set_gauge('publish_outbox', len(self._outbox))
+        with self._clients_lock:
+            self.metrics.set_gauge('clients', len(self.clients))
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get request metrics, gauges and counters"""
+        self._sample_gauges()
+        with self._stats_lock:
+            stats = self.stats.copy()
+        return {**self.metrics.snapshot(), 'stats': stats}
+    
+    def render_prometheus(self) -> str:
+        """Get metrics in the Prometheus text exposition format"""
+        self._sample_gauges()
+        with self._stats_lock:
+            stats = self.stats.copy()
+        return self.metrics.prometheus(counters=stats)
+    
+    def _start_metrics_server(self):
+        """Start the Prometheus endpoint if a metrics port is configured"""
+        if self.metrics_port and self._metrics_server is None:
+            self._metrics_server = MetricsServer(self.render_prometheus, self.metrics_port, self.host)
+            self._metrics_server.start()
+    
+    def _stop_metrics_server(self):
+        """Stop the Prometheus endpoint"""
+        if self._metrics_server:
+            self._metrics_server.stop()
+            self._metrics_server = None
+    
+    def _register_client(self, identity: bytes) -> Dict[str, Any]:
+        """Get (or create) the record of a connected EA by ZMQ identity"""
+        # EAs may set a readable ZMQ_IDENTITY; auto-generated ones are binary
+        if identity.isascii() and identity.decode('ascii').isprintable():
+            client_id = identity.decode('ascii')
+        else:
+            client_id = identity.hex()
+        
+        with self._clients_lock:
+            client = self.clients.get(client_id)
+            if client is None:
+                client = {
+                    'id': client_id,
+                    'broker': None,
+                    'terminal': None,
+                    'encoding': None,
+                    'requests': 0,
+                    'last_seen': None
+                }
+                self.clients[client_id] = client
+                logger.info(f"EA connected: {client_id}")
+            client['requests'] += 1
+            client['last_seen'] = datetime.now()
+        return client
+    
+    def _increment(self, stat: str, amount: int = 1):
+        """Increment a statistics counter (safe from worker threads)"""
+        with self._stats_lock:
+            self.stats[stat] += amount
+    
+    def _drain_control(self):
+        """Consume pending wake-up messages from the control pipe"""
+        while True:
+            try:
+                self._control.recv(zmq.NOBLOCK)
+            except zmq.Again:
+                return
+    
+    def _flush_outbox(self):
+        """Publish signals accepted by send_signal() (loop thread only)"""
+        if self._publisher is None:
+            return
+        now = time.time()
+        while self._outbox:
+            topic, seq, payload, expires = self._outbox.popleft()
+            if expires is not None and expires <= now:
+                # Queued before the endpoint opened and stale now; the seq
+                # gap makes EAs REPLAY, which skips it too
+                self._increment('signals_expired')
+                continue
+            self._publisher.send_multipart([topic, str(seq).encode('ascii'), payload])
+            self._increment('signals_published')
+    
+    def _publish(self, signal: TradeSignal):
+        """
+        Assign a sequence number to a signal and hand it to the loop for publishing
+        
+        Args:
+            signal: Accepted trade signal
+        """
+        # Upper-case like broker routing, so "Exness." subscribers match too
+        topic = f"{signal.broker}.{signal.symbol}".upper()
+        expires = signal.expires_at.timestamp() if signal.expires_at is not None else None
+        with self._publish_lock:
+            self._publish_seq += 1
+            seq = self._publish_seq
+            data = signal.to_dict()
+            data['seq'] = seq
+            data['topic'] = topic
+            self._replay.append((data, expires))
+            self._outbox.append((topic.encode('utf-8'), seq, json.dumps(data).encode('utf-8'),
+                                 expires))
+        self._wake()
+    
+    def _replay_signals(self, since: int, topic: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Get published signals after a sequence number (for reconnecting EAs)
+        
+        Args:
+            since: Last sequence number the EA has seen
+            topic: Only return signals whose topic starts with this prefix
+                (case-insensitive)
+            
+        Returns:
+            Response dictionary (expired signals are left out)
+        """
+        now = time.time()
+        with self._publish_lock:
+            last_seq = self._publish_seq
+            first_seq = self._replay[0][0]['seq'] if self._replay else last_seq + 1
+            signals = [data for data, expires in self._replay
+                       if data['seq'] > since and (expires is None or expires > now)]
+        if topic:
+            topic = topic.upper()
+            signals = [data for data in signals if data['topic'].startswith(topic)]
+        return {
+            'status': 'OK',
+            'signals': signals,
+            'last_seq': last_seq,
+            # False if signals after `since` have already fallen out of the ring
+            'complete': since + 1 >= first_seq or not last_seq
+        }
+    
+    def _local_socket(self, name: str, address: str):
+        """Get this thread's PUSH socket connected to an inproc pipe of the loop"""
+        context = self.context
+        sock = getattr(self._local, name, None)
+        if sock is None or sock.closed or getattr(self._local, 'context', None) is not context:
+            sock = context.socket(zmq.PUSH)
+            sock.setsockopt(zmq.LINGER, 0)
+            sock.connect(address)
+            setattr(self._local, name, sock)
+            self._local.context = context
+        return sock
+    
+    def _wake(self):
+        """Wake the poll loop from any thread"""
+        context = self.context
+        if context is None or context.closed:
+            return
+        try:
+            self._local_socket('control', self._control_address).send(b'', zmq.NOBLOCK)
+        except zmq.ZMQError:
+            pass
+    
+    def _process_request(self, request: Dict[str, Any],
+                         client: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Process request from MQL5 EA
         
         Args:
             request: Request dictionary
+            client: Connected EA record (router mode)
             
         Returns:
             Response dictionary
         """
         action = request.get('action', '').upper()
+        if action not in self.MONITOR_ACTIONS:
+            self._touch()
+        
+        # Route signals by broker/terminal; router-mode EAs only need to
+        # identify themselves once
+        broker = request.get('broker')
+        terminal = request.get('terminal')
+        if client is not None:
+            if broker:
+                client['broker'] = broker
+            if terminal:
+                client['terminal'] = terminal
+            broker = client['broker']
+            terminal = client['terminal']
+        
+        if action == 'BATCH':
+            # Several actions in one round trip; sub-requests inherit routing
+            return self._process_batch(request, client)
+        
+        elif action == 'HELLO':
+            # Encoding handshake: EA lists encodings it understands
+            codec = negotiate(request.get('encodings'))
+            if client is not None:
+                client['encoding'] = codec.name
+            return {
+                'status': 'OK',
+                'encoding': codec.name,
+                'encodings': available_encodings()
+            }
         
-        if action == 'GET_SIGNALS':
+        elif action == 'GET_SIGNALS':
             # Return pending trade signals
             count = request.get('count', None)
-            signals = self.signal_manager.get_signals(count)
+            # With ack, signals stay in flight until the EA ACKs them
+            ack = bool(request.get('ack', False))
+            visibility_timeout = float(request.get('visibility_timeout') or
+                                       self.signal_manager.ack_timeout)
+            signals = self.signal_manager.get_signals(
+                count, broker=broker, terminal=terminal, ack=ack,
+                visibility_timeout=visibility_timeout)
             signal_dicts = [s.to_dict() for s in signals]
-            self.stats['signals_sent'] += len(signals)
+            self._increment('signals_sent', len(signals))
             logger.info(f"Sending {len(signals)} signals to MQL5")
-            return {
+            response = {
                 'status': 'OK',
                 'signals': signal_dicts,
-                'queue_size': self.signal_manager.get_queue_size()
+                'queue_size': self.signal_manager.get_queue_size(broker, terminal)
             }
+            if ack:
+                response['visibility_timeout'] = visibility_timeout
+            return response
+        
+        elif action == 'ACK':
+            # EA processed these signals; stop redelivering them
+            acked, unknown = self.signal_manager.ack(request.get('signal_ids') or [])
+            self._increment('signals_acked', acked)
+            return {'status': 'OK', 'acked': acked, 'unknown': unknown}
+        
+        elif action == 'NACK':
+            # EA could not process these signals: redeliver or dead-letter
+            result = self.signal_manager.nack(request.get('signal_ids') or [],
+                                              requeue=bool(request.get('requeue', True)))
+            return {'status': 'OK', **result}
         
         elif action == 'SEND_STATUS':
             # Receive status from MQL5
             status = request.get('status', '')
             message = request.get('message', '')
             self.last_heartbeat = datetime.now()
-            self.connection_status = "connected"
             logger.debug(f"MQL5 Status: {status} - {message}")
             return {'status': 'OK'}
         
         elif action == 'HEARTBEAT':
             # Heartbeat from MQL5
             self.last_heartbeat = datetime.now()
-            self.connection_status = "connected"
-            return {
+            response = {
                 'status': 'OK',
                 'timestamp': datetime.now().isoformat(),
-                'queue_size': self.signal_manager.get_queue_size()
+                'queue_size': self.signal_manager.get_queue_size(broker, terminal)
             }
+            if self.publish_port:
+                # Lets subscribers detect missed publications between signals
+                response['last_seq'] = self._publish_seq
+            return response
+        
+        elif action == 'REPLAY':
+            # Re-send published signals an EA missed while disconnected
+            return self._replay_signals(int(request.get('since', 0)), request.get('topic'))
+        
+        elif action == 'PUSH_TICKS':
+            # Ticks streamed by the EA: [[time, bid, ask, last, volume], ...]
+            if self.market_data is None:
+                return {'status': 'ERROR', 'message': 'Market data store not available'}
+            if not request.get('symbol'):
+                return {'status': 'ERROR', 'message': 'symbol required'}
+            stored = self.market_data.push_ticks(request['symbol'], request.get('ticks') or [])
+            self._increment('ticks_received', stored)
+            return {'status': 'OK', 'stored': stored}
+        
+        elif action == 'PUSH_BARS':
+            # Closed bars: [[time, open, high, low, close, volume], ...]
+            if self.market_data is None:
+                return {'status': 'ERROR', 'message': 'Market data store not available'}
+            if not request.get('symbol'):
+                return {'status': 'ERROR', 'message': 'symbol required'}
+            stored = self.market_data.push_bars(request['symbol'], request.get('timeframe', 'M1'),
+                                                request.get('bars') or [])
+            self._increment('bars_received', stored)
+            return {'status': 'OK', 'stored': stored}
+        
+        elif action == 'GET_METRICS':
+            # Per-action counters, phase latencies, bytes and queue gauges
+            return {'status': 'OK', **self.get_metrics()}
+        
+        elif action == 'EXPORT_HISTORY':
+            # Page through delivered-signal history; chunks go out as separate
+            # frames so a large export never builds one giant payload
+            cursor = int(request.get('cursor', 0) or 0)
+            limit = max(1, min(int(request.get('limit') or self.MAX_EXPORT_PAGE),
+                               self.MAX_EXPORT_PAGE))
+            chunk_size = max(1, int(request.get('chunk_size') or self.EXPORT_CHUNK_SIZE))
+            signals, next_cursor, start = self.signal_manager.get_history_page(cursor, limit)
+            chunks = (signals[i:i + chunk_size] for i in range(0, len(signals), chunk_size))
+            return MultipartResponse({
+                'status': 'OK',
+                'count': len(signals),
+                'cursor': start,
+                'next_cursor': next_cursor,
+                # Signals evicted from the history ring before they were read
+                'missed': max(0, start - cursor),
+                'more': len(signals) == limit,
+                'chunks': -(-len(signals) // chunk_size)
+            }, ([signal.to_dict() for signal in chunk] for chunk in chunks))
         
         elif action == 'GET_BRIDGE_STATUS':
             # Get bridge status
+            with self._stats_lock:
+                stats = self.stats.copy()
             return {
                 'status': 'OK',
                 'connection_status': self.connection_status,
                 'queue_size': self.signal_manager.get_queue_size(),
-                'stats': self.stats,
+                'in_flight': self.signal_manager.get_in_flight_count(),
+                'stats': stats,
                 'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None
             }
         
@@ -193,6 +782,55 @@ class MQL5Bridge:
             logger.warning(f"Unknown action: {action}")
             return {'status': 'ERROR', 'message': f'Unknown action: {action}'}
     
+    def _process_batch(self, request: Dict[str, Any],
+                       client: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Process a BATCH request: sub-requests run in order, each with its own response
+        
+        Args:
+            request: Request dictionary with a 'requests' list
+            client: Connected EA record (router mode)
+            
+        Returns:
+            Response dictionary with a 'responses' list
+        """
+        sub_requests = request.get('requests')
+        if not isinstance(sub_requests, list):
+            return {'status': 'ERROR', 'message': 'BATCH requires a list of requests'}
+        if len(sub_requests) > self.MAX_BATCH:
+            return {'status': 'ERROR',
+                    'message': f'BATCH too large ({len(sub_requests)} > {self.MAX_BATCH})'}
+        
+        responses = []
+        for sub_request in sub_requests:
+            if not isinstance(sub_request, dict):
+                responses.append({'status': 'ERROR', 'message': 'Invalid request'})
+                continue
+            if str(sub_request.get('action', '')).upper() == 'BATCH':
+                responses.append({'status': 'ERROR', 'message': 'Nested BATCH not allowed'})
+                continue
+            for key in ('broker', 'terminal'):
+                if request.get(key) and not sub_request.get(key):
+                    sub_request[key] = request[key]
+            # One failing action must not lose the responses of the others
+            try:
+                started = time.perf_counter()
+                response = self._process_request(sub_request, client)
+            except Exception as e:
+                logger.error(f"Bridge error in batch: {e}")
+                self._increment('errors')
+                response = {'status': 'ERROR', 'message': str(e)}
+            if isinstance(response, MultipartResponse):
+                response = {'status': 'ERROR',
+                            'message': f"{sub_request.get('action')} cannot be batched"}
+            self.metrics.count_action(str(sub_request.get('action', '')).upper() or 'UNKNOWN',
+                                      response.get('status') == 'ERROR',
+                                      time.perf_counter() - started)
+            responses.append(response)
+        
+        self._increment('batches')
+        return {'status': 'OK', 'responses': responses}
+    
     def send_signal(self, signal: TradeSignal) -> tuple[bool, Optional[str]]:
         """
         Send trade signal to MQL5
@@ -203,47 +841,171 @@ class MQL5Bridge:
         Returns:
             (success, error_message)
         """
-        success, error = self.signal_manager.add_signal(signal)
-        if success:
-            logger.info(f"Signal queued: {signal.action} {signal.symbol} @ {signal.broker}")
+        if self.publish_port:
+            success, error = self.signal_manager.add_signal(signal, enqueue=False)
+            if success:
+                self._publish(signal)
+                logger.info(f"Signal published: {signal.action} {signal.symbol} @ {signal.broker}")
         else:
+            success, error = self.signal_manager.add_signal(signal)
+            if success:
+                logger.info(f"Signal queued: {signal.action} {signal.symbol} @ {signal.broker}")
+        if not success:
             logger.warning(f"Failed to queue signal: {error}")
         return success, error
     
-    def _monitor_heartbeat(self):
-        """Monitor MQL5 connection heartbeat"""
-        while self.running:
-            time.sleep(5)
-            if self.last_heartbeat:
-                elapsed = (datetime.now() - self.last_heartbeat).total_seconds()
-                if elapsed > self.heartbeat_timeout:
-                    self.connection_status = "disconnected"
-                    logger.warning(f"MQL5 connection lost (no heartbeat for {elapsed:.1f}s)")
+    # ===== Connection state =====
+    
+    def _touch(self):
+        """Record EA activity: push the heartbeat deadline forward"""
+        self._heartbeat_deadline = time.monotonic() + self.heartbeat_timeout
+        if self.connection_status != "connected" and self.running:
+            self._set_connection_status("connected")
+    
+    def _check_heartbeat(self) -> float:
+        """
+        Mark the EA disconnected once its heartbeat deadline has passed
+        
+        Returns:
+            Seconds until the next check is due. Any request arriving in the
+            meantime sets a deadline at least this far away, so sleeping this
+            long never delays detection.
+        """
+        deadline = self._heartbeat_deadline
+        if deadline is None:
+            return self.heartbeat_timeout
+        remaining = deadline - time.monotonic()
+        if remaining > 0:
+            return remaining
+        if self.connection_status == "connected":
+            self._set_connection_status("disconnected")
+        return self.heartbeat_timeout
+    
+    def _set_connection_status(self, status: str):
+        """Change connection state and notify listeners (no-op if unchanged)"""
+        with self._status_lock:
+            previous = self.connection_status
+            if previous == status:
+                return
+            self.connection_status = status
+            listeners = list(self._status_listeners)
+            self._status_changed.notify_all()
+        
+        if status == "disconnected":
+            logger.warning(f"MQL5 connection lost (no request for {self.heartbeat_timeout}s)")
+        elif status == "connected" and previous == "disconnected":
+            logger.info("MQL5 connection restored")
+        for listener in listeners:
+            try:
+                listener(previous, status)
+            except Exception as e:
+                logger.error(f"Connection status listener failed: {e}")
+    
+    def add_status_listener(self, callback: Callable[[str, str], None]):
+        """
+        Subscribe to connection state changes
+        
+        Args:
+            callback: Called as callback(previous, current) on the thread
+                that observed the change; keep it short
+        """
+        with self._status_lock:
+            self._status_listeners.append(callback)
+    
+    def remove_status_listener(self, callback: Callable[[str, str], None]):
+        """Unsubscribe a connection state listener"""
+        with self._status_lock:
+            if callback in self._status_listeners:
+                self._status_listeners.remove(callback)
+    
+    def wait_for_status_change(self, status: Optional[str] = None,
+                               timeout: Optional[float] = None) -> str:
+        """
+        Block until connection_status differs from `status`
+        
+        Args:
+            status: State to wait to leave (None = the current one)
+            timeout: Maximum seconds to wait (None = wait forever)
+            
+        Returns:
+            Connection status when the wait ended
+        """
+        with self._status_lock:
+            if status is None:
+                status = self.connection_status
+            self._status_changed.wait_for(lambda: self.connection_status != status, timeout)
+            return self.connection_status
     
     def stop(self):
         """Stop the bridge"""
+        was_running = self.running
         self.running = False
-        if self.socket:
-            self.socket.close()
+        self._ready.clear()
+        if was_running:
+            # Wake the poller so the loop exits immediately instead of on next request
+            self._wake()
+            self._stopped.wait(timeout=5)
+        if self._executor:
+            if self._owns_executor:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
         if self.context:
-            self.context.term()
-        self.connection_status = "stopped"
+            # A supervisor's loop closes our sockets; its shared context stays up
+            if self._owns_context:
+                self.context.destroy(linger=0)
+            self.context = None
+        self.socket = None
+        self._control = None
+        self._replies = None
+        self._publisher = None
+        self._stop_metrics_server()
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+        self._heartbeat_deadline = None
+        self._set_connection_status("stopped")
         logger.info("MQL5 Bridge stopped")
     
     def get_status(self) -> Dict[str, Any]:
         """Get bridge status"""
-        return {
+        with self._stats_lock:
+            stats = self.stats.copy()
+        with self._clients_lock:
+            clients = {
+                client_id: {
+                    'broker': client['broker'],
+                    'terminal': client['terminal'],
+                    'encoding': client['encoding'],
+                    'requests': client['requests'],
+                    'last_seen': client['last_seen'].isoformat() if client['last_seen'] else None
+                }
+                for client_id, client in self.clients.items()
+            }
+        status = {
+            'mode': self.mode,
             'connection_status': self.connection_status,
             'queue_size': self.signal_manager.get_queue_size(),
-            'stats': self.stats.copy(),
-            'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None
+            'in_flight': self.signal_manager.get_in_flight_count(),
+            'stats': stats,
+            'signal_manager': self.signal_manager.get_stats(),
+            'market_data': self.market_data.get_stats() if self.market_data is not None else None,
+            'clients': clients,
+            'latency': self.request_latency.snapshot(),
+            'last_heartbeat': self.last_heartbeat.isoformat() if self.last_heartbeat else None,
+            'heartbeat_expires_in': (round(self._heartbeat_deadline - time.monotonic(), 3)
+                                     if self._heartbeat_deadline else None)
         }
+        if self.publish_port:
+            status['last_seq'] = self._publish_seq
+        return status
 
 
 # Convenience function for standalone usage
-def start_bridge(port: int = 5555, host: str = "127.0.0.1"):
+def start_bridge(port: int = 5555, host: str = "127.0.0.1", mode: str = "rep",
+                 publish_port: Optional[int] = None, metrics_port: Optional[int] = None):
     """Start bridge server (for standalone usage)"""
-    bridge = MQL5Bridge(port=port, host=host)
+    bridge = MQL5Bridge(port=port, host=host, mode=mode, publish_port=publish_port,
+                        metrics_port=metrics_port)
     try:
         bridge.start()
     except KeyboardInterrupt:
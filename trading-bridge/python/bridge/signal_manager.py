@@ -2,11 +2,26 @@
 Trade Signal Manager
 Manages trade signals, validation, and queue operations
 """
-from dataclasses import dataclass, asdict
-from typing import List, Optional, Dict, Any
-from datetime import datetime
+from collections import OrderedDict, deque
+from dataclasses import dataclass, fields
+from itertools import islice
+from typing import Deque, List, Optional, Dict, Any, Tuple
+from datetime import datetime, timedelta
 from enum import Enum
+import heapq
 import json
+import logging
+import math
+import sys
+import threading
+import time
+
+try:
+    from .metrics import LatencyHistogram
+except ImportError:
+    from metrics import LatencyHistogram
+
+logger = logging.getLogger(__name__)
 
 
 class TradeAction(Enum):
@@ -29,19 +44,45 @@ class TradeSignal:
     comment: str = ""
     timestamp: Optional[datetime] = None
     signal_id: Optional[str] = None
+    terminal: Optional[str] = None  # Target terminal (None = any terminal of broker)
+    priority: int = 0  # Higher is dequeued first (priority ordering)
+    confidence: Optional[float] = None  # Strategy confidence (0-1)
+    ttl: Optional[float] = None  # Seconds the signal stays valid (None = forever)
+    expires_at: Optional[datetime] = None
     
     def __post_init__(self):
-        """Initialize timestamp and signal_id if not provided"""
+        """Initialize timestamp, signal_id and expiry if not provided"""
         if self.timestamp is None:
             self.timestamp = datetime.now()
         if self.signal_id is None:
             self.signal_id = f"{self.symbol}_{self.action}_{int(self.timestamp.timestamp())}"
+        if self.expires_at is None and self.ttl is not None:
+            self.expires_at = self.timestamp + timedelta(seconds=self.ttl)
+    
+    def is_expired(self, now: Optional[datetime] = None) -> bool:
+        """
+        Check whether the signal is past its expiry
+        
+        Compares epoch seconds (naive datetimes are local time), so signals
+        parsed from UTC ISO strings ('...Z', '+00:00') compare correctly
+        with local ones.
+        
+        Args:
+            now: Time to check against (None = current time)
+        """
+        if self.expires_at is None:
+            return False
+        current = time.time() if now is None else now.timestamp()
+        return self.expires_at.timestamp() <= current
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert signal to dictionary"""
-        data = asdict(self)
+        # Flat fields only, so skip asdict()'s recursive deep copy
+        data = {name: getattr(self, name) for name in _SIGNAL_FIELDS}
         if isinstance(data['timestamp'], datetime):
             data['timestamp'] = data['timestamp'].isoformat()
+        if isinstance(data['expires_at'], datetime):
+            data['expires_at'] = data['expires_at'].isoformat()
         return data
     
     def to_json(self) -> str:
@@ -53,6 +94,8 @@ class TradeSignal:
         """Create signal from dictionary"""
         if 'timestamp' in data and isinstance(data['timestamp'], str):
             data['timestamp'] = datetime.fromisoformat(data['timestamp'])
+        if 'expires_at' in data and isinstance(data['expires_at'], str):
+            data['expires_at'] = datetime.fromisoformat(data['expires_at'])
         return cls(**data)
     
     @classmethod
@@ -61,6 +104,24 @@ class TradeSignal:
         data = json.loads(json_str)
         return cls.from_dict(data)
     
+    def matches_route(self, broker: Optional[str] = None,
+                      terminal: Optional[str] = None) -> bool:
+        """
+        Check whether signal should be delivered to a terminal
+        
+        Args:
+            broker: Broker served by the requesting terminal (None = any)
+            terminal: Requesting terminal ID (None = any)
+            
+        Returns:
+            True if signal is routed to that terminal
+        """
+        if broker is not None and self.broker.upper() != broker.upper():
+            return False
+        if terminal is not None and self.terminal is not None and self.terminal != terminal:
+            return False
+        return True
+    
     def validate(self) -> tuple[bool, Optional[str]]:
         """
         Validate signal parameters
@@ -78,6 +139,10 @@ class TradeSignal:
         except ValueError:
             return False, f"Invalid action: {self.action}"
         
+        # Validate TTL
+        if self.ttl is not None and self.ttl <= 0:
+            return False, "TTL must be positive"
+        
         # Validate lot size
         if self.lot_size <= 0:
             return False, "Lot size must be positive"
@@ -102,29 +167,288 @@ class TradeSignal:
         return True, None
 
 
+_SIGNAL_FIELDS = tuple(f.name for f in fields(TradeSignal))
+
+
+class DedupIndex:
+    """
+    Time-expiring set of seen signal IDs
+    
+    IDs are remembered for `window` seconds, which is what bounds memory.
+    Entries are kept in insertion order, which is also expiry order, so
+    expiring is popping from the front.
+    
+    An optional `max_entries` cap evicts the oldest IDs even though they
+    are still inside the window, so a signal resent after its ID was
+    evicted is accepted again. Such evictions are counted in `evicted`.
+    """
+    
+    def __init__(self, window: float = 86400.0, max_entries: Optional[int] = None):
+        """
+        Initialize DedupIndex
+        
+        Args:
+            window: Seconds an ID is remembered
+            max_entries: Hard cap on IDs remembered (None = no cap); capping
+                weakens deduplication within the window
+        """
+        self.window = window
+        self.max_entries = max_entries
+        self._entries: OrderedDict = OrderedDict()  # signal_id -> expiry (monotonic)
+        self._key_bytes = 0
+        self.evicted = 0
+    
+    def __contains__(self, signal_id: str) -> bool:
+        self._expire(time.monotonic())
+        return signal_id in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def add(self, signal_id: str):
+        """Remember a signal ID"""
+        now = time.monotonic()
+        self._expire(now)
+        if signal_id in self._entries:
+            self._entries.move_to_end(signal_id)
+        else:
+            self._key_bytes += sys.getsizeof(signal_id)
+        self._entries[signal_id] = now + self.window
+        if self.max_entries is None:
+            return
+        while len(self._entries) > self.max_entries:
+            if not self.evicted:
+                logger.warning(f"Dedup index full ({self.max_entries} IDs): evicting IDs "
+                               f"still inside the {self.window:.0f}s window")
+            self._pop_oldest()
+            self.evicted += 1
+    
+    def _expire(self, now: float):
+        """Drop IDs whose window has passed"""
+        entries = self._entries
+        while entries:
+            oldest = next(iter(entries))
+            if entries[oldest] > now:
+                break
+            self._pop_oldest()
+    
+    def _pop_oldest(self):
+        signal_id, _ = self._entries.popitem(last=False)
+        self._key_bytes -= sys.getsizeof(signal_id)
+    
+    def memory_bytes(self) -> int:
+        """Approximate memory held by the index"""
+        # Dict table plus keys; expiry floats are ~24 bytes each
+        return sys.getsizeof(self._entries) + self._key_bytes + 24 * len(self._entries)
+
+
+class RouteQueue:
+    """Pending queue entries of one broker/terminal route"""
+    
+    __slots__ = ('route', 'entries', 'pending', 'dead')
+    
+    def __init__(self, route: tuple, fifo: bool):
+        """
+        Initialize RouteQueue
+        
+        Args:
+            route: (BROKER, terminal) key
+            fifo: Keep entries in a deque (FIFO) rather than a heap
+        """
+        self.route = route
+        self.entries = deque() if fifo else []
+        self.pending = 0  # Live entries
+        self.dead = 0     # Replaced/removed entries not yet popped
+
+
 class SignalManager:
     """Manages trade signal queue and history"""
     
-    def __init__(self, max_queue_size: int = 1000, max_history: int = 10000):
+    ORDERINGS = ('fifo', 'priority', 'confidence', 'newest')
+    
+    def __init__(self, max_queue_size: int = 1000, max_history: int = 10000,
+                 dedup_window: float = 86400.0, max_dedup_entries: Optional[int] = None,
+                 ordering: str = "fifo", coalesce: bool = False,
+                 default_ttl: Optional[float] = None, journal=None,
+                 ack_timeout: float = 30.0, max_deliveries: int = 5,
+                 max_dead_letters: int = 1000):
         """
         Initialize SignalManager
         
         Args:
             max_queue_size: Maximum number of signals in queue
             max_history: Maximum number of signals in history
+            dedup_window: Seconds a signal ID is remembered for deduplication
+            max_dedup_entries: Hard cap on signal IDs remembered (None = no
+                cap, the window bounds memory); IDs evicted by the cap are
+                no longer deduplicated and are counted as 'dedup_evicted'
+            ordering: Dequeue order - 'fifo', 'priority' (explicit priority,
+                then confidence, then age), 'confidence' or 'newest'
+            coalesce: If True, a new BUY/SELL signal replaces the pending
+                BUY/SELL for the same symbol@broker (CLOSE and MODIFY are
+                never replaced)
+            default_ttl: TTL (seconds) applied to signals without an expiry
+            journal: SignalJournal that queued and delivered signals are
+                written to; pending signals and history are restored on startup
+            ack_timeout: Seconds a signal fetched with ack=True stays
+                invisible before it is redelivered unless acknowledged
+            max_deliveries: Deliveries after which an unacknowledged signal
+                is dead-lettered instead of redelivered
+            max_dead_letters: Maximum number of dead-lettered signals kept
         """
-        self.queue: List[TradeSignal] = []
-        self.history: List[TradeSignal] = []
+        if ordering not in self.ORDERINGS:
+            raise ValueError(f"Invalid ordering: {ordering}")
+        
+        self.ordering = ordering
+        self.coalesce = coalesce
+        self.history: Deque[TradeSignal] = deque(maxlen=max_history)
+        self._history_index: Dict[str, TradeSignal] = {}
+        self._history_total = 0  # Signals ever added to history (export cursors)
         self.max_queue_size = max_queue_size
         self.max_history = max_history
-        self.processed_signals: set = set()  # For deduplication
+        self.processed_signals = DedupIndex(dedup_window, max_dedup_entries)
+        
+        # Queue entries are [key, seq, signal, alive], one queue per
+        # (broker, terminal) route: a deque in FIFO order, otherwise a heap.
+        # Fetches merge the heads of the routes they match, so routed fetches
+        # never scan other routes. Replaced/removed entries are marked dead
+        # and skipped when popped, so replacing a signal is O(log n).
+        self._routes: Dict[tuple, RouteQueue] = {}
+        self._seq = 0
+        self._pending = 0
+        self._pending_by_route: Dict[str, list] = {}  # Coalescing index
+        self.coalesced = 0
+        
+        # Expiring entries as (expires_at epoch, seq, entry); checked lazily
+        # at dequeue so only signals actually past expiry cost anything
+        self.default_ttl = default_ttl
+        self._expiry_heap: List[tuple] = []
+        self.expired = 0
+        self.restored = 0
+        self.restored_history = 0
+        self.replay_seconds = 0.0
+        
+        # Signals fetched with ack=True wait here until ACK/NACK. Records are
+        # [entry, deadline, deliveries, delivered_at] keyed by signal ID, with
+        # a lazy heap of (deadline, seq, record) for visibility timeouts;
+        # requeued signals remember (deliveries, delivered_at) until redelivered
+        self.ack_timeout = ack_timeout
+        self.max_deliveries = max_deliveries
+        self._in_flight: Dict[str, list] = {}
+        self._lease_heap: List[tuple] = []
+        self._redeliveries: Dict[str, tuple] = {}
+        self.dead_letters: Deque[TradeSignal] = deque(maxlen=max_dead_letters)
+        self.redelivery_latency = LatencyHistogram()
+        self.acked = 0
+        self.nacked = 0
+        self.timed_out = 0
+        self.redelivered = 0
+        self.dead_lettered = 0
+        
+        # Signals are added from the service thread and drained from bridge
+        # threads; consumers block on the condition instead of polling
+        self._lock = threading.RLock()
+        self._not_empty = threading.Condition(self._lock)
+        
+        # Crash-safe journal of queued/dequeued signals
+        self._journal = journal
+        self._replaying = False
+        if journal is not None:
+            self._replay_journal()
+    
+    def _replay_journal(self):
+        """Restore queued signals and history from the journal"""
+        started = time.perf_counter()
+        self._replaying = True
+        try:
+            restored = 0
+            for data in self._journal.pending():
+                signal = TradeSignal.from_dict(dict(data))
+                success, _ = self.add_signal(signal)
+                if success:
+                    restored += 1
+                else:
+                    # Expired, invalid or a duplicate (the size limit doesn't
+                    # apply here): don't restore it again next time
+                    self._journal.append_remove(signal.signal_id)
+            if self._pending > self.max_queue_size:
+                logger.warning(f"Restored {self._pending} pending signals, more than "
+                               f"max_queue_size ({self.max_queue_size}); new signals are "
+                               f"refused until the queue drains")
+            
+            # Delivered signals stay deduplicated after the restart
+            delivered = [TradeSignal.from_dict(dict(data)) for data in self._journal.history()]
+            with self._lock:
+                self._add_to_history(delivered)
+                for signal in delivered:
+                    self.processed_signals.add(signal.signal_id)
+        finally:
+            self._replaying = False
+        self.restored = restored
+        self.restored_history = len(delivered)
+        self.replay_seconds = time.perf_counter() - started
     
-    def add_signal(self, signal: TradeSignal) -> tuple[bool, Optional[str]]:
+    @property
+    def queue(self) -> List[TradeSignal]:
+        """Pending signals in dequeue order"""
+        with self._lock:
+            entries = sorted(entry for queue in self._routes.values()
+                             for entry in queue.entries if entry[3])
+            return [entry[2] for entry in entries]
+    
+    def _sort_key(self, signal: TradeSignal) -> tuple:
+        """Heap key for a signal (smaller is dequeued first)"""
+        if self.ordering == 'priority':
+            return (-signal.priority, -(signal.confidence or 0.0))
+        if self.ordering == 'confidence':
+            return (-(signal.confidence or 0.0),)
+        if self.ordering == 'newest':
+            return (-signal.timestamp.timestamp(),)
+        return ()
+    
+    @staticmethod
+    def _coalesce_key(signal: TradeSignal) -> Optional[str]:
+        """Key of signals that supersede each other (only BUY/SELL coalesce)"""
+        if signal.action.upper() not in (TradeAction.BUY.value, TradeAction.SELL.value):
+            return None
+        return f"{signal.symbol}@{signal.broker}/{signal.terminal or ''}"
+    
+    def _route_queues(self, broker: Optional[str] = None,
+                      terminal: Optional[str] = None) -> List[RouteQueue]:
+        """Route queues holding signals for a broker/terminal (caller holds lock)"""
+        if broker is None and terminal is None:
+            return list(self._routes.values())
+        broker = broker.upper() if broker is not None else None
+        return [queue for (route_broker, route_terminal), queue in self._routes.items()
+                if (broker is None or route_broker == broker) and
+                (terminal is None or route_terminal is None or route_terminal == terminal)]
+    
+    def _route_queue(self, signal: TradeSignal) -> RouteQueue:
+        """Queue of a signal's route, created on first use (caller holds lock)"""
+        route = (signal.broker.upper(), signal.terminal)
+        queue = self._routes.get(route)
+        if queue is None:
+            queue = self._routes[route] = RouteQueue(route, self.ordering == 'fifo')
+        return queue
+    
+    def _push_expiry(self, entry: list):
+        """Track an expiring entry (caller holds lock)"""
+        heapq.heappush(self._expiry_heap, (entry[2].expires_at.timestamp(), self._seq, entry))
+        # Delivered entries linger until their expiry; drop them in bulk
+        if len(self._expiry_heap) > 2 * self._pending + 1024:
+            self._expiry_heap = [item for item in self._expiry_heap if item[2][3]]
+            heapq.heapify(self._expiry_heap)
+    
+    def add_signal(self, signal: TradeSignal,
+                   enqueue: bool = True) -> tuple[bool, Optional[str]]:
         """
         Add signal to queue
         
         Args:
             signal: Trade signal to add
+            enqueue: If False, the signal is delivered by other means (e.g.
+                published) and goes straight to history (and the journal's
+                history) once deduplicated and checked for expiry
             
         Returns:
             (success, error_message)
@@ -134,53 +458,403 @@ class SignalManager:
         if not is_valid:
             return False, error
         
-        # Check for duplicates
-        if signal.signal_id in self.processed_signals:
-            return False, "Duplicate signal"
+        with self._lock:
+            # Check for duplicates
+            if signal.signal_id in self.processed_signals:
+                return False, "Duplicate signal"
+            
+            if signal.expires_at is None and self.default_ttl is not None:
+                signal.expires_at = signal.timestamp + timedelta(seconds=self.default_ttl)
+            if signal.is_expired():
+                self.expired += 1
+                return False, "Signal expired"
+            
+            if not enqueue:
+                self.processed_signals.add(signal.signal_id)
+                self._add_to_history([signal])
+                return True, None
+            
+            # Replace a superseded pending signal rather than queueing behind it
+            route = self._coalesce_key(signal) if self.coalesce else None
+            pending = self._pending_by_route.get(route) if route else None
+            
+            # Check queue size (replay restores everything accepted before
+            # the restart, even if the limit has since been lowered)
+            if (pending is None and self._pending >= self.max_queue_size and
+                    not self._replaying):
+                return False, "Queue is full"
+            
+            if pending is not None:
+                self._discard(pending)
+                self.coalesced += 1
+            
+            # Add to queue
+            self._seq += 1
+            entry = [self._sort_key(signal), self._seq, signal, True]
+            queue = self._route_queue(signal)
+            if self.ordering == 'fifo':
+                queue.entries.append(entry)
+            else:
+                heapq.heappush(queue.entries, entry)
+            queue.pending += 1
+            self._pending += 1
+            if route:
+                self._pending_by_route[route] = entry
+            if signal.expires_at is not None:
+                self._push_expiry(entry)
+            self.processed_signals.add(signal.signal_id)
+            if self._journal is not None and not self._replaying:
+                self._journal.append_add(signal.to_dict())
+            self._not_empty.notify_all()
         
-        # Check queue size
-        if len(self.queue) >= self.max_queue_size:
-            return False, "Queue is full"
+        return True, None
+    
+    def _discard(self, entry: list):
+        """Drop a queued entry for good (caller holds lock)"""
+        self._unlink(entry)
+        self._redeliveries.pop(entry[2].signal_id, None)
+        if self._journal is not None:
+            self._journal.append_remove(entry[2].signal_id)
+    
+    def _unlink(self, entry: list):
+        """Mark a queued entry dead (caller holds lock)"""
+        entry[3] = False
+        self._pending -= 1
+        queue = self._route_queue(entry[2])
+        queue.pending -= 1
+        queue.dead += 1
+        route = self._coalesce_key(entry[2]) if self.coalesce else None
+        if route and self._pending_by_route.get(route) is entry:
+            del self._pending_by_route[route]
         
-        # Add to queue
-        self.queue.append(signal)
-        self.processed_signals.add(signal.signal_id)
+        # Rebuild once dead entries dominate so memory stays bounded
+        if queue.dead > 64 and queue.dead > queue.pending:
+            live = [e for e in queue.entries if e[3]]
+            if self.ordering == 'fifo':
+                queue.entries = deque(live)
+            else:
+                heapq.heapify(live)
+                queue.entries = live
+            queue.dead = 0
+    
+    def _expire_signals(self):
+        """Drop queued signals past their expiry (caller holds lock)"""
+        heap = self._expiry_heap
+        now = time.time()
+        while heap and heap[0][0] <= now:
+            entry = heapq.heappop(heap)[2]
+            if entry[3]:
+                self._discard(entry)
+                self.expired += 1
+    
+    def _head(self, queue: RouteQueue) -> Optional[list]:
+        """Next live entry of a route queue, dropping dead ones (caller holds lock)"""
+        entries = queue.entries
+        while entries and not entries[0][3]:
+            if self.ordering == 'fifo':
+                entries.popleft()
+            else:
+                heapq.heappop(entries)
+            queue.dead -= 1
+        return entries[0] if entries else None
+    
+    def _take(self, queues: List[RouteQueue], count: Optional[int]) -> List[list]:
+        """Remove up to `count` entries from route queues, merged in dequeue order (caller holds lock)"""
+        limit = self._pending if count is None else min(max(count, 0), self._pending)
+        entries = []
+        while len(entries) < limit:
+            best = None
+            best_queue = None
+            for queue in queues:
+                head = self._head(queue)
+                if head is not None and (best is None or head[:2] < best[:2]):
+                    best = head
+                    best_queue = queue
+            if best is None:
+                break
+            if self.ordering == 'fifo':
+                best_queue.entries.popleft()
+            else:
+                heapq.heappop(best_queue.entries)
+            best[3] = False
+            best_queue.pending -= 1
+            self._pending -= 1
+            route = self._coalesce_key(best[2]) if self.coalesce else None
+            if route and self._pending_by_route.get(route) is best:
+                del self._pending_by_route[route]
+            entries.append(best)
         
-        return True, None
+        # Forget routes that have drained
+        for queue in queues:
+            if not queue.entries and self._routes.get(queue.route) is queue:
+                del self._routes[queue.route]
+        return entries
     
-    def get_signals(self, count: Optional[int] = None) -> List[TradeSignal]:
+    def get_signals(self, count: Optional[int] = None, broker: Optional[str] = None,
+                    terminal: Optional[str] = None, ack: bool = False,
+                    visibility_timeout: Optional[float] = None) -> List[TradeSignal]:
         """
         Get signals from queue
         
         Args:
             count: Number of signals to retrieve (None = all)
+            broker: Only return signals for this broker (None = all)
+            terminal: Only return signals routed to this terminal (None = all)
+            ack: If True, signals stay in flight until acknowledged and are
+                redelivered if not ACKed within the visibility timeout
+            visibility_timeout: Seconds to wait for the ACK (None = ack_timeout)
             
         Returns:
             List of trade signals
         """
-        if count is None:
-            signals = self.queue.copy()
-            self.queue.clear()
+        with self._lock:
+            self._expire_signals()
+            self._requeue_unacked()
+            entries = self._take(self._route_queues(broker, terminal), count)
+            return self._deliver(entries, ack, visibility_timeout)
+    
+    def _deliver(self, entries: List[list], ack: bool,
+                 visibility_timeout: Optional[float]) -> List[TradeSignal]:
+        """Hand dequeued entries out, leasing them if an ACK is expected (caller holds lock)"""
+        now = time.monotonic()
+        deadline = now + (self.ack_timeout if visibility_timeout is None else visibility_timeout)
+        signals = []
+        first_deliveries = []
+        for entry in entries:
+            signal = entry[2]
+            redelivery = self._redeliveries.pop(signal.signal_id, None)
+            if redelivery is None:
+                deliveries = 1
+                # In flight at a restart: already in the replayed history
+                if signal.signal_id not in self._history_index:
+                    first_deliveries.append(signal)
+            else:
+                deliveries = redelivery[0] + 1
+                self.redelivered += 1
+                self.redelivery_latency.record(now - redelivery[1])
+            
+            if ack:
+                record = [entry, deadline, deliveries, now]
+                self._in_flight[signal.signal_id] = record
+                heapq.heappush(self._lease_heap, (deadline, entry[1], record))
+            elif self._journal is not None:
+                self._journal.append_remove(signal.signal_id)
+            signals.append(signal)
+        
+        self._add_to_history(first_deliveries)
+        return signals
+    
+    def _requeue_unacked(self):
+        """Make signals whose visibility timeout passed deliverable again (caller holds lock)"""
+        heap = self._lease_heap
+        now = time.monotonic()
+        while heap and heap[0][0] <= now:
+            record = heapq.heappop(heap)[2]
+            signal_id = record[0][2].signal_id
+            if self._in_flight.get(signal_id) is record:
+                del self._in_flight[signal_id]
+                self.timed_out += 1
+                self._requeue(record)
+    
+    def _requeue(self, record: list) -> str:
+        """Put an unacknowledged signal back at the head of its queue (caller holds lock)"""
+        entry, _, deliveries, delivered_at = record
+        signal = entry[2]
+        if deliveries >= self.max_deliveries:
+            self._dead_letter(signal)
+            return 'dead_lettered'
+        if signal.is_expired():
+            self.expired += 1
+            if self._journal is not None:
+                self._journal.append_remove(signal.signal_id)
+            return 'expired'
+        route = self._coalesce_key(signal) if self.coalesce else None
+        if route and route in self._pending_by_route:
+            # A newer signal for the same symbol already supersedes it
+            self.coalesced += 1
+            if self._journal is not None:
+                self._journal.append_remove(signal.signal_id)
+            return 'coalesced'
+        
+        # Slot back in just ahead of the original position: the fraction keeps
+        # seqs unique against the stale (dead) copy of the entry in a heap
+        seq = math.ceil(entry[1]) - deliveries / (self.max_deliveries + 1)
+        requeued = [entry[0], seq, signal, True]
+        queue = self._route_queue(signal)
+        if self.ordering == 'fifo':
+            entries = queue.entries
+            index = 0
+            while index < len(entries) and entries[index][1] < seq:
+                index += 1
+            entries.insert(index, requeued)
         else:
-            signals = self.queue[:count]
-            self.queue = self.queue[count:]
+            heapq.heappush(queue.entries, requeued)
+        self._seq += 1
+        queue.pending += 1
+        self._pending += 1
+        if route:
+            self._pending_by_route[route] = requeued
+        if signal.expires_at is not None:
+            self._push_expiry(requeued)
+        self._redeliveries[signal.signal_id] = (deliveries, delivered_at)
+        self._not_empty.notify_all()
+        return 'requeued'
+    
+    def _dead_letter(self, signal: TradeSignal):
+        """Give up on a signal that was never acknowledged (caller holds lock)"""
+        self.dead_letters.append(signal)
+        self.dead_lettered += 1
+        if self._journal is not None:
+            self._journal.append_remove(signal.signal_id)
+    
+    def ack(self, signal_ids: List[str]) -> tuple[int, List[str]]:
+        """
+        Acknowledge in-flight signals as processed
         
-        # Add to history
-        self.history.extend(signals)
+        Args:
+            signal_ids: IDs of signals fetched with ack=True
+            
+        Returns:
+            (number acknowledged, IDs that were not in flight)
+        """
+        acked = 0
+        unknown = []
+        with self._lock:
+            for signal_id in signal_ids:
+                if self._in_flight.pop(signal_id, None) is None:
+                    unknown.append(signal_id)
+                    continue
+                acked += 1
+                if self._journal is not None:
+                    self._journal.append_remove(signal_id)
+            self.acked += acked
+        return acked, unknown
+    
+    def nack(self, signal_ids: List[str], requeue: bool = True) -> Dict[str, Any]:
+        """
+        Reject in-flight signals
         
-        # Trim history if needed
-        if len(self.history) > self.max_history:
-            self.history = self.history[-self.max_history:]
+        Args:
+            signal_ids: IDs of signals fetched with ack=True
+            requeue: If True, redeliver now (subject to max_deliveries);
+                otherwise dead-letter them
+            
+        Returns:
+            Counts of 'requeued', 'dead_lettered', 'expired' and
+            'coalesced' signals, plus 'unknown' IDs that were not in flight
+        """
+        result = {'requeued': 0, 'dead_lettered': 0, 'expired': 0,
+                  'coalesced': 0, 'unknown': []}
+        with self._lock:
+            for signal_id in signal_ids:
+                record = self._in_flight.pop(signal_id, None)
+                if record is None:
+                    result['unknown'].append(signal_id)
+                    continue
+                self.nacked += 1
+                if requeue:
+                    result[self._requeue(record)] += 1
+                else:
+                    self._dead_letter(record[0][2])
+                    result['dead_lettered'] += 1
+        return result
+    
+    def get_in_flight_count(self) -> int:
+        """Get number of delivered signals awaiting ACK"""
+        with self._lock:
+            self._requeue_unacked()
+            return len(self._in_flight)
+    
+    def get_dead_letters(self) -> List[TradeSignal]:
+        """Get signals that were never acknowledged within max_deliveries"""
+        with self._lock:
+            return list(self.dead_letters)
+    
+    def _add_to_history(self, signals: List[TradeSignal]):
+        """Append delivered signals to the history ring, ID index and journal (caller holds lock)"""
+        history = self.history
+        index = self._history_index
+        journal = self._journal if not self._replaying else None
+        for signal in signals:
+            if len(history) == history.maxlen:
+                evicted = history[0]
+                if index.get(evicted.signal_id) is evicted:
+                    del index[evicted.signal_id]
+            history.append(signal)
+            index[signal.signal_id] = signal
+            if journal is not None:
+                journal.append_history(signal.to_dict())
+        self._history_total += len(signals)
+    
+    def wait_for_signals(self, timeout: Optional[float] = None, count: Optional[int] = None,
+                         broker: Optional[str] = None, terminal: Optional[str] = None,
+                         ack: bool = False,
+                         visibility_timeout: Optional[float] = None) -> List[TradeSignal]:
+        """
+        Block until signals are available, then get them from queue
         
-        return signals
+        Args:
+            timeout: Maximum seconds to wait (None = wait forever)
+            count: Number of signals to retrieve (None = all)
+            broker: Only return signals for this broker (None = all)
+            terminal: Only return signals routed to this terminal (None = all)
+            ack: Lease signals until acknowledged (see get_signals)
+            visibility_timeout: Seconds to wait for the ACK (None = ack_timeout)
+            
+        Returns:
+            List of trade signals (empty on timeout)
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._not_empty:
+            while not self._has_signals(broker, terminal):
+                now = time.monotonic()
+                if deadline is not None and now >= deadline:
+                    return []
+                wait = None if deadline is None else deadline - now
+                if self._lease_heap:
+                    # Wake up when the next unacknowledged signal is due again
+                    due = self._lease_heap[0][0] - now
+                    wait = due if wait is None else min(wait, due)
+                self._not_empty.wait(wait)
+            return self.get_signals(count, broker, terminal, ack, visibility_timeout)
     
-    def get_queue_size(self) -> int:
-        """Get current queue size"""
-        return len(self.queue)
+    def _has_signals(self, broker: Optional[str], terminal: Optional[str]) -> bool:
+        """Check for pending signals routed to a broker/terminal (caller holds lock)"""
+        self._expire_signals()
+        self._requeue_unacked()
+        if broker is None and terminal is None:
+            return self._pending > 0
+        return any(queue.pending for queue in self._route_queues(broker, terminal))
+    
+    def get_queue_size(self, broker: Optional[str] = None,
+                       terminal: Optional[str] = None) -> int:
+        """
+        Get current queue size
+        
+        Args:
+            broker: Only count signals for this broker (None = all)
+            terminal: Only count signals routed to this terminal (None = all)
+        """
+        with self._lock:
+            self._expire_signals()
+            self._requeue_unacked()
+            if broker is None and terminal is None:
+                return self._pending
+            return sum(queue.pending for queue in self._route_queues(broker, terminal))
     
     def clear_queue(self):
         """Clear signal queue"""
-        self.queue.clear()
+        with self._lock:
+            if self._journal is not None:
+                for queue in self._routes.values():
+                    for entry in queue.entries:
+                        if entry[3]:
+                            self._journal.append_remove(entry[2].signal_id)
+            self._routes.clear()
+            self._pending = 0
+            self._pending_by_route.clear()
+            self._expiry_heap = []
+            self._redeliveries.clear()
     
     def get_history(self, limit: Optional[int] = None) -> List[TradeSignal]:
         """
@@ -192,9 +866,38 @@ class SignalManager:
         Returns:
             List of historical signals
         """
-        if limit is None:
-            return self.history.copy()
-        return self.history[-limit:] if limit > 0 else []
+        with self._lock:
+            if limit is None:
+                return list(self.history)
+            if limit <= 0:
+                return []
+            recent = list(islice(reversed(self.history), limit))
+        recent.reverse()
+        return recent
+    
+    def get_history_page(self, cursor: int = 0,
+                         limit: int = 1000) -> Tuple[List[TradeSignal], int, int]:
+        """
+        Get a page of history for incremental export
+        
+        Cursors count signals ever added to history, so they stay valid
+        while the ring evicts old entries and new ones arrive.
+        
+        Args:
+            cursor: Position to read from (0 = oldest signal still kept)
+            limit: Maximum number of signals to return
+            
+        Returns:
+            (signals oldest first, cursor of the next page, position the
+            page actually starts at - later than `cursor` if signals in
+            between were evicted)
+        """
+        with self._lock:
+            first = self._history_total - len(self.history)
+            start = max(cursor, first)
+            offset = start - first
+            page = list(islice(self.history, offset, offset + max(limit, 0)))
+        return page, start + len(page), start
     
     def get_signal_by_id(self, signal_id: str) -> Optional[TradeSignal]:
         """
@@ -206,8 +909,33 @@ class SignalManager:
         Returns:
             Trade signal or None
         """
-        for signal in reversed(self.history):
-            if signal.signal_id == signal_id:
-                return signal
-        return None
-
+        with self._lock:
+            return self._history_index.get(signal_id)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Get queue, in-flight, history and deduplication statistics"""
+        with self._lock:
+            self._requeue_unacked()
+            return {
+                'queue_size': self._pending,
+                'ordering': self.ordering,
+                'coalesced': self.coalesced,
+                'expired': self.expired,
+                'in_flight': len(self._in_flight),
+                'acked': self.acked,
+                'nacked': self.nacked,
+                'ack_timeouts': self.timed_out,
+                'redelivered': self.redelivered,
+                'dead_lettered': self.dead_lettered,
+                'redelivery_latency': self.redelivery_latency.snapshot(),
+                'history_size': len(self.history),
+                'dedup_entries': len(self.processed_signals),
+                'dedup_evicted': self.processed_signals.evicted,
+                'dedup_window': self.processed_signals.window,
+                'dedup_max_entries': self.processed_signals.max_entries,
+                'dedup_memory_bytes': self.processed_signals.memory_bytes(),
+                'restored': self.restored,
+                'restored_history': self.restored_history,
+                'replay_ms': round(self.replay_seconds * 1000, 3),
+                'journal': self._journal.get_stats() if self._journal is not None else None
+            }
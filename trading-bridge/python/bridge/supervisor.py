@@ -0,0 +1,469 @@
+"""
+Bridge Supervisor
+Hosts several MQL5Bridge endpoints (ports/brokers) in one process on a shared
+ZeroMQ context, served by a single poll loop
+"""
+import time
+import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+import zmq
+
+# Import MQL5Bridge - handle both relative and absolute imports
+try:
+    from .mql5_bridge import MQL5Bridge
+    from .signal_manager import TradeSignal
+except (ImportError, ValueError):
+    try:
+        from bridge.mql5_bridge import MQL5Bridge
+        from bridge.signal_manager import TradeSignal
+    except ImportError:
+        import sys
+        from pathlib import Path
+        bridge_dir = Path(__file__).parent
+        if str(bridge_dir) not in sys.path:
+            sys.path.insert(0, str(bridge_dir))
+        from mql5_bridge import MQL5Bridge
+        from signal_manager import TradeSignal
+
+logger = logging.getLogger(__name__)
+
+# Combined state of several endpoints: disconnected if any EA was lost (so
+# one endpoint dropping is reported while others stay up), else connected
+# if any EA is
+_STATUS_ORDER = ('disconnected', 'connected', 'listening', 'error', 'stopped')
+
+
+class BridgeSupervisor:
+    """
+    Several bridge endpoints served by one thread
+
+    Each endpoint is a full MQL5Bridge with its own port, SignalManager,
+    stats and metrics, but they all share one ZMQ context (and its I/O
+    threads), one poll loop and, for router-mode endpoints, one worker pool,
+    instead of a context, loop thread, heartbeat thread and pool per port.
+    Signals are routed to the endpoint registered for their broker.
+
+    Exposes the same start/stop/wait_ready/send_signal/get_status surface as
+    MQL5Bridge, so services and traders can use it in place of one bridge.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", io_threads: int = 1, workers: int = 4):
+        """
+        Initialize BridgeSupervisor
+
+        Args:
+            host: Default bind address for endpoints
+            io_threads: ZMQ I/O threads shared by all endpoints
+            workers: Worker threads shared by router-mode endpoints
+        """
+        self.host = host
+        self.io_threads = io_threads
+        self.workers = workers
+        self.context = None
+        self.running = False
+        self.connection_status = "stopped"
+        self._status_listeners: List[Callable[[str, str], None]] = []
+        self._endpoint_listeners: List[Callable[[int, Optional[str], str, str], None]] = []
+        self._endpoint_callbacks: Dict[int, Callable[[str, str], None]] = {}
+
+        self.endpoints: Dict[int, MQL5Bridge] = {}
+        self._brokers: Dict[str, int] = {}
+        self._endpoints_lock = threading.Lock()
+        self._pending: List[MQL5Bridge] = []   # Added while running, opened by the loop
+
+        self._executor = None
+        self._control = None
+        self._control_address = f"inproc://bridge-supervisor-control-{id(self)}"
+        self._local = threading.local()
+        self._ready = threading.Event()
+        self._stopped = threading.Event()
+
+    # ===== Endpoints =====
+
+    def add_endpoint(self, port: int, broker: Optional[str] = None, **kwargs) -> MQL5Bridge:
+        """
+        Create and host a bridge endpoint
+
+        Args:
+            port: Port the endpoint listens on
+            broker: Route signals for this broker to the endpoint
+            **kwargs: Further MQL5Bridge arguments (mode, publish_port,
+                journal_path, metrics_port, ...)
+
+        Returns:
+            The endpoint's MQL5Bridge
+        """
+        kwargs.setdefault('host', self.host)
+        return self.add_bridge(MQL5Bridge(port=port, **kwargs), broker)
+
+    def add_bridge(self, bridge: MQL5Bridge, broker: Optional[str] = None) -> MQL5Bridge:
+        """
+        Host an existing (not yet started) bridge
+
+        Args:
+            bridge: Bridge to host
+            broker: Route signals for this broker to the bridge
+
+        Returns:
+            The bridge
+        """
+        if bridge.running:
+            raise ValueError(f"Bridge on port {bridge.port} is already running")
+        with self._endpoints_lock:
+            if bridge.port in self.endpoints:
+                raise ValueError(f"An endpoint already uses port {bridge.port}")
+            self.endpoints[bridge.port] = bridge
+            if broker:
+                self._brokers[broker.upper()] = bridge.port
+            if self.running:
+                self._pending.append(bridge)
+        if self.running:
+            self._wake()
+        return bridge
+
+    def remove_endpoint(self, port: int):
+        """
+        Stop and remove an endpoint
+
+        Args:
+            port: Endpoint port
+        """
+        with self._endpoints_lock:
+            bridge = self.endpoints.pop(port, None)
+            for broker in [b for b, p in self._brokers.items() if p == port]:
+                del self._brokers[broker]
+        if bridge is not None:
+            bridge.stop()
+            self._unwatch(bridge)
+            self._endpoint_status_changed(None, None)
+
+    def get_endpoint(self, broker: Optional[str] = None,
+                     port: Optional[int] = None) -> Optional[MQL5Bridge]:
+        """
+        Find an endpoint by port or by broker
+
+        Args:
+            broker: Broker name (falls back to the only endpoint, if there is one)
+            port: Endpoint port (takes precedence over broker)
+
+        Returns:
+            The endpoint's MQL5Bridge, or None
+        """
+        with self._endpoints_lock:
+            if port is not None:
+                return self.endpoints.get(port)
+            if broker and broker.upper() in self._brokers:
+                return self.endpoints.get(self._brokers[broker.upper()])
+            if len(self.endpoints) == 1:
+                return next(iter(self.endpoints.values()))
+        return None
+
+    # ===== Lifecycle =====
+
+    def start(self):
+        """Start all endpoints and serve them until stop() (blocks)"""
+        try:
+            self.context = zmq.Context(io_threads=self.io_threads)
+            self._control = self.context.socket(zmq.PULL)
+            self._control.setsockopt(zmq.LINGER, 0)
+            self._control.bind(self._control_address)
+        except Exception as e:
+            logger.error(f"Failed to start bridge supervisor: {e}")
+            self._ready.set()
+            raise
+
+        self.running = True
+        self._stopped.clear()
+        self._run()
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """
+        Block until the supervisor has opened its endpoints
+
+        Args:
+            timeout: Maximum seconds to wait (None = wait forever)
+
+        Returns:
+            True if the supervisor is running, False on timeout or startup failure
+        """
+        return self._ready.wait(timeout) and self.running
+
+    def _run(self):
+        """Serve every endpoint from one poller"""
+        poller = zmq.Poller()
+        poller.register(self._control, zmq.POLLIN)
+        owners: Dict[Any, MQL5Bridge] = {}
+
+        with self._endpoints_lock:
+            bridges = list(self.endpoints.values())
+        opened = sum(self._attach(bridge, poller, owners) for bridge in bridges)
+        self._ready.set()
+        logger.info(f"Bridge supervisor serving {opened} endpoint(s)")
+
+        try:
+            while self.running:
+                try:
+                    # Sleep until the earliest endpoint heartbeat deadline
+                    timeout = min((bridge._check_heartbeat() for bridge in set(owners.values())),
+                                  default=None)
+                    events = dict(poller.poll(timeout * 1000 if timeout is not None else None))
+
+                    if self._control in events:
+                        self._drain_control()
+                        with self._endpoints_lock:
+                            pending, self._pending = self._pending, []
+                        for bridge in pending:
+                            self._attach(bridge, poller, owners)
+
+                    # Each endpoint handles its own sockets; stop() wakes an
+                    # endpoint's control pipe, so that is where it is detached
+                    touched = {id(owners[sock]): owners[sock] for sock in events if sock in owners}
+                    for bridge in touched.values():
+                        if bridge.running:
+                            bridge._handle_events(events)
+                        else:
+                            self._detach(bridge, poller, owners)
+
+                except zmq.ContextTerminated:
+                    break
+                except Exception as e:
+                    logger.error(f"Bridge supervisor error: {e}")
+                    time.sleep(1)
+        finally:
+            for bridge in set(owners.values()):
+                bridge.running = False
+                self._detach(bridge, poller, owners)
+            self._stopped.set()
+
+    def _attach(self, bridge: MQL5Bridge, poller: zmq.Poller,
+                owners: Dict[Any, MQL5Bridge]) -> bool:
+        """Open an endpoint on the shared context and add it to the poller"""
+        if bridge.socket is not None:
+            return True  # Added while start() was opening the initial endpoints
+        if bridge.mode == 'router' and self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                thread_name_prefix='bridge-supervisor-worker')
+        bridge.context = self.context
+        bridge._owns_context = False
+        self._watch(bridge)
+        try:
+            bridge._open(self._executor)
+        except Exception as e:
+            logger.error(f"Failed to start bridge endpoint on port {bridge.port}: {e}")
+            bridge._set_connection_status("error")
+            bridge.context = None
+            bridge._ready.set()
+            with self._endpoints_lock:
+                if self.endpoints.get(bridge.port) is bridge:
+                    del self.endpoints[bridge.port]
+            return False
+
+        bridge._start_metrics_server()
+        bridge._mark_started()
+        for sock in bridge._poll_sockets():
+            poller.register(sock, zmq.POLLIN)
+            owners[sock] = bridge
+        # Signals accepted before the endpoint opened (EAs recover them via REPLAY)
+        bridge._flush_outbox()
+        logger.info(f"MQL5 Bridge endpoint on tcp://{bridge.host}:{bridge.port} "
+                    f"({bridge.mode} mode, supervised)")
+        return True
+
+    def _detach(self, bridge: MQL5Bridge, poller: zmq.Poller, owners: Dict[Any, MQL5Bridge]):
+        """Remove an endpoint from the poller and close its sockets (loop thread only)"""
+        for sock in [s for s, owner in owners.items() if owner is bridge]:
+            poller.unregister(sock)
+            del owners[sock]
+        bridge._close_sockets()
+        bridge._stopped.set()
+
+    def _drain_control(self):
+        """Consume pending wake-up messages"""
+        while True:
+            try:
+                self._control.recv(zmq.NOBLOCK)
+            except zmq.Again:
+                return
+
+    def _wake(self):
+        """Wake the poll loop from any thread"""
+        context = self.context
+        if context is None or context.closed:
+            return
+        sock = getattr(self._local, 'control', None)
+        if sock is None or sock.closed or getattr(self._local, 'context', None) is not context:
+            sock = context.socket(zmq.PUSH)
+            sock.setsockopt(zmq.LINGER, 0)
+            sock.connect(self._control_address)
+            self._local.control = sock
+            self._local.context = context
+        try:
+            sock.send(b'', zmq.NOBLOCK)
+        except zmq.ZMQError:
+            pass
+
+    def stop(self):
+        """Stop every endpoint and the supervisor"""
+        was_running = self.running
+        self.running = False
+        self._ready.clear()
+        if was_running:
+            self._wake()
+            self._stopped.wait(timeout=5)
+        with self._endpoints_lock:
+            bridges = list(self.endpoints.values())
+        for bridge in bridges:
+            bridge.stop()
+            self._unwatch(bridge)
+        self._endpoint_status_changed(None, None)
+        if self._executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+        if self.context:
+            self.context.destroy(linger=0)
+            self.context = None
+        self._control = None
+        logger.info("Bridge supervisor stopped")
+
+    # ===== Connection state =====
+
+    def _combined_status(self) -> str:
+        """Most useful state across endpoints (caller holds _endpoints_lock)"""
+        # Endpoints not opened yet still carry their initial state
+        states = {bridge.connection_status for bridge in self.endpoints.values()
+                  if bridge.running or bridge.connection_status == 'error'}
+        return next((state for state in _STATUS_ORDER if state in states),
+                    'running' if self.running else 'stopped')
+
+    def _watch(self, bridge: MQL5Bridge):
+        """Listen to an endpoint's connection state"""
+        port = bridge.port
+
+        def changed(previous: str, current: str):
+            self._endpoint_status_changed(previous, current, port)
+
+        with self._endpoints_lock:
+            self._endpoint_callbacks[port] = changed
+        bridge.add_status_listener(changed)
+
+    def _unwatch(self, bridge: MQL5Bridge):
+        """Stop listening to an endpoint's connection state"""
+        with self._endpoints_lock:
+            changed = self._endpoint_callbacks.pop(bridge.port, None)
+        if changed is not None:
+            bridge.remove_status_listener(changed)
+
+    def _endpoint_status_changed(self, previous: Optional[str], current: Optional[str],
+                                 port: Optional[int] = None):
+        """Endpoint listener: notify endpoint listeners, then recompute the combined state"""
+        if port is not None:
+            with self._endpoints_lock:
+                broker = next((b for b, p in self._brokers.items() if p == port), None)
+                listeners = list(self._endpoint_listeners)
+            for listener in listeners:
+                try:
+                    listener(port, broker, previous, current)
+                except Exception as e:
+                    logger.error(f"Endpoint status listener failed: {e}")
+
+        with self._endpoints_lock:
+            status = self._combined_status()
+            previous = self.connection_status
+            if previous == status:
+                return
+            self.connection_status = status
+            listeners = list(self._status_listeners)
+        for listener in listeners:
+            try:
+                listener(previous, status)
+            except Exception as e:
+                logger.error(f"Connection status listener failed: {e}")
+
+    def add_status_listener(self, callback: Callable[[str, str], None]):
+        """
+        Subscribe to changes of the combined connection state
+
+        Args:
+            callback: Called as callback(previous, current)
+        """
+        with self._endpoints_lock:
+            self._status_listeners.append(callback)
+
+    def remove_status_listener(self, callback: Callable[[str, str], None]):
+        """Unsubscribe a connection state listener"""
+        with self._endpoints_lock:
+            if callback in self._status_listeners:
+                self._status_listeners.remove(callback)
+
+    def add_endpoint_status_listener(self, callback: Callable[[int, Optional[str], str, str], None]):
+        """
+        Subscribe to connection state changes of each endpoint
+
+        Args:
+            callback: Called as callback(port, broker, previous, current)
+        """
+        with self._endpoints_lock:
+            self._endpoint_listeners.append(callback)
+
+    def remove_endpoint_status_listener(self, callback: Callable[[int, Optional[str], str, str], None]):
+        """Unsubscribe an endpoint connection state listener"""
+        with self._endpoints_lock:
+            if callback in self._endpoint_listeners:
+                self._endpoint_listeners.remove(callback)
+
+    # ===== Signals and status =====
+
+    def send_signal(self, signal: TradeSignal) -> tuple[bool, Optional[str]]:
+        """
+        Send a trade signal through the endpoint serving its broker
+
+        Args:
+            signal: Trade signal to send
+
+        Returns:
+            (success, error_message)
+        """
+        bridge = self.get_endpoint(signal.broker)
+        if bridge is None:
+            return False, f"No bridge endpoint for broker {signal.broker}"
+        return bridge.send_signal(signal)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Get combined and per-endpoint status"""
+        with self._endpoints_lock:
+            bridges = dict(self.endpoints)
+            brokers = {port: broker for broker, port in self._brokers.items()}
+
+        endpoints = {}
+        totals: Dict[str, int] = {}
+        for port, bridge in bridges.items():
+            status = bridge.get_status()
+            status['broker'] = brokers.get(port)
+            endpoints[port] = status
+            for stat, value in status['stats'].items():
+                totals[stat] = totals.get(stat, 0) + value
+
+        return {
+            'connection_status': self.connection_status,
+            'running': self.running,
+            'queue_size': sum(status['queue_size'] for status in endpoints.values()),
+            'in_flight': sum(status['in_flight'] for status in endpoints.values()),
+            'stats': totals,
+            'endpoints': endpoints
+        }
+
+
+# Convenience function for standalone usage
+def start_supervisor(endpoints: Dict[str, int], host: str = "127.0.0.1", mode: str = "rep"):
+    """Serve one bridge endpoint per broker (broker name -> port) until interrupted"""
+    supervisor = BridgeSupervisor(host=host)
+    for broker, port in endpoints.items():
+        supervisor.add_endpoint(port, broker=broker, mode=mode)
+    try:
+        supervisor.start()
+    except KeyboardInterrupt:
+        logger.info("Stopping bridge supervisor...")
+        supervisor.stop()
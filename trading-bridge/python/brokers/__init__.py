@@ -1,8 +1,14 @@
 """
 Broker API Module
 """
-from .base_broker import BaseBroker, BrokerConfig, OrderResult, Position, AccountInfo
+from .base_broker import (BaseBroker, BrokerConfig, OrderResult, Position, AccountInfo,
+                          OrderRequest, PositionModification)
 from .exness_api import ExnessAPI
+from .async_broker import (AsyncBaseBroker, AsyncBrokerAdapter, SyncBrokerShim, ShimLoopAdapter,
+                           as_async, gather_brokers)
+from .async_exness_api import AsyncExnessAPI
+from .state_cache import BrokerStateCache
+from .streaming import PositionBook, BrokerStream, StreamEvent, Subscription
 from .broker_factory import BrokerFactory
 
 __all__ = [
@@ -11,7 +17,21 @@ __all__ = [
     'OrderResult',
     'Position',
     'AccountInfo',
+    'OrderRequest',
+    'PositionModification',
     'ExnessAPI',
+    'AsyncBaseBroker',
+    'AsyncBrokerAdapter',
+    'SyncBrokerShim',
+    'ShimLoopAdapter',
+    'AsyncExnessAPI',
+    'as_async',
+    'gather_brokers',
+    'BrokerStateCache',
+    'PositionBook',
+    'BrokerStream',
+    'StreamEvent',
+    'Subscription',
     'BrokerFactory'
 ]
 
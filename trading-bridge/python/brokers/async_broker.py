@@ -0,0 +1,467 @@
+"""
+Async Broker Interface
+Coroutine counterpart of BaseBroker, adapters between the sync and async
+interfaces, and concurrent fan-out of broker calls
+"""
+import asyncio
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+from .base_broker import (BaseBroker, BrokerConfig, OrderResult, Position, AccountInfo,
+                          OrderRequest, PositionModification)
+
+# Threads running sync broker calls for AsyncBrokerAdapter. Not the loop's
+# default executor: asyncio.run() waits for that one, so a hung broker call
+# would outlive its timeout.
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=16, thread_name_prefix='broker-call')
+        return _executor
+
+
+class AsyncBaseBroker(ABC):
+    """Abstract base class for asyncio broker implementations"""
+
+    # Concurrent requests used by the default batch implementations (an
+    # emergency flatten sends all of its closes at once instead)
+    max_batch_concurrency = 16  # Matches the default HTTP connection pool size
+
+    def __init__(self, config: BrokerConfig):
+        """
+        Initialize broker
+
+        Args:
+            config: Broker configuration
+        """
+        self.config = config
+        self.name = config.name
+        self.enabled = config.enabled
+
+    @abstractmethod
+    async def place_order(self, symbol: str, action: str, lot_size: float,
+                          stop_loss: Optional[float] = None,
+                          take_profit: Optional[float] = None,
+                          comment: str = "") -> OrderResult:
+        """
+        Place order on broker
+
+        Args:
+            symbol: Trading symbol (e.g., 'EURUSD')
+            action: Order action ('BUY' or 'SELL')
+            lot_size: Position size in lots
+            stop_loss: Stop loss price (optional)
+            take_profit: Take profit price (optional)
+            comment: Order comment
+
+        Returns:
+            OrderResult with execution details
+        """
+        pass
+
+    @abstractmethod
+    async def get_account_info(self) -> AccountInfo:
+        """
+        Get account information
+
+        Returns:
+            AccountInfo with account details
+        """
+        pass
+
+    @abstractmethod
+    async def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """
+        Get open positions
+
+        Args:
+            symbol: Filter by symbol (None = all positions)
+
+        Returns:
+            List of open positions
+        """
+        pass
+
+    @abstractmethod
+    async def close_position(self, position_id: str) -> OrderResult:
+        """
+        Close a position
+
+        Args:
+            position_id: Position ID to close
+
+        Returns:
+            OrderResult with execution details
+        """
+        pass
+
+    @abstractmethod
+    async def modify_position(self, position_id: str, stop_loss: Optional[float] = None,
+                              take_profit: Optional[float] = None) -> OrderResult:
+        """
+        Modify position (stop loss/take profit)
+
+        Args:
+            position_id: Position ID to modify
+            stop_loss: New stop loss price
+            take_profit: New take profit price
+
+        Returns:
+            OrderResult with execution details
+        """
+        pass
+
+    # ===== Batch operations =====
+
+    async def place_orders(self, orders: Sequence[OrderRequest]) -> List[OrderResult]:
+        """
+        Place several orders (bulk endpoint if the broker has one, else concurrently)
+
+        Args:
+            orders: Orders to place
+
+        Returns:
+            OrderResult per order, in order
+        """
+        results = await self._place_orders_bulk(orders)
+        if results is None:
+            results = await self._run_batch(
+                lambda order: self.place_order(order.symbol, order.action, order.lot_size,
+                                               order.stop_loss, order.take_profit,
+                                               order.comment),
+                orders)
+        return results
+
+    async def close_positions(self, position_ids: Sequence[str]) -> List[OrderResult]:
+        """
+        Close several positions
+
+        Args:
+            position_ids: Position IDs to close
+
+        Returns:
+            OrderResult per position, in order
+        """
+        results = await self._close_positions_bulk(position_ids)
+        if results is None:
+            results = await self._run_batch(self.close_position, position_ids)
+        return results
+
+    async def modify_positions(self, modifications: Sequence[PositionModification]
+                               ) -> List[OrderResult]:
+        """
+        Modify several positions
+
+        Args:
+            modifications: Stop loss/take profit changes
+
+        Returns:
+            OrderResult per modification, in order
+        """
+        results = await self._modify_positions_bulk(modifications)
+        if results is None:
+            results = await self._run_batch(
+                lambda change: self.modify_position(change.position_id, change.stop_loss,
+                                                    change.take_profit),
+                modifications)
+        return results
+
+    async def close_all_positions(self, symbol: Optional[str] = None) -> List[OrderResult]:
+        """
+        Close every open position (emergency flatten)
+
+        Without a bulk endpoint every close is sent at once (not capped at
+        max_batch_concurrency); the account's shared rate limiter still lets
+        only `burst` closes out immediately and paces the rest.
+
+        Args:
+            symbol: Only close positions of this symbol (None = all)
+
+        Returns:
+            OrderResult per closed position (a single FLATTEN_ERROR result
+            if the positions could not be listed)
+        """
+        try:
+            positions = await self._poll_positions()
+        except Exception as e:
+            return [OrderResult(success=False, message=f"Could not list positions: {e}",
+                                error_code='FLATTEN_ERROR')]
+        position_ids = [pos.position_id for pos in positions
+                        if pos.position_id and (not symbol or pos.symbol == symbol)]
+        results = await self._close_positions_bulk(position_ids)
+        if results is None:
+            results = await self._run_batch(self.close_position, position_ids,
+                                             concurrency=len(position_ids))
+        return results
+
+    async def _poll_positions(self) -> List[Position]:
+        """All open positions, for flattening (override to raise on errors)"""
+        return await self.get_positions()
+
+    async def _place_orders_bulk(self, orders: Sequence[OrderRequest]) -> Optional[List[OrderResult]]:
+        """Place orders with a native bulk endpoint (override; None = not supported)"""
+        return None
+
+    async def _close_positions_bulk(self, position_ids: Sequence[str]) -> Optional[List[OrderResult]]:
+        """Close positions with a native bulk endpoint (override; None = not supported)"""
+        return None
+
+    async def _modify_positions_bulk(self, modifications: Sequence[PositionModification]
+                                     ) -> Optional[List[OrderResult]]:
+        """Modify positions with a native bulk endpoint (override; None = not supported)"""
+        return None
+
+    async def _run_batch(self, call: Callable[[Any], Awaitable[OrderResult]],
+                         items: Sequence[Any], concurrency: Optional[int] = None
+                         ) -> List[OrderResult]:
+        """Run a single-order coroutine for every item, at most `concurrency` at once (default max_batch_concurrency)"""
+        semaphore = asyncio.Semaphore(max(1, concurrency or self.max_batch_concurrency))
+
+        async def run(item):
+            async with semaphore:
+                try:
+                    return await call(item)
+                except Exception as e:
+                    return OrderResult(success=False, message=str(e), error_code='BATCH_ERROR')
+
+        return list(await asyncio.gather(*(run(item) for item in items)))
+
+    async def close(self):
+        """Release connections (override if the broker holds any)"""
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def is_enabled(self) -> bool:
+        """Check if broker is enabled"""
+        return self.enabled
+
+    def get_name(self) -> str:
+        """Get broker name"""
+        return self.name
+
+    def validate_symbol(self, symbol: str) -> bool:
+        """
+        Validate trading symbol
+
+        Args:
+            symbol: Symbol to validate
+
+        Returns:
+            True if valid
+        """
+        return bool(symbol) and len(symbol) >= 3
+
+
+class AsyncBrokerAdapter(AsyncBaseBroker):
+    """Async view of a sync BaseBroker: each call runs on a shared broker thread pool"""
+
+    def __init__(self, broker: BaseBroker):
+        """
+        Initialize AsyncBrokerAdapter
+
+        Args:
+            broker: Sync broker to wrap
+        """
+        super().__init__(broker.config)
+        self.broker = broker
+
+    async def _call(self, method: str, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_get_executor(),
+                                          lambda: getattr(self.broker, method)(*args, **kwargs))
+
+    async def place_order(self, symbol: str, action: str, lot_size: float,
+                          stop_loss: Optional[float] = None,
+                          take_profit: Optional[float] = None,
+                          comment: str = "") -> OrderResult:
+        return await self._call('place_order', symbol, action, lot_size,
+                                stop_loss, take_profit, comment)
+
+    async def get_account_info(self) -> AccountInfo:
+        return await self._call('get_account_info')
+
+    async def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        return await self._call('get_positions', symbol)
+
+    async def close_position(self, position_id: str) -> OrderResult:
+        return await self._call('close_position', position_id)
+
+    async def modify_position(self, position_id: str, stop_loss: Optional[float] = None,
+                              take_profit: Optional[float] = None) -> OrderResult:
+        return await self._call('modify_position', position_id, stop_loss, take_profit)
+
+    # Batches run as one call so the sync broker's bulk endpoint or thread pool is used
+
+    async def place_orders(self, orders: Sequence[OrderRequest]) -> List[OrderResult]:
+        return await self._call('place_orders', orders)
+
+    async def close_positions(self, position_ids: Sequence[str]) -> List[OrderResult]:
+        return await self._call('close_positions', position_ids)
+
+    async def modify_positions(self, modifications: Sequence[PositionModification]
+                               ) -> List[OrderResult]:
+        return await self._call('modify_positions', modifications)
+
+    async def close_all_positions(self, symbol: Optional[str] = None) -> List[OrderResult]:
+        return await self._call('close_all_positions', symbol)
+
+
+class SyncBrokerShim(BaseBroker):
+    """
+    Sync BaseBroker over an AsyncBaseBroker, for existing callers
+
+    The async broker runs on a private event loop thread, so its connection
+    pool is shared by every calling thread; calls block the caller only.
+    """
+
+    def __init__(self, broker: AsyncBaseBroker, timeout: Optional[float] = None):
+        """
+        Initialize SyncBrokerShim
+
+        Args:
+            broker: Async broker to wrap
+            timeout: Maximum seconds a call may block (None = no limit)
+        """
+        super().__init__(broker.config)
+        self.broker = broker
+        self.timeout = timeout
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever,
+                                        name=f"{self.name}-broker-loop", daemon=True)
+        self._thread.start()
+
+    def _run(self, coroutine):
+        """Run a coroutine on the broker loop and wait for its result"""
+        future = asyncio.run_coroutine_threadsafe(coroutine, self._loop)
+        try:
+            return future.result(self.timeout)
+        except FutureTimeoutError:
+            future.cancel()
+            raise
+
+    async def _run_async(self, coroutine):
+        """Run a coroutine on the broker loop and await it from another loop"""
+        # Cancelling the awaiting task cancels the call on the broker loop too
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coroutine, self._loop))
+
+    def place_order(self, symbol: str, action: str, lot_size: float,
+                    stop_loss: Optional[float] = None,
+                    take_profit: Optional[float] = None,
+                    comment: str = "") -> OrderResult:
+        return self._run(self.broker.place_order(symbol, action, lot_size,
+                                                 stop_loss, take_profit, comment))
+
+    def get_account_info(self) -> AccountInfo:
+        return self._run(self.broker.get_account_info())
+
+    def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        return self._run(self.broker.get_positions(symbol))
+
+    def close_position(self, position_id: str) -> OrderResult:
+        return self._run(self.broker.close_position(position_id))
+
+    def modify_position(self, position_id: str, stop_loss: Optional[float] = None,
+                        take_profit: Optional[float] = None) -> OrderResult:
+        return self._run(self.broker.modify_position(position_id, stop_loss, take_profit))
+
+    def place_orders(self, orders: Sequence[OrderRequest]) -> List[OrderResult]:
+        return self._run(self.broker.place_orders(orders))
+
+    def close_positions(self, position_ids: Sequence[str]) -> List[OrderResult]:
+        return self._run(self.broker.close_positions(position_ids))
+
+    def modify_positions(self, modifications: Sequence[PositionModification]) -> List[OrderResult]:
+        return self._run(self.broker.modify_positions(modifications))
+
+    def close_all_positions(self, symbol: Optional[str] = None) -> List[OrderResult]:
+        return self._run(self.broker.close_all_positions(symbol))
+
+    def close(self):
+        """Close the async broker and stop its loop"""
+        if self._loop.is_closed():
+            return
+        try:
+            self._run(self.broker.close())
+        finally:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=5)
+            self._loop.close()
+
+
+class ShimLoopAdapter(AsyncBrokerAdapter):
+    """
+    Async view of a SyncBrokerShim
+
+    The wrapped async broker's HTTP client belongs to the shim's loop, so
+    calls are sent to that loop and awaited from the caller's loop rather
+    than run on the caller's loop directly. `broker` is the wrapped
+    SyncBrokerShim.
+    """
+
+    async def _call(self, method: str, *args, **kwargs):
+        return await self.broker._run_async(getattr(self.broker.broker, method)(*args, **kwargs))
+
+
+def as_async(broker: Union[BaseBroker, AsyncBaseBroker]) -> AsyncBaseBroker:
+    """
+    Get an async interface to any broker
+
+    Args:
+        broker: Sync or async broker
+
+    Returns:
+        The broker itself if async, a ShimLoopAdapter for a SyncBrokerShim,
+        else an AsyncBrokerAdapter
+    """
+    if isinstance(broker, AsyncBaseBroker):
+        return broker
+    if isinstance(broker, SyncBrokerShim):
+        return ShimLoopAdapter(broker)
+    return AsyncBrokerAdapter(broker)
+
+
+async def gather_brokers(brokers: Dict[str, Union[BaseBroker, AsyncBaseBroker]], method: str,
+                         *args, timeout: Optional[float] = None,
+                         **kwargs) -> Dict[str, Dict[str, Any]]:
+    """
+    Call the same method on several brokers concurrently
+
+    Args:
+        brokers: Dictionary of broker_name -> broker (sync or async)
+        method: Broker method name (e.g. 'get_positions')
+        *args: Method arguments
+        timeout: Per-broker timeout in seconds (None = no limit)
+        **kwargs: Method keyword arguments
+
+    Returns:
+        Dictionary of broker_name -> {'result', 'error', 'elapsed_ms'}
+        ('error' is None on success; a timed out broker gets 'timeout')
+    """
+    async def call(broker):
+        started = time.perf_counter()
+        try:
+            coroutine = getattr(as_async(broker), method)(*args, **kwargs)
+            result = await asyncio.wait_for(coroutine, timeout)
+            error = None
+        except asyncio.TimeoutError:
+            result, error = None, 'timeout'
+        except Exception as e:
+            result, error = None, str(e)
+        return {'result': result, 'error': error,
+                'elapsed_ms': round((time.perf_counter() - started) * 1000, 3)}
+
+    names = list(brokers)
+    outcomes = await asyncio.gather(*(call(brokers[name]) for name in names))
+    return dict(zip(names, outcomes))
@@ -0,0 +1,281 @@
+"""
+Async Exness Broker API Implementation
+ExnessAPI on a pooled asyncio HTTP client (httpx, or aiohttp)
+"""
+import asyncio
+import json
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from .async_broker import AsyncBaseBroker
+from .base_broker import BrokerConfig, OrderResult, Position, AccountInfo
+from .exness_api import ExnessAPI
+from .http_transport import HTTPOptions, TransportStats, backoff_delay
+from .rate_limiter import RequestPriority, get_shared_bucket
+
+# Errors raised by the HTTP clients for failed exchanges (connection, timeout, protocol)
+_TRANSPORT_ERRORS = tuple(error for error in (
+    httpx.TransportError if httpx else None,
+    aiohttp.ClientError if aiohttp else None,
+    asyncio.TimeoutError,
+    OSError
+) if error is not None)
+
+
+class AsyncExnessAPI(AsyncBaseBroker):
+    """
+    Exness broker API implementation on asyncio
+
+    Uses the same endpoints, config (including the `http` block) and
+    rate limit bucket as ExnessAPI, so sync and async clients of one
+    account share its request budget.
+    """
+
+    IDEMPOTENT_METHODS = frozenset({'GET', 'HEAD', 'OPTIONS'})
+
+    def __init__(self, config: BrokerConfig, backend: Optional[str] = None):
+        """
+        Initialize async Exness API
+
+        Args:
+            config: Broker configuration
+            backend: 'httpx' or 'aiohttp' (default: whichever is installed, httpx first)
+        """
+        super().__init__(config)
+        if backend is None:
+            backend = 'httpx' if httpx is not None else 'aiohttp'
+        if backend not in ('httpx', 'aiohttp'):
+            raise ValueError(f"Unknown HTTP backend: {backend}")
+        if (httpx if backend == 'httpx' else aiohttp) is None:
+            raise ImportError(f"{backend} is required for AsyncExnessAPI "
+                              f"(pip install httpx, or aiohttp)")
+        self.backend = backend
+        self.http_options = HTTPOptions.from_dict(config.http)
+        self.transport_stats = TransportStats()
+        self.base_url = config.api_url.rstrip('/')
+        self.account_id = config.account_id
+        self.headers: Dict[str, str] = {}
+        if config.api_key:
+            self.headers = {
+                'Authorization': f'Bearer {config.api_key}',
+                'Content-Type': 'application/json',
+                'X-Account-ID': config.account_id
+            }
+        # Created on first use: aiohttp sessions belong to the loop that creates them
+        self._client = None
+
+        self.rate_limit = config.rate_limit or {'requests_per_minute': 60}
+        self.rate_limiter = get_shared_bucket((self.name.upper(), self.account_id), self.rate_limit)
+
+    def _get_client(self):
+        """Create the pooled HTTP client on first use"""
+        if self._client is not None:
+            return self._client
+        options = self.http_options
+        if self.backend == 'httpx':
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=self.headers,
+                timeout=httpx.Timeout(options.read_timeout, connect=options.connect_timeout),
+                limits=httpx.Limits(max_connections=options.pool_maxsize,
+                                    max_keepalive_connections=options.pool_maxsize,
+                                    keepalive_expiry=options.keep_alive_expiry)
+            )
+        else:
+            self._client = aiohttp.ClientSession(
+                headers=self.headers,
+                timeout=aiohttp.ClientTimeout(sock_connect=options.connect_timeout,
+                                              sock_read=options.read_timeout),
+                connector=aiohttp.TCPConnector(limit_per_host=options.pool_maxsize,
+                                               keepalive_timeout=options.keep_alive_expiry)
+            )
+        return self._client
+
+    async def _send(self, method: str, endpoint: str, payload: Optional[Dict[str, Any]]):
+        """Send one HTTP exchange; return (status, body bytes)"""
+        client = self._get_client()
+        if self.backend == 'httpx':
+            response = await client.request(method, endpoint, json=payload)
+            return response.status_code, response.content
+        async with client.request(method, f"{self.base_url}{endpoint}", json=payload) as response:
+            return response.status, await response.read()
+
+    async def _make_request(self, method: str, endpoint: str,
+                            priority: Optional[RequestPriority] = None,
+                            json_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Make HTTP request to Exness API
+
+        Idempotent requests are retried on transport errors and retryable
+        statuses with jittered backoff, like ExnessAPI.
+
+        Args:
+            method: HTTP method (GET, POST, etc.)
+            endpoint: API endpoint
+            priority: Rate limit lane (default: ORDER for writes, NORMAL for reads)
+            json_data: JSON request body
+
+        Returns:
+            Response data as dictionary
+        """
+        method = method.upper()
+        if priority is None:
+            priority = RequestPriority.NORMAL if method == 'GET' else RequestPriority.ORDER
+        await self.rate_limiter.acquire_async(priority=priority)
+
+        options = self.http_options
+        attempts = 1 + (options.retries if method in self.IDEMPOTENT_METHODS else 0)
+        started = time.perf_counter()
+        error = None
+        for attempt in range(attempts):
+            if attempt:
+                await asyncio.sleep(backoff_delay(options, attempt))
+            try:
+                status, body = await self._send(method, endpoint, json_data)
+            except _TRANSPORT_ERRORS as e:
+                error = str(e) or type(e).__name__
+                continue
+            if status in options.retry_statuses and attempt + 1 < attempts:
+                error = f"HTTP {status}"
+                continue
+            if status >= 400:
+                error = f"HTTP {status}"
+                break
+            try:
+                result = json.loads(body)
+            except ValueError as e:
+                error = str(e)
+                break
+            self.transport_stats.record(time.perf_counter() - started, attempt)
+            return result
+        self.transport_stats.record(time.perf_counter() - started, attempt, error=True)
+        # Don't expose API details in error
+        return {'error': 'API request failed', 'details': error}
+
+    def get_transport_stats(self) -> Dict[str, Any]:
+        """
+        Get HTTP transport statistics
+
+        Returns:
+            Request count, errors, retries, mean/max latency (ms) and rate limiter state
+        """
+        stats = self.transport_stats.snapshot()
+        stats['rate_limiter'] = self.rate_limiter.get_stats()
+        return stats
+
+    async def close(self):
+        """Close pooled connections"""
+        client, self._client = self._client, None
+        if client is None:
+            return
+        if self.backend == 'httpx':
+            await client.aclose()
+        else:
+            await client.close()
+
+    async def place_order(self, symbol: str, action: str, lot_size: float,
+                          stop_loss: Optional[float] = None,
+                          take_profit: Optional[float] = None,
+                          comment: str = "") -> OrderResult:
+        """
+        Place order via Exness API
+
+        Args:
+            symbol: Trading symbol
+            action: Order action (BUY/SELL)
+            lot_size: Position size in lots
+            stop_loss: Stop loss price
+            take_profit: Take profit price
+            comment: Order comment
+
+        Returns:
+            OrderResult
+        """
+        if not self.validate_symbol(symbol):
+            return ExnessAPI._invalid_symbol(symbol)
+
+        order_data = ExnessAPI._order_payload(self.account_id, symbol, action, lot_size,
+                                              stop_loss, take_profit, comment)
+        response = await self._make_request('POST', '/orders', json_data=order_data)
+        return ExnessAPI._order_result(response, 'Order placed successfully', 'Unknown error',
+                                       'API_ERROR', use_response_message=True)
+
+    async def get_account_info(self) -> AccountInfo:
+        """
+        Get Exness account information
+
+        Returns:
+            AccountInfo
+        """
+        response = await self._make_request('GET', f'/accounts/{self.account_id}')
+        return ExnessAPI._parse_account(response)
+
+    async def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """
+        Get open positions from Exness
+
+        Args:
+            symbol: Filter by symbol (None = all)
+
+        Returns:
+            List of positions
+        """
+        endpoint = '/positions'
+        if symbol:
+            endpoint += f'?symbol={symbol}'
+
+        response = await self._make_request('GET', endpoint, priority=RequestPriority.POLL)
+        return ExnessAPI._parse_positions(response)
+
+    async def _poll_positions(self) -> List[Position]:
+        """Get all positions, raising on API errors instead of returning none"""
+        response = await self._make_request('GET', '/positions', priority=RequestPriority.POLL)
+        if 'error' in response or 'positions' not in response:
+            raise ConnectionError(response.get('details') or 'Failed to get positions')
+        return ExnessAPI._parse_positions(response)
+
+    async def close_position(self, position_id: str) -> OrderResult:
+        """
+        Close position on Exness
+
+        Args:
+            position_id: Position ID to close
+
+        Returns:
+            OrderResult
+        """
+        response = await self._make_request('DELETE', f'/positions/{position_id}')
+        return ExnessAPI._order_result(response, 'Position closed successfully',
+                                       'Failed to close position', 'CLOSE_ERROR')
+
+    async def modify_position(self, position_id: str, stop_loss: Optional[float] = None,
+                              take_profit: Optional[float] = None) -> OrderResult:
+        """
+        Modify position on Exness
+
+        Args:
+            position_id: Position ID
+            stop_loss: New stop loss
+            take_profit: New take profit
+
+        Returns:
+            OrderResult
+        """
+        update_data = ExnessAPI._modify_payload(stop_loss, take_profit)
+        if not update_data:
+            return ExnessAPI._no_modifications()
+
+        response = await self._make_request('PATCH', f'/positions/{position_id}',
+                                            json_data=update_data)
+        return ExnessAPI._order_result(response, 'Position modified successfully',
+                                       'Failed to modify position', 'MODIFY_ERROR')
@@ -2,8 +2,10 @@
 Base Broker Abstract Class
 Defines interface for all broker implementations
 """
+import threading
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Sequence
 from dataclasses import dataclass
 
 
@@ -17,6 +19,8 @@ class BrokerConfig:
     api_secret: Optional[str] = None
     enabled: bool = True
     rate_limit: Optional[Dict[str, int]] = None
+    http: Optional[Dict[str, Any]] = None  # HTTP transport options (see http_transport.HTTPOptions)
+    stream_url: Optional[str] = None  # WebSocket URL for position/account updates (None = poll)
 
 
 @dataclass
@@ -28,6 +32,25 @@ class OrderResult:
     error_code: Optional[str] = None
 
 
+@dataclass
+class OrderRequest:
+    """Order for batch placement"""
+    symbol: str
+    action: str  # BUY or SELL
+    lot_size: float
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+    comment: str = ""
+
+
+@dataclass
+class PositionModification:
+    """Stop loss/take profit change for batch modification"""
+    position_id: str
+    stop_loss: Optional[float] = None
+    take_profit: Optional[float] = None
+
+
 @dataclass
 class Position:
     """Open position information"""
@@ -40,6 +63,21 @@ class Position:
     swap: float
     commission: float
     position_id: Optional[str] = None
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'Position':
+        """Build a position from broker API fields"""
+        return cls(
+            symbol=data.get('symbol', ''),
+            volume=float(data.get('volume', 0)),
+            type=data.get('type', 'BUY'),
+            open_price=float(data.get('open_price', 0)),
+            current_price=float(data.get('current_price', 0)),
+            profit=float(data.get('profit', 0)),
+            swap=float(data.get('swap', 0)),
+            commission=float(data.get('commission', 0)),
+            position_id=data.get('position_id')
+        )
 
 
 @dataclass
@@ -51,11 +89,27 @@ class AccountInfo:
     free_margin: float
     margin_level: float
     currency: str = "USD"
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'AccountInfo':
+        """Build account information from broker API fields"""
+        return cls(
+            balance=float(data.get('balance', 0)),
+            equity=float(data.get('equity', 0)),
+            margin=float(data.get('margin', 0)),
+            free_margin=float(data.get('free_margin', 0)),
+            margin_level=float(data.get('margin_level', 0)),
+            currency=data.get('currency', 'USD')
+        )
 
 
 class BaseBroker(ABC):
     """Abstract base class for broker implementations"""
     
+    # Concurrent requests used by the default batch implementations (an
+    # emergency flatten sends all of its closes at once instead)
+    max_batch_concurrency = 16  # Matches the default HTTP connection pool size
+    
     def __init__(self, config: BrokerConfig):
         """
         Initialize broker
@@ -66,6 +120,8 @@ class BaseBroker(ABC):
         self.config = config
         self.name = config.name
         self.enabled = config.enabled
+        self._stream = None  # BrokerStream, created on first subscription
+        self._stream_lock = threading.Lock()
     
     @abstractmethod
     def place_order(self, symbol: str, action: str, lot_size: float,
@@ -140,6 +196,229 @@ class BaseBroker(ABC):
         """
         pass
     
+    # ===== Batch operations =====
+    
+    def place_orders(self, orders: Sequence[OrderRequest]) -> List[OrderResult]:
+        """
+        Place several orders
+        
+        Uses the broker's bulk endpoint if it has one, else sends the orders
+        concurrently.
+        
+        Args:
+            orders: Orders to place
+            
+        Returns:
+            OrderResult per order, in order
+        """
+        results = self._place_orders_bulk(orders)
+        if results is None:
+            results = self._run_batch(
+                lambda order: self.place_order(order.symbol, order.action, order.lot_size,
+                                               order.stop_loss, order.take_profit,
+                                               order.comment),
+                orders)
+        return results
+    
+    def close_positions(self, position_ids: Sequence[str]) -> List[OrderResult]:
+        """
+        Close several positions
+        
+        Args:
+            position_ids: Position IDs to close
+            
+        Returns:
+            OrderResult per position, in order
+        """
+        results = self._close_positions_bulk(position_ids)
+        if results is None:
+            results = self._run_batch(self.close_position, position_ids)
+        return results
+    
+    def modify_positions(self, modifications: Sequence[PositionModification]) -> List[OrderResult]:
+        """
+        Modify several positions
+        
+        Args:
+            modifications: Stop loss/take profit changes
+            
+        Returns:
+            OrderResult per modification, in order
+        """
+        results = self._modify_positions_bulk(modifications)
+        if results is None:
+            results = self._run_batch(
+                lambda change: self.modify_position(change.position_id, change.stop_loss,
+                                                    change.take_profit),
+                modifications)
+        return results
+    
+    def close_all_positions(self, symbol: Optional[str] = None) -> List[OrderResult]:
+        """
+        Close every open position (emergency flatten)
+        
+        Positions are listed with _poll_positions(), so a failed query is
+        reported instead of looking like an account with nothing to close.
+        Without a bulk endpoint every close is sent at once (one thread per
+        position, not capped at max_batch_concurrency). Each close still
+        takes a token from the account's shared rate limiter, so only the
+        first `burst` go out immediately; the rest follow at the sustained
+        requests_per_minute rate.
+        
+        Args:
+            symbol: Only close positions of this symbol (None = all)
+            
+        Returns:
+            OrderResult per closed position (a single FLATTEN_ERROR result
+            if the positions could not be listed)
+        """
+        try:
+            positions = self._poll_positions()
+        except Exception as e:
+            return [OrderResult(success=False, message=f"Could not list positions: {e}",
+                                error_code='FLATTEN_ERROR')]
+        position_ids = [pos.position_id for pos in positions
+                        if pos.position_id and (not symbol or pos.symbol == symbol)]
+        results = self._close_positions_bulk(position_ids)
+        if results is None:
+            results = self._run_batch(self.close_position, position_ids,
+                                      concurrency=len(position_ids))
+        return results
+    
+    def _place_orders_bulk(self, orders: Sequence[OrderRequest]) -> Optional[List[OrderResult]]:
+        """Place orders with a native bulk endpoint (override; None = not supported)"""
+        return None
+    
+    def _close_positions_bulk(self, position_ids: Sequence[str]) -> Optional[List[OrderResult]]:
+        """Close positions with a native bulk endpoint (override; None = not supported)"""
+        return None
+    
+    def _modify_positions_bulk(self, modifications: Sequence[PositionModification]
+                               ) -> Optional[List[OrderResult]]:
+        """Modify positions with a native bulk endpoint (override; None = not supported)"""
+        return None
+    
+    def _run_batch(self, call: Callable[[Any], OrderResult], items: Sequence[Any],
+                   concurrency: Optional[int] = None) -> List[OrderResult]:
+        """
+        Run a single-order call for every item concurrently
+        
+        Args:
+            call: Function taking one item and returning an OrderResult
+            items: Batch items
+            concurrency: Calls in flight at once (None = max_batch_concurrency)
+            
+        Returns:
+            OrderResult per item, in order (exceptions become failed results)
+        """
+        def run(item):
+            try:
+                return call(item)
+            except Exception as e:
+                return OrderResult(success=False, message=str(e), error_code='BATCH_ERROR')
+        
+        if len(items) <= 1:
+            return [run(item) for item in items]
+        workers = min(len(items), concurrency or self.max_batch_concurrency)
+        with ThreadPoolExecutor(max_workers=workers,
+                                thread_name_prefix=f"{self.name}-batch") as executor:
+            return list(executor.map(run, items))
+    
+    # ===== Streaming =====
+    
+    def subscribe_positions(self, callback: Optional[Callable[[Any], None]] = None):
+        """
+        Subscribe to position changes (opened, updated, closed)
+        
+        Updates are pushed over `config.stream_url` when set, with REST
+        polling as the fallback; either way they are kept in a local
+        position book (see get_streamed_positions).
+        
+        Args:
+            callback: Called with each StreamEvent on the stream thread
+                (None = only keep the book current)
+            
+        Returns:
+            Subscription (cancel() to unsubscribe)
+        """
+        return self._get_stream().subscribe(callback, kinds=('opened', 'updated', 'closed'))
+    
+    def subscribe_account(self, callback: Optional[Callable[[Any], None]] = None):
+        """
+        Subscribe to account information changes
+        
+        Args:
+            callback: Called with each 'account' StreamEvent on the stream thread
+            
+        Returns:
+            Subscription (cancel() to unsubscribe)
+        """
+        return self._get_stream().subscribe(callback, kinds=('account',))
+    
+    def get_streamed_positions(self, symbol: Optional[str] = None) -> Optional[List[Position]]:
+        """
+        Get positions from the local book without calling the broker
+        
+        Args:
+            symbol: Filter by symbol (None = all)
+            
+        Returns:
+            List of positions, or None unless the stream is connected and
+            has delivered its snapshot
+        """
+        stream = self._stream
+        if stream is None or not stream.is_live():
+            return None
+        return stream.book.positions(symbol)
+    
+    def get_streamed_account(self) -> Optional[AccountInfo]:
+        """Get account info from the local book (None unless the stream is live)"""
+        stream = self._stream
+        if stream is None or not stream.is_live():
+            return None
+        return stream.book.account()
+    
+    def has_stream(self) -> bool:
+        """Check whether updates can be pushed (stream_url set and websockets installed)"""
+        from .streaming import ws_connect
+        return bool(self.config.stream_url) and ws_connect is not None
+    
+    def get_stream_stats(self) -> Optional[Dict[str, Any]]:
+        """Get streaming mode and counters (None if never subscribed)"""
+        return self._stream.get_stats() if self._stream is not None else None
+    
+    def stop_streaming(self):
+        """Stop the update feed (subscriptions stay registered; subscribe again to restart)"""
+        if self._stream is not None:
+            self._stream.stop()
+    
+    def _get_stream(self):
+        """Get the broker's BrokerStream, creating it on first use"""
+        with self._stream_lock:
+            if self._stream is None:
+                from .streaming import BrokerStream
+                self._stream = BrokerStream(self, self.config.stream_url,
+                                            headers=self._stream_headers(),
+                                            subscribe_message=self._stream_subscribe_message())
+            return self._stream
+    
+    def _stream_headers(self) -> Dict[str, str]:
+        """WebSocket handshake headers (override to add authentication)"""
+        return {}
+    
+    def _stream_subscribe_message(self) -> Dict[str, Any]:
+        """Message sent after the stream connects"""
+        return {'action': 'subscribe', 'account_id': self.config.account_id,
+                'channels': ['positions', 'account']}
+    
+    def _poll_positions(self) -> List[Position]:
+        """All open positions for the streaming REST fallback (override to raise on errors)"""
+        return self.get_positions()
+    
+    def _poll_account_info(self) -> AccountInfo:
+        """Account info for the streaming REST fallback (override to raise on errors)"""
+        return self.get_account_info()
+    
     def is_enabled(self) -> bool:
         """Check if broker is enabled"""
         return self.enabled
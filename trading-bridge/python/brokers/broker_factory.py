@@ -8,6 +8,8 @@ from pathlib import Path
 
 from .base_broker import BaseBroker, BrokerConfig
 from .exness_api import ExnessAPI
+from .async_broker import AsyncBaseBroker
+from .async_exness_api import AsyncExnessAPI
 
 # Import credential manager
 import sys
@@ -23,6 +25,10 @@ class BrokerFactory:
         # Add more brokers here as they're implemented
     }
     
+    _async_broker_classes = {
+        'EXNESS': AsyncExnessAPI,
+    }
+    
     @classmethod
     def create_broker(cls, name: str, config: Optional[BrokerConfig] = None) -> Optional[BaseBroker]:
         """
@@ -56,6 +62,35 @@ class BrokerFactory:
             print(f"Error creating broker {name}: {e}")
             return None
     
+    @classmethod
+    def create_async_broker(cls, name: str,
+                            config: Optional[BrokerConfig] = None) -> Optional[AsyncBaseBroker]:
+        """
+        Create async broker instance
+        
+        Args:
+            name: Broker name (e.g., 'EXNESS')
+            config: Broker configuration (optional, will load from file if not provided)
+            
+        Returns:
+            Async broker instance or None if not found (or no async HTTP client is installed)
+        """
+        name_upper = name.upper()
+        
+        if name_upper not in cls._async_broker_classes:
+            return None
+        
+        if config is None:
+            config = cls._load_broker_config(name_upper)
+            if config is None:
+                return None
+        
+        try:
+            return cls._async_broker_classes[name_upper](config)
+        except Exception as e:
+            print(f"Error creating async broker {name}: {e}")
+            return None
+    
     @classmethod
     def _load_broker_config(cls, broker_name: str) -> Optional[BrokerConfig]:
         """
@@ -81,7 +116,9 @@ class BrokerFactory:
             api_key=broker_config.get('api_key'),
             api_secret=broker_config.get('api_secret'),
             enabled=broker_config.get('enabled', True),
-            rate_limit=broker_config.get('rate_limit')
+            rate_limit=broker_config.get('rate_limit'),
+            http=broker_config.get('http'),
+            stream_url=broker_config.get('stream_url')
         )
         
         return config
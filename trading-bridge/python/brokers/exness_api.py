@@ -7,6 +7,8 @@ from typing import Dict, List, Optional, Any
 from datetime import datetime
 
 from .base_broker import BaseBroker, BrokerConfig, OrderResult, Position, AccountInfo
+from .http_transport import HTTPOptions, TransportStats, create_session
+from .rate_limiter import RequestPriority, get_shared_bucket
 
 
 class ExnessAPI(BaseBroker):
@@ -20,7 +22,9 @@ class ExnessAPI(BaseBroker):
             config: Broker configuration
         """
         super().__init__(config)
-        self.session = requests.Session()
+        self.http_options = HTTPOptions.from_dict(config.http)
+        self.session, self._adapter = create_session(self.http_options)
+        self.transport_stats = TransportStats(self._adapter)
         self.base_url = config.api_url.rstrip('/')
         self.account_id = config.account_id
         
@@ -32,42 +36,88 @@ class ExnessAPI(BaseBroker):
                 'X-Account-ID': config.account_id
             })
         
-        # Rate limiting
-        self.last_request_time = 0
-        self.min_request_interval = 0.1  # 100ms between requests
+        # Rate limiting (one bucket per account, shared by all threads and clients)
         self.rate_limit = config.rate_limit or {'requests_per_minute': 60}
+        self.rate_limiter = get_shared_bucket((self.name.upper(), self.account_id), self.rate_limit)
     
-    def _rate_limit(self):
-        """Apply rate limiting"""
-        current_time = time.time()
-        elapsed = current_time - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+    def _rate_limit(self, priority: RequestPriority):
+        """Wait for a rate limit token in the request's lane"""
+        self.rate_limiter.acquire(priority=priority)
     
-    def _make_request(self, method: str, endpoint: str, **kwargs) -> Dict[str, Any]:
+    def _make_request(self, method: str, endpoint: str,
+                      priority: Optional[RequestPriority] = None, **kwargs) -> Dict[str, Any]:
         """
         Make HTTP request to Exness API
         
         Args:
             method: HTTP method (GET, POST, etc.)
             endpoint: API endpoint
+            priority: Rate limit lane (default: ORDER for writes, NORMAL for reads)
             **kwargs: Additional request parameters
             
         Returns:
             Response data as dictionary
         """
-        self._rate_limit()
+        if priority is None:
+            priority = RequestPriority.NORMAL if method.upper() == 'GET' else RequestPriority.ORDER
+        self._rate_limit(priority)
         
         url = f"{self.base_url}{endpoint}"
+        kwargs.setdefault('timeout', self.http_options.timeout)
         
+        started = time.perf_counter()
+        retries = 0
         try:
-            response = self.session.request(method, url, timeout=10, **kwargs)
+            response = self.session.request(method, url, **kwargs)
+            retry_state = getattr(response.raw, 'retries', None)
+            retries = len(retry_state.history) if retry_state is not None else 0
             response.raise_for_status()
-            return response.json()
+            result = response.json()
         except requests.exceptions.RequestException as e:
+            self.transport_stats.record(time.perf_counter() - started, retries, error=True)
             # Don't expose API details in error
             return {'error': 'API request failed', 'details': str(e)}
+        self.transport_stats.record(time.perf_counter() - started, retries)
+        return result
+    
+    def get_transport_stats(self) -> Dict[str, Any]:
+        """
+        Get HTTP transport statistics
+        
+        Returns:
+            Request count, errors, retries, mean/max latency (ms),
+            connections opened, connection reuse ratio and rate limiter state
+        """
+        stats = self.transport_stats.snapshot()
+        stats['rate_limiter'] = self.rate_limiter.get_stats()
+        return stats
+    
+    def _stream_headers(self) -> Dict[str, str]:
+        """Authenticate the position stream like the REST session"""
+        if not self.config.api_key:
+            return {}
+        return {'Authorization': f'Bearer {self.config.api_key}',
+                'X-Account-ID': self.account_id}
+    
+    def _poll_positions(self) -> List[Position]:
+        """Get all positions, raising on API errors instead of returning none"""
+        response = self._make_request('GET', '/positions', priority=RequestPriority.POLL)
+        if 'error' in response or 'positions' not in response:
+            raise ConnectionError(response.get('details') or 'Failed to get positions')
+        return self._parse_positions(response)
+    
+    def _poll_account_info(self) -> AccountInfo:
+        """Get account information, raising on API errors instead of returning zeros"""
+        response = self._make_request('GET', f'/accounts/{self.account_id}',
+                                      priority=RequestPriority.POLL)
+        if 'error' in response:
+            raise ConnectionError(response.get('details') or 'Failed to get account info')
+        return self._parse_account(response)
+    
+    def close(self):
+        """Stop streaming and close pooled connections"""
+        self.stop_streaming()
+        self.session.close()
     
     def place_order(self, symbol: str, action: str, lot_size: float,
                    stop_loss: Optional[float] = None,
@@ -88,44 +138,13 @@ class ExnessAPI(BaseBroker):
             OrderResult
         """
         if not self.validate_symbol(symbol):
-            return OrderResult(
-                success=False,
-                message=f"Invalid symbol: {symbol}",
-                error_code="INVALID_SYMBOL"
-            )
+            return self._invalid_symbol(symbol)
         
-        # Prepare order data
-        order_data = {
-            'symbol': symbol,
-            'side': action.upper(),
-            'volume': lot_size,
-            'account_id': self.account_id
-        }
-        
-        if stop_loss:
-            order_data['stop_loss'] = stop_loss
-        
-        if take_profit:
-            order_data['take_profit'] = take_profit
-        
-        if comment:
-            order_data['comment'] = comment
-        
-        # Make API request
+        order_data = self._order_payload(self.account_id, symbol, action, lot_size,
+                                         stop_loss, take_profit, comment)
         response = self._make_request('POST', '/orders', json=order_data)
-        
-        if 'error' in response:
-            return OrderResult(
-                success=False,
-                message=response.get('error', 'Unknown error'),
-                error_code=response.get('error_code', 'API_ERROR')
-            )
-        
-        return OrderResult(
-            success=True,
-            order_id=response.get('order_id'),
-            message=response.get('message', 'Order placed successfully')
-        )
+        return self._order_result(response, 'Order placed successfully', 'Unknown error',
+                                  'API_ERROR', use_response_message=True)
     
     def get_account_info(self) -> AccountInfo:
         """
@@ -135,25 +154,7 @@ class ExnessAPI(BaseBroker):
             AccountInfo
         """
         response = self._make_request('GET', f'/accounts/{self.account_id}')
-        
-        if 'error' in response:
-            # Return default values on error
-            return AccountInfo(
-                balance=0.0,
-                equity=0.0,
-                margin=0.0,
-                free_margin=0.0,
-                margin_level=0.0
-            )
-        
-        return AccountInfo(
-            balance=float(response.get('balance', 0)),
-            equity=float(response.get('equity', 0)),
-            margin=float(response.get('margin', 0)),
-            free_margin=float(response.get('free_margin', 0)),
-            margin_level=float(response.get('margin_level', 0)),
-            currency=response.get('currency', 'USD')
-        )
+        return self._parse_account(response)
     
     def get_positions(self, symbol: Optional[str] = None) -> List[Position]:
         """
@@ -169,27 +170,8 @@ class ExnessAPI(BaseBroker):
         if symbol:
             endpoint += f'?symbol={symbol}'
         
-        response = self._make_request('GET', endpoint)
-        
-        if 'error' in response or 'positions' not in response:
-            return []
-        
-        positions = []
-        for pos_data in response.get('positions', []):
-            position = Position(
-                symbol=pos_data.get('symbol', ''),
-                volume=float(pos_data.get('volume', 0)),
-                type=pos_data.get('type', 'BUY'),
-                open_price=float(pos_data.get('open_price', 0)),
-                current_price=float(pos_data.get('current_price', 0)),
-                profit=float(pos_data.get('profit', 0)),
-                swap=float(pos_data.get('swap', 0)),
-                commission=float(pos_data.get('commission', 0)),
-                position_id=pos_data.get('position_id')
-            )
-            positions.append(position)
-        
-        return positions
+        response = self._make_request('GET', endpoint, priority=RequestPriority.POLL)
+        return self._parse_positions(response)
     
     def close_position(self, position_id: str) -> OrderResult:
         """
@@ -202,19 +184,8 @@ class ExnessAPI(BaseBroker):
             OrderResult
         """
         response = self._make_request('DELETE', f'/positions/{position_id}')
-        
-        if 'error' in response:
-            return OrderResult(
-                success=False,
-                message=response.get('error', 'Failed to close position'),
-                error_code=response.get('error_code', 'CLOSE_ERROR')
-            )
-        
-        return OrderResult(
-            success=True,
-            order_id=response.get('order_id'),
-            message='Position closed successfully'
-        )
+        return self._order_result(response, 'Position closed successfully',
+                                  'Failed to close position', 'CLOSE_ERROR')
     
     def modify_position(self, position_id: str, stop_loss: Optional[float] = None,
                        take_profit: Optional[float] = None) -> OrderResult:
@@ -229,31 +200,117 @@ class ExnessAPI(BaseBroker):
         Returns:
             OrderResult
         """
+        update_data = self._modify_payload(stop_loss, take_profit)
+        if not update_data:
+            return self._no_modifications()
+        
+        response = self._make_request('PATCH', f'/positions/{position_id}', json=update_data)
+        return self._order_result(response, 'Position modified successfully',
+                                  'Failed to modify position', 'MODIFY_ERROR')
+    
+    # ===== Request/response mapping (shared with AsyncExnessAPI) =====
+    
+    @staticmethod
+    def _invalid_symbol(symbol: str) -> OrderResult:
+        return OrderResult(
+            success=False,
+            message=f"Invalid symbol: {symbol}",
+            error_code="INVALID_SYMBOL"
+        )
+    
+    @staticmethod
+    def _no_modifications() -> OrderResult:
+        return OrderResult(
+            success=False,
+            message='No modifications specified',
+            error_code='NO_MODIFICATIONS'
+        )
+    
+    @staticmethod
+    def _order_payload(account_id: str, symbol: str, action: str, lot_size: float,
+                       stop_loss: Optional[float], take_profit: Optional[float],
+                       comment: str) -> Dict[str, Any]:
+        """Build the POST /orders body"""
+        order_data = {
+            'symbol': symbol,
+            'side': action.upper(),
+            'volume': lot_size,
+            'account_id': account_id
+        }
+        
+        if stop_loss:
+            order_data['stop_loss'] = stop_loss
+        
+        if take_profit:
+            order_data['take_profit'] = take_profit
+        
+        if comment:
+            order_data['comment'] = comment
+        
+        return order_data
+    
+    @staticmethod
+    def _modify_payload(stop_loss: Optional[float],
+                        take_profit: Optional[float]) -> Dict[str, Any]:
+        """Build the PATCH /positions body (empty if nothing to modify)"""
         update_data = {}
         if stop_loss is not None:
             update_data['stop_loss'] = stop_loss
         if take_profit is not None:
             update_data['take_profit'] = take_profit
+        return update_data
+    
+    @staticmethod
+    def _order_result(response: Dict[str, Any], success_message: str, error_message: str,
+                      error_code: str, use_response_message: bool = False) -> OrderResult:
+        """
+        Map an order/position response to an OrderResult
         
-        if not update_data:
-            return OrderResult(
-                success=False,
-                message='No modifications specified',
-                error_code='NO_MODIFICATIONS'
-            )
-        
-        response = self._make_request('PATCH', f'/positions/{position_id}', json=update_data)
-        
+        Args:
+            response: Response from _make_request
+            success_message: Message on success
+            error_message: Message if the error response has none
+            error_code: Error code if the error response has none
+            use_response_message: Prefer the response's own success message
+            
+        Returns:
+            OrderResult
+        """
         if 'error' in response:
             return OrderResult(
                 success=False,
-                message=response.get('error', 'Failed to modify position'),
-                error_code=response.get('error_code', 'MODIFY_ERROR')
+                message=response.get('error', error_message),
+                error_code=response.get('error_code', error_code)
             )
         
+        message = success_message
+        if use_response_message:
+            message = response.get('message', success_message)
         return OrderResult(
             success=True,
             order_id=response.get('order_id'),
-            message='Position modified successfully'
+            message=message
         )
-
+    
+    @staticmethod
+    def _parse_account(response: Dict[str, Any]) -> AccountInfo:
+        """Map an account response to AccountInfo (zeros on error)"""
+        if 'error' in response:
+            # Return default values on error
+            return AccountInfo(
+                balance=0.0,
+                equity=0.0,
+                margin=0.0,
+                free_margin=0.0,
+                margin_level=0.0
+            )
+        
+        return AccountInfo.from_dict(response)
+    
+    @staticmethod
+    def _parse_positions(response: Dict[str, Any]) -> List[Position]:
+        """Map a positions response to Position objects (empty on error)"""
+        if 'error' in response or 'positions' not in response:
+            return []
+        
+        return [Position.from_dict(pos_data) for pos_data in response.get('positions', [])]
@@ -0,0 +1,213 @@
+"""
+HTTP Transport
+Pooled, keep-alive requests sessions with split timeouts, jittered retries
+on idempotent requests and connection reuse statistics
+"""
+import random
+import socket
+import threading
+from dataclasses import dataclass, field, fields
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
+
+
+@dataclass
+class HTTPOptions:
+    """HTTP transport options (the `http` block of a broker config)"""
+    pool_connections: int = 4      # Hosts with a cached connection pool
+    pool_maxsize: int = 16         # Kept-alive connections per host
+    pool_block: bool = False       # Wait for a free connection instead of opening an extra one
+    keep_alive: bool = True        # TCP keep-alive probes on idle pooled connections
+    keep_alive_idle: int = 30      # Seconds idle before the first probe
+    keep_alive_interval: int = 10  # Seconds between probes
+    keep_alive_expiry: float = 30  # Seconds an idle connection stays pooled (async clients)
+    connect_timeout: float = 3.05
+    read_timeout: float = 10.0
+    retries: int = 3               # Retries for idempotent requests (GET/HEAD/OPTIONS)
+    backoff_factor: float = 0.2    # Backoff before retry n is up to factor * 2 ** (n - 1)
+    backoff_max: float = 5.0
+    retry_statuses: Tuple[int, ...] = field(default=(429, 500, 502, 503, 504))
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> 'HTTPOptions':
+        """
+        Build options from a config dictionary (unknown keys are ignored)
+
+        Args:
+            data: Option values
+
+        Returns:
+            HTTPOptions
+        """
+        known = {item.name for item in fields(cls)}
+        values = {key: value for key, value in (data or {}).items() if key in known}
+        if 'retry_statuses' in values:
+            values['retry_statuses'] = tuple(values['retry_statuses'])
+        return cls(**values)
+
+    @property
+    def timeout(self) -> Tuple[float, float]:
+        """(connect, read) timeout for requests"""
+        return (self.connect_timeout, self.read_timeout)
+
+
+def backoff_delay(options: HTTPOptions, attempt: int) -> float:
+    """
+    Full-jitter backoff before a retry (for clients without urllib3 retries)
+
+    Args:
+        options: Transport options
+        attempt: Retry number (1 = first retry)
+
+    Returns:
+        Seconds to wait
+    """
+    return random.uniform(0, min(options.backoff_max, options.backoff_factor * 2 ** (attempt - 1)))
+
+
+class JitteredRetry(Retry):
+    """Retry with full jitter: each backoff is uniform in [0, exponential backoff]"""
+
+    def get_backoff_time(self) -> float:
+        backoff = super().get_backoff_time()
+        return random.uniform(0, backoff) if backoff > 0 else 0
+
+
+class PooledHTTPAdapter(HTTPAdapter):
+    """HTTPAdapter that enables TCP keep-alive on pooled connections"""
+
+    def __init__(self, options: HTTPOptions, **kwargs):
+        self.options = options
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        if self.options.keep_alive:
+            kwargs['socket_options'] = HTTPConnection.default_socket_options + self._keep_alive_options()
+        super().init_poolmanager(*args, **kwargs)
+
+    def _keep_alive_options(self):
+        """Socket options for TCP keep-alive (probe timing where the platform supports it)"""
+        options = [(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)]
+        if hasattr(socket, 'TCP_KEEPIDLE'):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, self.options.keep_alive_idle))
+        if hasattr(socket, 'TCP_KEEPINTVL'):
+            options.append((socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, self.options.keep_alive_interval))
+        return options
+
+    def __getstate__(self):
+        state = super().__getstate__()
+        state['options'] = self.options
+        return state
+
+
+def create_session(options: HTTPOptions) -> Tuple[requests.Session, PooledHTTPAdapter]:
+    """
+    Create a requests session using a pooled adapter
+
+    Args:
+        options: Transport options
+
+    Returns:
+        (session, adapter)
+    """
+    retry_options = dict(
+        total=options.retries,
+        connect=options.retries,
+        read=options.retries,
+        status=options.retries,
+        allowed_methods=frozenset({'GET', 'HEAD', 'OPTIONS'}),
+        status_forcelist=options.retry_statuses,
+        backoff_factor=options.backoff_factor,
+        raise_on_status=False,
+        respect_retry_after_header=True
+    )
+    try:
+        retry = JitteredRetry(backoff_max=options.backoff_max, **retry_options)
+    except TypeError:
+        retry = JitteredRetry(**retry_options)  # urllib3 1.26 has a fixed backoff cap
+    adapter = PooledHTTPAdapter(
+        options,
+        pool_connections=options.pool_connections,
+        pool_maxsize=options.pool_maxsize,
+        pool_block=options.pool_block,
+        max_retries=retry
+    )
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session, adapter
+
+
+class TransportStats:
+    """Request latency, retry and connection reuse counters for one session"""
+
+    def __init__(self, adapter: Optional[PooledHTTPAdapter] = None):
+        """
+        Initialize TransportStats
+
+        Args:
+            adapter: Adapter whose connection pools are inspected (None for
+                clients without urllib3 pools; connection counters are omitted)
+        """
+        self.adapter = adapter
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record(self, seconds: float, retries: int = 0, error: bool = False):
+        """
+        Record a completed request
+
+        Args:
+            seconds: Latency including retries
+            retries: Retries urllib3 made for the request
+            error: Whether the request failed
+        """
+        with self._lock:
+            self.requests += 1
+            self.retries += retries
+            if error:
+                self.errors += 1
+            self.latency_total += seconds
+            if seconds > self.latency_max:
+                self.latency_max = seconds
+
+    def _pool_counters(self) -> Tuple[int, int]:
+        """(connections opened, HTTP exchanges) across the adapter's pools"""
+        opened = exchanges = 0
+        if self.adapter is None:
+            return opened, exchanges
+        pools = self.adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            try:
+                pool = pools[key]
+            except KeyError:
+                continue  # Evicted meanwhile
+            opened += pool.num_connections
+            exchanges += pool.num_requests
+        return opened, exchanges
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Get counters, mean/max latency (ms) and connection reuse ratio"""
+        opened, exchanges = self._pool_counters()
+        with self._lock:
+            requests_made = self.requests
+            mean = self.latency_total / requests_made if requests_made else 0.0
+            stats = {
+                'requests': requests_made,
+                'errors': self.errors,
+                'retries': self.retries,
+                'mean_ms': round(mean * 1000, 3),
+                'max_ms': round(self.latency_max * 1000, 3)
+            }
+        if self.adapter is not None:
+            stats['connections_opened'] = opened
+            stats['connection_reuse'] = round(1 - opened / exchanges, 4) if exchanges else 0.0
+        return stats
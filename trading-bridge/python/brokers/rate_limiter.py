@@ -0,0 +1,226 @@
+"""
+Rate Limiter
+Thread-safe and asyncio-compatible token bucket with priority lanes, so
+broker requests use the full configured rate without tripping throttling
+and order placement is never queued behind position polling
+"""
+import asyncio
+import threading
+import time
+from enum import IntEnum
+from typing import Any, Dict, Hashable, Optional
+
+
+class RequestPriority(IntEnum):
+    """Request lanes (lower value = served first)"""
+    ORDER = 0    # Place, close and modify orders
+    NORMAL = 1   # Account queries, health checks
+    POLL = 2     # Position polling
+
+
+class TokenBucket:
+    """
+    Token bucket refilled at `rate` tokens per second up to `burst` tokens
+
+    Callers block (threads) or sleep (coroutines) until a token is free.
+    A caller only takes a token while no caller of a higher priority is
+    waiting, so queued orders preempt queued polls.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        """
+        Initialize TokenBucket
+
+        Args:
+            rate: Tokens added per second
+            burst: Bucket capacity (requests allowed back to back)
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if burst < 1:
+            raise ValueError("burst must be at least 1")
+        self.rate = float(rate)
+        self.burst = float(burst)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._condition = threading.Condition()
+        self._waiting = [0] * len(RequestPriority)
+        self._acquired = [0] * len(RequestPriority)
+        self._wait_time = [0.0] * len(RequestPriority)
+
+    @classmethod
+    def from_config(cls, rate_limit: Optional[Dict[str, Any]]) -> 'TokenBucket':
+        """
+        Build a bucket from a broker `rate_limit` config
+
+        Args:
+            rate_limit: 'requests_per_minute' (sustained rate, default 60)
+                and optional 'burst' (default 'requests_per_second', else 1)
+
+        Returns:
+            TokenBucket
+        """
+        rate_limit = rate_limit or {}
+        per_minute = float(rate_limit.get('requests_per_minute') or 60)
+        burst = rate_limit.get('burst') or rate_limit.get('requests_per_second') or 1
+        return cls(per_minute / 60.0, max(1.0, float(burst)))
+
+    def _refill(self, now: float):
+        """Add tokens accrued since the last update (caller holds lock)"""
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _try_take(self, tokens: float, priority: int) -> float:
+        """
+        Take tokens if allowed (caller holds lock)
+
+        Returns:
+            0 if taken, else seconds worth waiting before trying again
+        """
+        now = time.monotonic()
+        self._refill(now)
+        if any(self._waiting[:priority]):
+            # Leave tokens for the higher lanes; retry after they had a chance
+            return max(tokens - self._tokens, 1.0) / self.rate
+        if self._tokens >= tokens:
+            self._tokens -= tokens
+            return 0.0
+        return (tokens - self._tokens) / self.rate
+
+    def try_acquire(self, tokens: float = 1.0,
+                    priority: RequestPriority = RequestPriority.NORMAL) -> bool:
+        """
+        Take tokens without waiting
+
+        Args:
+            tokens: Tokens to take
+            priority: Request lane
+
+        Returns:
+            True if the tokens were taken
+        """
+        with self._condition:
+            if self._try_take(tokens, priority) == 0:
+                self._acquired[priority] += 1
+                return True
+            return False
+
+    def acquire(self, tokens: float = 1.0, priority: RequestPriority = RequestPriority.NORMAL,
+                timeout: Optional[float] = None) -> bool:
+        """
+        Wait for tokens (blocking)
+
+        Args:
+            tokens: Tokens to take (at most `burst`)
+            priority: Request lane
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if the tokens were taken, False on timeout
+        """
+        if tokens > self.burst:
+            raise ValueError("Cannot acquire more tokens than the burst size")
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self._condition:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    wait = self._try_take(tokens, priority)
+                    if wait == 0:
+                        self._acquired[priority] += 1
+                        self._wait_time[priority] += time.monotonic() - started
+                        return True
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            return False
+                        wait = min(wait, remaining)
+                    self._condition.wait(wait)
+            finally:
+                self._waiting[priority] -= 1
+                # Lower lanes may have been held back by this waiter
+                self._condition.notify_all()
+
+    async def acquire_async(self, tokens: float = 1.0,
+                            priority: RequestPriority = RequestPriority.NORMAL,
+                            timeout: Optional[float] = None) -> bool:
+        """
+        Wait for tokens without blocking the event loop
+
+        Shares tokens and lanes with threads using acquire().
+
+        Args:
+            tokens: Tokens to take (at most `burst`)
+            priority: Request lane
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if the tokens were taken, False on timeout
+        """
+        if tokens > self.burst:
+            raise ValueError("Cannot acquire more tokens than the burst size")
+        started = time.monotonic()
+        deadline = None if timeout is None else started + timeout
+        with self._condition:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                with self._condition:
+                    wait = self._try_take(tokens, priority)
+                    if wait == 0:
+                        self._acquired[priority] += 1
+                        self._wait_time[priority] += time.monotonic() - started
+                        return True
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        return False
+                    wait = min(wait, remaining)
+                await asyncio.sleep(wait)
+        finally:
+            with self._condition:
+                self._waiting[priority] -= 1
+                self._condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get available tokens and per-lane acquisitions, waiters and mean wait (ms)"""
+        with self._condition:
+            self._refill(time.monotonic())
+            return {
+                'rate_per_sec': self.rate,
+                'burst': self.burst,
+                'tokens': round(self._tokens, 3),
+                'lanes': {
+                    lane.name.lower(): {
+                        'acquired': self._acquired[lane],
+                        'waiting': self._waiting[lane],
+                        'mean_wait_ms': round(self._wait_time[lane] / self._acquired[lane] * 1000, 3)
+                        if self._acquired[lane] else 0.0
+                    }
+                    for lane in RequestPriority
+                }
+            }
+
+
+# Buckets shared by every client of the same account (sync and async alike)
+_shared_buckets: Dict[Hashable, TokenBucket] = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_bucket(key: Hashable, rate_limit: Optional[Dict[str, Any]] = None) -> TokenBucket:
+    """
+    Get the bucket for a key, creating it from `rate_limit` on first use
+
+    Args:
+        key: Limit scope, e.g. (broker name, account id)
+        rate_limit: Broker `rate_limit` config
+
+    Returns:
+        Shared TokenBucket
+    """
+    with _shared_lock:
+        bucket = _shared_buckets.get(key)
+        if bucket is None:
+            bucket = _shared_buckets[key] = TokenBucket.from_config(rate_limit)
+        return bucket
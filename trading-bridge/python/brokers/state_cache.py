@@ -0,0 +1,289 @@
+"""
+Broker State Cache
+TTL cache of account info and positions in front of any broker, with
+invalidation on order events and single-flight refreshes
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from .base_broker import (BaseBroker, OrderResult, Position, AccountInfo, OrderRequest,
+                          PositionModification)
+
+
+class _Flight:
+    """One in-progress load, shared by every caller that needs it"""
+
+    def __init__(self, generation: int):
+        self.generation = generation
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class CachedValue:
+    """
+    Value loaded on demand and kept for `ttl` seconds
+
+    Concurrent misses are coalesced: one caller loads, the others wait for
+    its result. invalidate() drops the value; a load that was already in
+    flight still answers its waiters but is not cached, and callers arriving
+    after the invalidation start a fresh load.
+    """
+
+    def __init__(self, loader: Callable[[], Any], ttl: float):
+        """
+        Initialize CachedValue
+
+        Args:
+            loader: Function returning a fresh value
+            ttl: Seconds a loaded value is served (0 = only coalesce concurrent loads)
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._value: Any = None
+        self._expires = 0.0
+        self._generation = 0
+        self._flight: Optional[_Flight] = None
+        self.hits = 0
+        self.loads = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+    def get(self, max_age: Optional[float] = None) -> Any:
+        """
+        Get the cached value, loading it if missing or expired
+
+        Args:
+            max_age: Override the TTL for this call (e.g. 0 to force a refresh)
+
+        Returns:
+            Value
+        """
+        with self._lock:
+            now = time.monotonic()
+            if self._expires > now and (max_age is None or
+                                        self._expires - self.ttl + max_age > now):
+                self.hits += 1
+                return self._value
+            flight = self._flight
+            leader = flight is None
+            if leader:
+                flight = self._flight = _Flight(self._generation)
+                self.loads += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            flight.value = self.loader()
+        except BaseException as e:
+            flight.error = e
+            raise
+        else:
+            with self._lock:
+                if flight.generation == self._generation:
+                    self._value = flight.value
+                    self._expires = time.monotonic() + self.ttl
+            return flight.value
+        finally:
+            with self._lock:
+                if self._flight is flight:
+                    self._flight = None
+            flight.done.set()
+
+    def peek(self) -> Any:
+        """Get the cached value without loading (None if missing or expired)"""
+        with self._lock:
+            return self._value if self._expires > time.monotonic() else None
+
+    def invalidate(self):
+        """Drop the cached value and detach any in-flight load"""
+        with self._lock:
+            self._generation += 1
+            self._value = None
+            self._expires = 0.0
+            self._flight = None
+            self.invalidations += 1
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get hit, load, coalesced and invalidation counters"""
+        with self._lock:
+            return {'hits': self.hits, 'loads': self.loads,
+                    'coalesced': self.coalesced, 'invalidations': self.invalidations}
+
+
+class BrokerStateCache(BaseBroker):
+    """
+    Broker wrapper serving account info and positions from a TTL cache
+
+    Values are loaded with the broker's raising _poll_account_info and
+    _poll_positions hooks, so a failed query raises instead of caching a
+    zeroed account or an empty position list. Positions are cached for
+    the whole account and filtered locally for per-symbol queries.
+    Orders, closes and modifications go straight to the broker; orders
+    and closes invalidate both caches and modifications the positions,
+    so the next read reflects them. While the broker's update stream is
+    connected, reads are served from the pushed book instead (a book
+    refreshed by fallback polling is not used: it could miss an order
+    placed since the last poll).
+    Other attributes (e.g. get_transport_stats) are forwarded to the broker.
+    """
+
+    def __init__(self, broker: BaseBroker, account_ttl: float = 30.0,
+                 positions_ttl: float = 2.0):
+        """
+        Initialize BrokerStateCache
+
+        Args:
+            broker: Broker to wrap
+            account_ttl: Seconds account info is served from cache
+            positions_ttl: Seconds positions are served from cache
+        """
+        super().__init__(broker.config)
+        self.broker = broker
+        self._account = CachedValue(broker._poll_account_info, account_ttl)
+        self._positions = CachedValue(broker._poll_positions, positions_ttl)
+
+    def __getattr__(self, name: str):
+        # Only called for attributes not found on the cache itself
+        if name == 'broker':
+            raise AttributeError(name)
+        return getattr(self.broker, name)
+
+    def get_account_info(self, max_age: Optional[float] = None) -> AccountInfo:
+        """
+        Get account information (streamed or cached)
+
+        Args:
+            max_age: Maximum acceptable age in seconds (default: account TTL);
+                set to bypass the streamed book
+
+        Returns:
+            AccountInfo (raises if the broker query fails)
+        """
+        if max_age is None:
+            account = self.broker.get_streamed_account()
+            if account is not None:
+                return account
+        return self._account.get(max_age)
+
+    def get_positions(self, symbol: Optional[str] = None,
+                      max_age: Optional[float] = None) -> List[Position]:
+        """
+        Get open positions (streamed or cached)
+
+        Args:
+            symbol: Filter by symbol (None = all)
+            max_age: Maximum acceptable age in seconds (default: positions TTL);
+                set to bypass the streamed book
+
+        Returns:
+            List of positions (raises if the broker query fails)
+        """
+        if max_age is None:
+            positions = self.broker.get_streamed_positions(symbol)
+            if positions is not None:
+                return positions
+        positions = self._positions.get(max_age)
+        if symbol:
+            return [pos for pos in positions if pos.symbol == symbol]
+        return list(positions)
+
+    def _poll_positions(self) -> List[Position]:
+        return self.broker._poll_positions()
+
+    def _poll_account_info(self) -> AccountInfo:
+        return self.broker._poll_account_info()
+
+    def place_order(self, symbol: str, action: str, lot_size: float,
+                    stop_loss: Optional[float] = None,
+                    take_profit: Optional[float] = None,
+                    comment: str = "") -> OrderResult:
+        try:
+            return self.broker.place_order(symbol, action, lot_size, stop_loss,
+                                           take_profit, comment)
+        finally:
+            self.invalidate()
+
+    def close_position(self, position_id: str) -> OrderResult:
+        try:
+            return self.broker.close_position(position_id)
+        finally:
+            self.invalidate()
+
+    def modify_position(self, position_id: str, stop_loss: Optional[float] = None,
+                        take_profit: Optional[float] = None) -> OrderResult:
+        try:
+            return self.broker.modify_position(position_id, stop_loss, take_profit)
+        finally:
+            # Modifications don't move money; only positions change
+            self._positions.invalidate()
+
+    def place_orders(self, orders: Sequence[OrderRequest]) -> List[OrderResult]:
+        try:
+            return self.broker.place_orders(orders)
+        finally:
+            self.invalidate()
+
+    def close_positions(self, position_ids: Sequence[str]) -> List[OrderResult]:
+        try:
+            return self.broker.close_positions(position_ids)
+        finally:
+            self.invalidate()
+
+    def modify_positions(self, modifications: Sequence[PositionModification]) -> List[OrderResult]:
+        try:
+            return self.broker.modify_positions(modifications)
+        finally:
+            self._positions.invalidate()
+
+    def close_all_positions(self, symbol: Optional[str] = None) -> List[OrderResult]:
+        # Flatten from the broker's live positions, never from the cache
+        try:
+            return self.broker.close_all_positions(symbol)
+        finally:
+            self.invalidate()
+
+    def subscribe_positions(self, callback=None):
+        return self.broker.subscribe_positions(callback)
+
+    def subscribe_account(self, callback=None):
+        return self.broker.subscribe_account(callback)
+
+    def get_streamed_positions(self, symbol: Optional[str] = None) -> Optional[List[Position]]:
+        return self.broker.get_streamed_positions(symbol)
+
+    def get_streamed_account(self) -> Optional[AccountInfo]:
+        return self.broker.get_streamed_account()
+
+    def get_stream_stats(self) -> Optional[Dict[str, Any]]:
+        return self.broker.get_stream_stats()
+
+    def stop_streaming(self):
+        self.broker.stop_streaming()
+
+    def invalidate(self):
+        """Drop cached account info and positions"""
+        self._account.invalidate()
+        self._positions.invalidate()
+
+    def peek_account_info(self) -> Optional[AccountInfo]:
+        """Get cached account info without calling the broker (None if stale)"""
+        return self._account.peek()
+
+    def peek_positions(self) -> Optional[List[Position]]:
+        """Get cached positions without calling the broker (None if stale)"""
+        positions = self._positions.peek()
+        return list(positions) if positions is not None else None
+
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get hit/load/coalesced/invalidation counters per cached value"""
+        return {'account': self._account.get_stats(),
+                'positions': self._positions.get_stats()}
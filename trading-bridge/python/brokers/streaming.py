@@ -0,0 +1,478 @@
+"""
+Broker Streaming
+Push-based position and account updates kept in a local position book,
+with REST polling as the fallback when no stream is available
+"""
+import asyncio
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+try:
+    from websockets.asyncio.client import connect as ws_connect
+except ImportError:
+    ws_connect = None
+
+from .base_broker import Position, AccountInfo
+
+
+# Stream protocol (JSON text frames), after the client sends
+# {"action": "subscribe", "account_id": ..., "channels": ["positions", "account"]}:
+#   {"type": "snapshot", "positions": [...], "account": {...}}   full state, sent on subscribe
+#   {"type": "position", "position": {...}}                      position opened or updated
+#   {"type": "position_closed", "position_id": "..."}            position closed
+#   {"type": "account", "account": {...}}                        account changed
+#   {"type": "heartbeat"}                                        keep-alive, ignored
+
+
+@dataclass
+class StreamEvent:
+    """Change applied to a position book"""
+    kind: str                          # 'opened', 'updated', 'closed' or 'account'
+    position: Optional[Position] = None
+    account: Optional[AccountInfo] = None
+    source: str = 'stream'             # 'stream' or 'poll'
+
+
+def _position_key(position: Position) -> str:
+    """Book key of a position (positions without an ID are keyed by their fields)"""
+    return position.position_id or f"{position.symbol}:{position.type}:{position.open_price}"
+
+
+class PositionBook:
+    """
+    Thread-safe in-memory book of open positions and account info
+
+    Updated incrementally from stream events or by diffing polled
+    positions; every change bumps `version` and is returned as
+    StreamEvents.
+    """
+
+    def __init__(self):
+        """Initialize PositionBook"""
+        self._condition = threading.Condition()
+        self._positions: Dict[str, Position] = {}
+        self._account: Optional[AccountInfo] = None
+        self.version = 0
+        self.updated_at: Optional[float] = None  # time.monotonic() of the last update
+
+    def apply(self, message: Dict[str, Any], source: str = 'stream') -> List[StreamEvent]:
+        """
+        Apply one stream message
+
+        Args:
+            message: Decoded stream message (see protocol above)
+            source: Event source recorded on the returned events
+
+        Returns:
+            Resulting changes (empty for heartbeats and unknown types)
+        """
+        kind = message.get('type')
+        if kind == 'snapshot':
+            events = self.replace_positions(
+                [Position.from_dict(data) for data in message.get('positions', [])], source)
+            if message.get('account'):
+                events += self.set_account(AccountInfo.from_dict(message['account']), source)
+            return events
+        if kind == 'position':
+            return self._upsert(Position.from_dict(message.get('position', {})), source)
+        if kind == 'position_closed':
+            return self._remove(str(message.get('position_id', '')), source)
+        if kind == 'account':
+            return self.set_account(AccountInfo.from_dict(message.get('account', {})), source)
+        return []
+
+    def replace_positions(self, positions: List[Position],
+                          source: str = 'poll') -> List[StreamEvent]:
+        """
+        Replace all positions, emitting opened/updated/closed changes
+
+        Args:
+            positions: Complete list of open positions
+            source: Event source recorded on the returned events
+
+        Returns:
+            Resulting changes
+        """
+        incoming = {_position_key(pos): pos for pos in positions}
+        events = []
+        with self._condition:
+            for key, pos in self._positions.items():
+                if key not in incoming:
+                    events.append(StreamEvent('closed', position=pos, source=source))
+            for key, pos in incoming.items():
+                previous = self._positions.get(key)
+                if previous is None:
+                    events.append(StreamEvent('opened', position=pos, source=source))
+                elif previous != pos:
+                    events.append(StreamEvent('updated', position=pos, source=source))
+            self._positions = incoming
+            self._touch()
+        return events
+
+    def set_account(self, account: AccountInfo, source: str = 'poll') -> List[StreamEvent]:
+        """
+        Set account information
+
+        Args:
+            account: Latest account information
+            source: Event source recorded on the returned events
+
+        Returns:
+            Resulting changes
+        """
+        with self._condition:
+            changed = account != self._account
+            self._account = account
+            self._touch()
+        return [StreamEvent('account', account=account, source=source)] if changed else []
+
+    def _upsert(self, position: Position, source: str) -> List[StreamEvent]:
+        key = _position_key(position)
+        with self._condition:
+            previous = self._positions.get(key)
+            self._positions[key] = position
+            self._touch()
+        if previous == position:
+            return []
+        return [StreamEvent('opened' if previous is None else 'updated',
+                            position=position, source=source)]
+
+    def _remove(self, position_id: str, source: str) -> List[StreamEvent]:
+        with self._condition:
+            position = self._positions.pop(position_id, None)
+            self._touch()
+        return [StreamEvent('closed', position=position, source=source)] if position else []
+
+    def _touch(self):
+        """Record an update and wake waiters (caller holds lock)"""
+        self.version += 1
+        self.updated_at = time.monotonic()
+        self._condition.notify_all()
+
+    def positions(self, symbol: Optional[str] = None) -> List[Position]:
+        """
+        Get open positions
+
+        Args:
+            symbol: Filter by symbol (None = all)
+
+        Returns:
+            List of positions
+        """
+        with self._condition:
+            return [pos for pos in self._positions.values() if not symbol or pos.symbol == symbol]
+
+    def get_position(self, position_id: str) -> Optional[Position]:
+        """Get a position by ID (None if not open)"""
+        with self._condition:
+            return self._positions.get(position_id)
+
+    def account(self) -> Optional[AccountInfo]:
+        """Get account information (None until first received)"""
+        with self._condition:
+            return self._account
+
+    def wait_for_update(self, version: int, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the book changes past `version`
+
+        Args:
+            version: Last version seen by the caller
+            timeout: Maximum seconds to wait (None = no limit)
+
+        Returns:
+            True if the book was updated, False on timeout
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self.version > version, timeout)
+
+
+class Subscription:
+    """Handle of a stream listener; cancel() to stop receiving events"""
+
+    def __init__(self, stream: 'BrokerStream', callback: Optional[Callable[[StreamEvent], None]],
+                 kinds: frozenset):
+        self.stream = stream
+        self.callback = callback
+        self.kinds = kinds
+        self.active = True
+
+    @property
+    def book(self) -> PositionBook:
+        """Position book kept by the stream"""
+        return self.stream.book
+
+    def cancel(self):
+        """Remove the listener (the stream stops with its last listener)"""
+        if self.active:
+            self.active = False
+            self.stream.remove_subscription(self)
+
+
+class BrokerStream:
+    """
+    Background feed of a broker's positions and account into a PositionBook
+
+    With a `stream_url` (and the websockets package installed) the book is
+    updated from pushed events and the connection is re-established with
+    jittered backoff; while disconnected, the broker is polled over REST so
+    listeners keep receiving changes. Without a stream, the broker is polled
+    at `poll_interval` and changes are derived by diffing.
+
+    The book is only live (served to readers instead of the broker) while
+    connected and after the server's snapshot: a polled book can miss an
+    order placed since the last poll.
+    """
+
+    def __init__(self, broker, stream_url: Optional[str] = None,
+                 headers: Optional[Dict[str, str]] = None,
+                 subscribe_message: Optional[Dict[str, Any]] = None,
+                 poll_interval: float = 5.0, account_poll_interval: float = 30.0,
+                 reconnect_delay: float = 1.0, reconnect_max: float = 30.0):
+        """
+        Initialize BrokerStream
+
+        Args:
+            broker: Broker used for REST polling (_poll_positions, _poll_account_info)
+            stream_url: WebSocket URL (None = poll only)
+            headers: Extra handshake headers (e.g. authorization)
+            subscribe_message: Message sent after connecting
+            poll_interval: Seconds between position polls when not streaming
+            account_poll_interval: Seconds between account polls when not streaming
+            reconnect_delay: Base seconds of the reconnect backoff
+            reconnect_max: Maximum seconds between reconnect attempts
+        """
+        self.broker = broker
+        self.stream_url = stream_url if ws_connect is not None else None
+        self.headers = headers or {}
+        self.subscribe_message = subscribe_message or {
+            'action': 'subscribe', 'channels': ['positions', 'account']}
+        self.poll_interval = poll_interval
+        self.account_poll_interval = account_poll_interval
+        self.reconnect_delay = reconnect_delay
+        self.reconnect_max = reconnect_max
+
+        self.book = PositionBook()
+        self.mode = 'stopped'  # 'stream', 'poll' or 'stopped'
+        self.connects = 0
+        self.disconnects = 0
+        self.messages = 0
+        self.polls = 0
+        self.last_error: Optional[str] = None
+
+        self._lock = threading.Lock()
+        self._subscriptions: List[Subscription] = []
+        self._thread: Optional[threading.Thread] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        # Dedicated so a hung REST poll can be abandoned on stop
+        self._poll_executor: Optional[ThreadPoolExecutor] = None
+        self._account_polled = 0.0
+        self._stopping = False
+
+    # ===== Listeners =====
+
+    def subscribe(self, callback: Optional[Callable[[StreamEvent], None]] = None,
+                  kinds=('opened', 'updated', 'closed', 'account')) -> Subscription:
+        """
+        Add a listener, starting the stream if needed
+
+        Args:
+            callback: Called with each StreamEvent on the stream thread (None = book only)
+            kinds: Event kinds delivered to the callback
+
+        Returns:
+            Subscription
+        """
+        subscription = Subscription(self, callback, frozenset(kinds))
+        with self._lock:
+            self._subscriptions.append(subscription)
+        self.start()
+        return subscription
+
+    def remove_subscription(self, subscription: Subscription):
+        """Remove a listener; stop the stream if none are left"""
+        with self._lock:
+            if subscription in self._subscriptions:
+                self._subscriptions.remove(subscription)
+            idle = not self._subscriptions
+        if idle:
+            self.stop()
+
+    def _publish(self, events: List[StreamEvent]):
+        """Deliver changes to listeners (a failing listener doesn't affect others)"""
+        if not events:
+            return
+        with self._lock:
+            subscriptions = list(self._subscriptions)
+        for event in events:
+            for subscription in subscriptions:
+                if subscription.callback is None or event.kind not in subscription.kinds:
+                    continue
+                try:
+                    subscription.callback(event)
+                except Exception as e:
+                    print(f"[ERROR] {self.broker.name} stream listener: {e}")
+
+    # ===== Lifecycle =====
+
+    def start(self):
+        """Start the background feed (no-op if running)"""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._poll_executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"{self.broker.name}-stream-poll")
+            self._stopping = False
+            self._thread = threading.Thread(target=self._thread_main, daemon=True,
+                                            name=f"{self.broker.name}-stream")
+            self.mode = 'poll'
+            self._thread.start()
+
+    def stop(self, timeout: float = 5.0):
+        """
+        Stop the background feed
+
+        Args:
+            timeout: Seconds to wait for the feed thread
+        """
+        with self._lock:
+            self._stopping = True
+            thread, loop, task = self._thread, self._loop, self._task
+            executor, self._poll_executor = self._poll_executor, None
+        if loop is not None and task is not None:
+            try:
+                loop.call_soon_threadsafe(task.cancel)
+            except RuntimeError:
+                pass  # Loop already closed
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        if executor is not None:
+            executor.shutdown(wait=False)
+        self.mode = 'stopped'
+
+    def is_live(self) -> bool:
+        """Check whether the book is kept current by the stream (connected, snapshot applied)"""
+        return self.mode == 'stream'
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get mode, connection counters and book version"""
+        return {
+            'mode': self.mode,
+            'stream_url': self.stream_url,
+            'connects': self.connects,
+            'disconnects': self.disconnects,
+            'messages': self.messages,
+            'polls': self.polls,
+            'positions': len(self.book.positions()),
+            'version': self.book.version,
+            'last_error': self.last_error
+        }
+
+    def _thread_main(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        with self._lock:
+            if self._stopping:
+                loop.close()
+                return
+            # Published under the lock so stop() always sees the task to cancel
+            self._task = task = loop.create_task(self._run())
+            self._loop = loop
+        try:
+            loop.run_until_complete(task)
+        except asyncio.CancelledError:
+            pass
+        finally:
+            with self._lock:
+                self._loop = self._task = None
+            loop.close()
+
+    async def _run(self):
+        if not self.stream_url:
+            await self._poll_for(None)
+            return
+        attempt = 0
+        while True:
+            try:
+                await self._stream_once()
+                attempt = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.last_error = str(e) or type(e).__name__
+            if self.mode == 'stream':
+                self.disconnects += 1
+                print(f"[WARNING] {self.broker.name} stream disconnected, polling: {self.last_error}")
+            self.mode = 'poll'
+            attempt += 1
+            delay = random.uniform(0, min(self.reconnect_max,
+                                          self.reconnect_delay * 2 ** (attempt - 1)))
+            # Resync over REST before (and while) waiting to reconnect
+            await self._poll_for(max(delay, 0.001))
+
+    # ===== Streaming =====
+
+    async def _stream_once(self):
+        """Connect, subscribe and apply events until the connection ends"""
+        async with ws_connect(self.stream_url, additional_headers=self.headers,
+                              open_timeout=10) as websocket:
+            await websocket.send(json.dumps(self.subscribe_message))
+            self.connects += 1
+            self.last_error = None
+            async for frame in websocket:
+                try:
+                    message = json.loads(frame)
+                except ValueError:
+                    continue
+                self.messages += 1
+                events = self.book.apply(message, source='stream')
+                if message.get('type') == 'snapshot':
+                    # Live only once the book holds the full state
+                    self.mode = 'stream'
+                self._publish(events)
+            self.last_error = 'connection closed'
+
+    # ===== Polling =====
+
+    async def _poll_for(self, duration: Optional[float]):
+        """Poll the broker every poll_interval for `duration` seconds (None = forever)"""
+        deadline = None if duration is None else time.monotonic() + duration
+        while True:
+            started = time.monotonic()
+            await self._poll_once()
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+            wait = self.poll_interval - (time.monotonic() - started)
+            if deadline is not None:
+                wait = min(wait, deadline - time.monotonic())
+            if wait > 0:
+                await asyncio.sleep(wait)
+            if deadline is not None and time.monotonic() >= deadline:
+                return
+
+    async def _poll_once(self):
+        """Refresh the book from the broker's REST API"""
+        loop = asyncio.get_running_loop()
+        executor = self._poll_executor
+        if executor is None:
+            return
+        try:
+            positions = await loop.run_in_executor(executor, self.broker._poll_positions)
+            self.polls += 1
+            events = self.book.replace_positions(positions, source='poll')
+            now = time.monotonic()
+            if now - self._account_polled >= self.account_poll_interval:
+                account = await loop.run_in_executor(executor, self.broker._poll_account_info)
+                self._account_polled = now
+                events += self.book.set_account(account, source='poll')
+        except Exception as e:
+            # Keep the book as it was: a failed poll says nothing about positions
+            self.last_error = str(e) or type(e).__name__
+            return
+        self._publish(events)
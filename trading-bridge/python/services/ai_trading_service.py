@@ -3,6 +3,7 @@ AI Trading Service
 Complete AI trading system that integrates all AI components
 """
 import time
+import asyncio
 import threading
 import logging
 from pathlib import Path
@@ -43,13 +44,21 @@ logger = logging.getLogger(__name__)
 # Import existing components
 try:
     from bridge.mql5_bridge import MQL5Bridge
+    from bridge.async_bridge import AsyncMQL5Bridge
     from brokers.broker_factory import BrokerFactory
+    from brokers.async_broker import gather_brokers
+    from brokers.state_cache import BrokerStateCache
     from trader.multi_symbol_trader import MultiSymbolTrader
     from bridge.signal_manager import TradeSignal, TradeAction
+    from bridge.market_data import MarketDataStore
 except ImportError as e:
     logger.error(f"Import error: {e}")
     MQL5Bridge = None
+    AsyncMQL5Bridge = None
+    MarketDataStore = None
     BrokerFactory = None
+    gather_brokers = None
+    BrokerStateCache = None
     MultiSymbolTrader = None
 
 # Import AI components
@@ -70,17 +79,21 @@ class AITradingService:
     Integrates all AI components for autonomous trading
     """
     
-    def __init__(self, bridge_port: int = 5555, config: Optional[Dict] = None):
+    def __init__(self, bridge_port: int = 5555, config: Optional[Dict] = None,
+                 bridge_mode: str = "rep"):
         """
         Initialize AI Trading Service
         
         Args:
             bridge_port: Port for MQL5 bridge
             config: Configuration dictionary
+            bridge_mode: 'rep' for a single EA, 'router' for many terminals
         """
         self.bridge_port = bridge_port
+        self.bridge_mode = bridge_mode
         self.config = config or {}
         self.bridge = None
+        self.market_data = None
         self.brokers = {}
         self.trader = None
         self.ai_engine = None
@@ -97,15 +110,24 @@ class AITradingService:
         # Health check
         self.last_health_check = None
         self.health_check_interval = 60  # seconds
+        self.broker_timeout = 10  # seconds per broker call in health checks
     
     def start(self):
         """Start the AI trading service"""
         try:
             logger.info("Starting AI Trading Service...")
             
+            # Market data pushed by the EA through the bridge (needs numpy)
+            if MarketDataStore:
+                try:
+                    self.market_data = MarketDataStore()
+                except ImportError as e:
+                    logger.warning(f"Market data store not available: {e}")
+            
             # Initialize AI engine
             if AIStrategyEngine:
-                self.ai_engine = AIStrategyEngine(config=self.config.get('ai', {}))
+                self.ai_engine = AIStrategyEngine(config=self.config.get('ai', {}),
+                                                  market_data_store=self.market_data)
                 logger.info("AI Strategy Engine initialized")
             else:
                 logger.error("AI Strategy Engine not available - cannot start AI service")
@@ -116,18 +138,39 @@ class AITradingService:
             
             # Initialize bridge
             if MQL5Bridge:
-                self.bridge = MQL5Bridge(port=self.bridge_port)
+                journal_path = (Path(__file__).parent.parent.parent.parent / "data" /
+                                "journal" / f"signals_{self.bridge_port}.journal")
+                # Requests, heartbeats and publishing share one event loop thread
+                self.bridge = AsyncMQL5Bridge(port=self.bridge_port, mode=self.bridge_mode,
+                                              journal_path=journal_path,
+                                              metrics_port=self.config.get('metrics_port'),
+                                              market_data=self.market_data)
                 self.bridge_thread = threading.Thread(target=self._run_bridge, daemon=True)
                 self.bridge_thread.start()
-                time.sleep(2)  # Wait for bridge to start
-                logger.info("MQL5 Bridge started")
+                if self.bridge.wait_ready(timeout=10):
+                    logger.info("MQL5 Bridge started")
+                else:
+                    logger.error("MQL5 Bridge failed to start")
             else:
                 logger.warning("MQL5 Bridge not available - running in analysis-only mode")
             
             # Initialize brokers
             if BrokerFactory:
-                self.brokers = BrokerFactory.create_all_brokers()
+                # Account info and positions are shared through a TTL cache
+                cache_config = self.config.get('broker_cache', {})
+                self.brokers = {
+                    name: BrokerStateCache(broker,
+                                           account_ttl=cache_config.get('account_ttl', 30.0),
+                                           positions_ttl=cache_config.get('positions_ttl', 2.0))
+                    for name, broker in BrokerFactory.create_all_brokers().items()
+                }
                 logger.info(f"Loaded {len(self.brokers)} broker(s)")
+                
+                # Let the risk manager size positions from the trading account
+                risk_manager = getattr(self.ai_engine, 'risk_manager', None)
+                default_broker = self.config.get('default_broker', 'EXNESS')
+                if risk_manager is not None and default_broker in self.brokers:
+                    risk_manager.broker_state = self.brokers[default_broker]
             else:
                 logger.warning("Broker factory not available")
             
@@ -135,6 +178,8 @@ class AITradingService:
             if MultiSymbolTrader:
                 self.trader = MultiSymbolTrader(bridge=self.bridge, broker_manager=self.brokers)
                 logger.info("Multi-symbol trader initialized")
+                for name, mode in self.trader.start_streaming().items():
+                    logger.info(f"Position updates for {name}: {mode}")
             else:
                 logger.warning("Multi-symbol trader not available")
             
@@ -301,7 +346,8 @@ class AITradingService:
                 lot_size=lot_size,
                 stop_loss=stop_loss,
                 take_profit=take_profit,
-                comment=f"AI Signal: {signal.get('reasoning', '')} (confidence: {confidence:.2f})"
+                comment=f"AI Signal: {signal.get('reasoning', '')} (confidence: {confidence:.2f})",
+                confidence=confidence
             )
             
             # Send signal to bridge or execute directly
@@ -348,13 +394,16 @@ class AITradingService:
                 status = self.bridge.get_status()
                 logger.debug(f"Bridge status: {status.get('connection_status', 'unknown')}")
             
-            # Check brokers
-            for broker_name, broker in self.brokers.items():
-                try:
-                    account_info = broker.get_account_info()
-                    logger.debug(f"{broker_name} account balance: {account_info.balance}")
-                except Exception as e:
-                    logger.warning(f"{broker_name} health check failed: {e}")
+            # Check brokers (concurrently, so one slow broker doesn't delay the rest)
+            if self.brokers:
+                results = asyncio.run(gather_brokers(
+                    self.brokers, 'get_account_info', timeout=self.broker_timeout))
+                for broker_name, outcome in results.items():
+                    if outcome['error']:
+                        logger.warning(f"{broker_name} health check failed: {outcome['error']}")
+                    else:
+                        logger.debug(f"{broker_name} account balance: {outcome['result'].balance} "
+                                     f"({outcome['elapsed_ms']} ms)")
             
             self.last_health_check = current_time
     
@@ -366,6 +415,9 @@ class AITradingService:
         if self.bridge:
             self.bridge.stop()
         
+        if self.trader:
+            self.trader.shutdown()
+        
         logger.info("AI Trading Service stopped")
     
     def get_status(self) -> Dict:
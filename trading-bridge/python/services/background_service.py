@@ -5,10 +5,12 @@ Main service that runs trading system in background
 import os
 import sys
 import time
+import asyncio
 import threading
 import logging
 from pathlib import Path
 from datetime import datetime
+from typing import Dict, Optional
 
 # Add parent directories to path
 # Get the trading-bridge/python directory
@@ -29,7 +31,10 @@ except OSError:
 
 try:
     from bridge.mql5_bridge import MQL5Bridge
+    from bridge.supervisor import BridgeSupervisor
     from brokers.broker_factory import BrokerFactory
+    from brokers.async_broker import gather_brokers
+    from brokers.state_cache import BrokerStateCache
     from trader.multi_symbol_trader import MultiSymbolTrader
 except ImportError as e:
     # Log error but don't crash - allow service to start with minimal
@@ -42,7 +47,10 @@ except ImportError as e:
     logger.error(f"Python dir: {python_dir}")
     # Set to None to allow graceful degradation
     MQL5Bridge = None
+    BridgeSupervisor = None
     BrokerFactory = None
+    gather_brokers = None
+    BrokerStateCache = None
     MultiSymbolTrader = None
 finally:
     # Restore original working directory
@@ -71,15 +79,24 @@ logger = logging.getLogger(__name__)
 class BackgroundTradingService:
     """Main background trading service"""
 
-    def __init__(self, bridge_port: int = 5555, use_ai: bool = False):
+    def __init__(self, bridge_port: int = 5555, use_ai: bool = False,
+                 bridge_mode: str = "rep",
+                 bridge_endpoints: Optional[Dict[str, int]] = None):
         """
         Initialize background trading service
 
         Args:
             bridge_port: Port for MQL5 bridge
             use_ai: If True, use AI trading service instead of basic service
+            bridge_mode: 'rep' for a single EA, 'router' to serve several
+                MT5 terminals concurrently on one port
+            bridge_endpoints: Broker name -> port; if set, one bridge
+                endpoint per broker is hosted by a BridgeSupervisor in this
+                process (bridge_port is then ignored)
         """
         self.bridge_port = bridge_port
+        self.bridge_mode = bridge_mode
+        self.bridge_endpoints = bridge_endpoints
         self.use_ai = use_ai
         self.bridge = None
         self.brokers = {}
@@ -91,6 +108,7 @@ class BackgroundTradingService:
         # Health check
         self.last_health_check = None
         self.health_check_interval = 60  # seconds
+        self.broker_timeout = 10  # seconds per broker call in health checks
 
         # Check if modules are available
         self.modules_available = MQL5Bridge is not None
@@ -115,8 +133,27 @@ class BackgroundTradingService:
                 self._service_loop_minimal()
                 return
 
-            # Initialize bridge
-            self.bridge = MQL5Bridge(port=self.bridge_port)
+            # Initialize bridge (or one endpoint per broker)
+            journal_dir = (Path(__file__).parent.parent.parent.parent /
+                           "data" / "journal")
+            if self.bridge_endpoints:
+                self.bridge = BridgeSupervisor()
+                for broker, port in self.bridge_endpoints.items():
+                    self.bridge.add_endpoint(
+                        port, broker=broker, mode=self.bridge_mode,
+                        journal_path=journal_dir / f"signals_{port}.journal")
+            else:
+                self.bridge = MQL5Bridge(
+                    port=self.bridge_port, mode=self.bridge_mode,
+                    journal_path=journal_dir /
+                    f"signals_{self.bridge_port}.journal")
+
+            # React to EA disconnects/reconnects as they happen (per endpoint,
+            # so one EA dropping is seen while others stay connected)
+            if self.bridge_endpoints:
+                self.bridge.add_endpoint_status_listener(self._on_endpoint_status)
+            else:
+                self.bridge.add_status_listener(self._on_bridge_status)
 
             # Start bridge in separate thread
             self.bridge_thread = threading.Thread(
@@ -124,11 +161,14 @@ class BackgroundTradingService:
             self.bridge_thread.start()
 
             # Wait for bridge to start
-            time.sleep(2)
+            if not self.bridge.wait_ready(timeout=10):
+                logger.error("MQL5 Bridge failed to start")
 
             # Initialize brokers
             logger.info("Loading brokers...")
-            self.brokers = BrokerFactory.create_all_brokers()
+            # Account info and positions are shared through a TTL cache
+            self.brokers = {name: BrokerStateCache(broker) for name, broker in
+                            BrokerFactory.create_all_brokers().items()}
             logger.info(f"Loaded {len(self.brokers)} broker(s)")
 
             # Initialize multi-symbol trader
@@ -136,6 +176,11 @@ class BackgroundTradingService:
                 bridge=self.bridge, broker_manager=self.brokers)
             logger.info("Multi-symbol trader initialized")
 
+            # Brokers with a stream_url push position updates into local
+            # books that position monitoring reads; others are polled by it
+            for name, mode in self.trader.start_streaming().items():
+                logger.info(f"Position updates for {name}: {mode}")
+
             # Log active symbols for today
             active_symbols = self.trader.get_active_symbols_today()
             current_day = datetime.now().strftime('%A')
@@ -180,14 +225,6 @@ class BackgroundTradingService:
                 if self.trader:
                     self.trader.monitor_positions()
 
-                # Check bridge status
-                if self.bridge:
-                    status = self.bridge.get_status()
-                    if status['connection_status'] == 'disconnected':
-                        logger.warning(
-                            "Bridge disconnected, attempting to reconnect...")
-                        # Bridge will auto-reconnect on next request
-
                 # Sleep before next iteration
                 time.sleep(5)
 
@@ -199,6 +236,22 @@ class BackgroundTradingService:
                 logger.error(f"Service loop error: {e}")
                 time.sleep(10)
 
+    def _on_bridge_status(self, previous: str, current: str, ea: str = "MQL5 EA"):
+        """Bridge connection state listener (runs on the bridge thread)"""
+        if current == 'disconnected':
+            logger.warning(
+                f"{ea} disconnected (heartbeat deadline passed), "
+                "waiting for it to reconnect...")
+            # Bridge will auto-reconnect on next request
+        elif current == 'connected' and previous == 'disconnected':
+            logger.info(f"{ea} reconnected")
+
+    def _on_endpoint_status(self, port: int, broker: Optional[str],
+                            previous: str, current: str):
+        """Supervisor endpoint state listener (runs on the bridge thread)"""
+        self._on_bridge_status(previous, current,
+                               f"MQL5 EA for {broker or 'any broker'} (port {port})")
+
     def _service_loop_minimal(self):
         """Minimal service loop when modules not available"""
         while self.running:
@@ -228,14 +281,18 @@ class BackgroundTradingService:
                 conn_status = status['connection_status']
                 logger.debug(f"Bridge status: {conn_status}")
 
-            # Check brokers
-            for broker_name, broker in self.brokers.items():
-                try:
-                    account_info = broker.get_account_info()
-                    balance = account_info.balance
-                    logger.debug(f"{broker_name} account balance: {balance}")
-                except Exception as e:
-                    logger.warning(f"{broker_name} health check failed: {e}")
+            # Check brokers (concurrently, so one slow broker doesn't delay the rest)
+            if self.brokers:
+                results = asyncio.run(gather_brokers(
+                    self.brokers, 'get_account_info', timeout=self.broker_timeout))
+                for broker_name, outcome in results.items():
+                    if outcome['error']:
+                        logger.warning(f"{broker_name} health check failed: "
+                                       f"{outcome['error']}")
+                    else:
+                        balance = outcome['result'].balance
+                        logger.debug(f"{broker_name} account balance: {balance} "
+                                     f"({outcome['elapsed_ms']} ms)")
 
             self.last_health_check = current_time
 
@@ -255,7 +312,8 @@ class BackgroundTradingService:
                     config = json.load(f)
 
             self.ai_service = AITradingService(
-                bridge_port=self.bridge_port, config=config)
+                bridge_port=self.bridge_port, config=config,
+                bridge_mode=self.bridge_mode)
             self.ai_service.start()
 
         except ImportError as e:
@@ -282,6 +340,9 @@ class BackgroundTradingService:
         if self.bridge:
             self.bridge.stop()
 
+        if self.trader:
+            self.trader.shutdown()
+
         logger.info("Background Trading Service stopped")
 
     def get_status(self) -> dict:
@@ -3,6 +3,8 @@ Multi-Symbol Trading Manager
 Manages trading across multiple symbols and brokers
 """
 import json
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
 from typing import Dict, List, Set, Optional
 from pathlib import Path
 from datetime import datetime
@@ -10,6 +12,51 @@ from datetime import datetime
 from ..bridge.signal_manager import TradeSignal
 from ..brokers.base_broker import BaseBroker, OrderResult
 from ..brokers.broker_factory import BrokerFactory
+from ..brokers.async_broker import gather_brokers
+
+
+class PositionSnapshot(dict):
+    """
+    Result of a position monitoring pass
+
+    Maps broker_name -> list of positions, with per-broker call timings,
+    errors and the pass duration. Brokers that failed or timed out are
+    left out of the mapping (their positions are unknown, not empty) and
+    only reported in `errors`.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.timings_ms: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+        self.elapsed_ms = 0.0
+        self.timestamp = datetime.now().isoformat()
+
+    def add(self, broker_name: str, positions: List, elapsed_ms: float):
+        """Record a broker's positions"""
+        self[broker_name] = positions
+        self.timings_ms[broker_name] = round(elapsed_ms, 3)
+
+    def add_error(self, broker_name: str, error: str, elapsed_ms: Optional[float] = None):
+        """Record a failed broker"""
+        self.errors[broker_name] = error
+        if elapsed_ms is not None:
+            self.timings_ms[broker_name] = round(elapsed_ms, 3)
+
+    def get_summary(self) -> Dict:
+        """Get position counts, timings and errors per broker"""
+        return {
+            'timestamp': self.timestamp,
+            'elapsed_ms': self.elapsed_ms,
+            'brokers': {
+                broker_name: {
+                    'positions': len(self[broker_name]) if broker_name in self else None,
+                    'elapsed_ms': self.timings_ms.get(broker_name),
+                    'error': self.errors.get(broker_name)
+                }
+                for broker_name in [*self, *self.errors]
+            }
+        }
 
 
 class MultiSymbolTrader:
@@ -30,6 +77,12 @@ class MultiSymbolTrader:
         self.symbol_configs: Dict[str, Dict] = {}
         self.active_positions: Dict[str, Dict] = {}
 
+        # Position monitoring fan-out
+        self.broker_timeout = 4.0  # seconds; below the services' 5 s loop tick
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._pending_calls: Dict[str, Future] = {}
+        self._subscriptions: List = []
+
         # Load symbol configurations
         self._load_symbol_configs()
 
@@ -241,38 +294,196 @@ class MultiSymbolTrader:
             'timestamp': datetime.now().isoformat()
         }
 
-    def monitor_positions(self) -> Dict[str, List]:
+    def monitor_positions(self, timeout: Optional[float] = None) -> 'PositionSnapshot':
         """
         Monitor all positions across brokers
 
+        Brokers are queried concurrently on a thread pool, so a pass takes
+        about as long as the slowest broker. A broker that misses the
+        timeout is reported as timed out (its tracked positions are kept)
+        and is skipped on later passes until its call returns, so a hung
+        broker never ties up more than one thread. Brokers whose position
+        book is kept current by start_streaming() are read from the book
+        without a request.
+
+        Args:
+            timeout: Seconds to wait for brokers (default: broker_timeout)
+
         Returns:
-            Dictionary of broker_name -> list of positions
+            PositionSnapshot of broker_name -> list of positions, with
+            per-broker timings and errors (failed brokers only in errors)
         """
-        all_positions = {}
+        timeout = self.broker_timeout if timeout is None else timeout
+        snapshot = PositionSnapshot()
+        started = time.perf_counter()
 
+        futures = {}
         for broker_name, broker in self.brokers.items():
+            get_streamed = getattr(broker, 'get_streamed_positions', None)
+            streamed = get_streamed() if get_streamed is not None else None
+            if streamed is not None:
+                snapshot.add(broker_name, streamed, 0.0)
+                self._track_positions(broker_name, streamed)
+                continue
+            pending = self._pending_calls.get(broker_name)
+            if pending is not None and not pending.done():
+                snapshot.add_error(broker_name, 'previous call still running')
+                continue
+            future = self._get_executor().submit(self._timed_call, broker.get_positions)
+            self._pending_calls[broker_name] = future
+            futures[future] = broker_name
+
+        done, _ = wait(futures, timeout=timeout)
+        for future, broker_name in futures.items():
+            if future not in done:
+                snapshot.add_error(broker_name, 'timeout', timeout * 1000)
+                continue
+            self._pending_calls.pop(broker_name, None)
+            try:
+                positions, elapsed = future.result()
+            except Exception as e:
+                snapshot.add_error(broker_name, str(e))
+                continue
+            snapshot.add(broker_name, positions, elapsed * 1000)
+            self._track_positions(broker_name, positions)
+
+        snapshot.elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        for broker_name, error in snapshot.errors.items():
+            print(f"[ERROR] {broker_name}: {error}")
+        return snapshot
+
+    async def monitor_positions_async(self, timeout: Optional[float] = None) -> 'PositionSnapshot':
+        """
+        Monitor all positions across brokers, querying them concurrently
+
+        Sync brokers run on a thread pool and async brokers on the event
+        loop, so the pass takes about as long as the slowest broker.
+
+        Args:
+            timeout: Per-broker timeout in seconds (default: broker_timeout)
+
+        Returns:
+            PositionSnapshot of broker_name -> list of positions (failed
+            brokers only in errors)
+        """
+        timeout = self.broker_timeout if timeout is None else timeout
+        snapshot = PositionSnapshot()
+        started = time.perf_counter()
+        results = await gather_brokers(self.brokers, 'get_positions', timeout=timeout)
+        for broker_name, outcome in results.items():
+            if outcome['error']:
+                snapshot.add_error(broker_name, outcome['error'], outcome['elapsed_ms'])
+                print(f"[ERROR] {broker_name}: {outcome['error']}")
+                continue
+            snapshot.add(broker_name, outcome['result'], outcome['elapsed_ms'])
+            self._track_positions(broker_name, outcome['result'])
+        snapshot.elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        return snapshot
+
+    @staticmethod
+    def _timed_call(method):
+        """Call a broker method; return (result, seconds)"""
+        started = time.perf_counter()
+        result = method()
+        return result, time.perf_counter() - started
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Thread pool for broker fan-out (created on first use)"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max(4, len(self.brokers)),
+                                                thread_name_prefix='position-monitor')
+        return self._executor
+
+    def _track_positions(self, broker_name: str, positions: List):
+        """Update active positions tracking from a broker's positions"""
+        timestamp = datetime.now().isoformat()
+        updates = {}
+        for pos in positions:
+            if pos.position_id:
+                symbol_key = f"{pos.symbol}@{broker_name}"
+                updates[f"{symbol_key}_{pos.position_id}"] = {
+                    'symbol_key': symbol_key,
+                    'position_id': pos.position_id,
+                    'volume': pos.volume,
+                    'type': pos.type,
+                    'profit': pos.profit,
+                    'timestamp': timestamp
+                }
+        self.active_positions.update(updates)
+
+    def close_all_positions(self, symbol: Optional[str] = None) -> Dict[str, List[OrderResult]]:
+        """
+        Close every open position on every broker (emergency flatten)
+
+        Brokers are flattened concurrently, and each sends all of its
+        closes at once (or uses its bulk endpoint). Closes still pass the
+        broker's rate limiter: beyond its burst they are paced at the
+        sustained rate, so a large book is not closed in a single round.
+
+        Args:
+            symbol: Only close positions of this symbol (None = all)
+
+        Returns:
+            Dictionary of broker_name -> OrderResult per closed position
+        """
+        futures = {broker_name: self._get_executor().submit(broker.close_all_positions, symbol)
+                   for broker_name, broker in self.brokers.items()}
+        results = {}
+        for broker_name, future in futures.items():
             try:
-                positions = broker.get_positions()
-                all_positions[broker_name] = positions
-
-                # Update active positions tracking
-                for pos in positions:
-                    symbol_key = f"{pos.symbol}@{broker_name}"
-                    if pos.position_id:
-                        position_key = f"{symbol_key}_{pos.position_id}"
-                        self.active_positions[position_key] = {
-                            'symbol_key': symbol_key,
-                            'position_id': pos.position_id,
-                            'volume': pos.volume,
-                            'type': pos.type,
-                            'profit': pos.profit,
-                            'timestamp': datetime.now().isoformat()
-                        }
+                results[broker_name] = future.result()
             except Exception as e:
-                print(f"[ERROR] {broker_name}: {e}")
-                all_positions[broker_name] = []
+                print(f"[ERROR] {broker_name}: flatten failed: {e}")
+                results[broker_name] = [OrderResult(success=False, message=str(e),
+                                                    error_code='FLATTEN_ERROR')]
+
+        # Stop tracking a broker's positions once all of them closed (an empty
+        # result proves nothing: the broker may not have listed its positions)
+        for broker_name, broker_results in results.items():
+            if broker_results and all(result.success for result in broker_results):
+                suffix = f"@{broker_name}"
+                for key in [key for key, data in self.active_positions.items()
+                            if data['symbol_key'].endswith(suffix) and
+                            (symbol is None or data['symbol_key'] == f"{symbol}{suffix}")]:
+                    del self.active_positions[key]
+        return results
+
+    def start_streaming(self) -> Dict[str, str]:
+        """
+        Keep position books current from the brokers' update streams
+
+        Only brokers with a stream (stream_url set and the websockets
+        package installed) are subscribed; monitor_positions() reads their
+        books while connected. Other brokers keep being queried by
+        monitor_positions(), so no extra polling is added.
 
-        return all_positions
+        Returns:
+            Dictionary of broker_name -> 'stream', 'poll' (no stream) or error
+        """
+        modes = {}
+        for broker_name, broker in self.brokers.items():
+            if not hasattr(broker, 'subscribe_positions') or not broker.has_stream():
+                modes[broker_name] = 'poll'
+                continue
+            try:
+                self._subscriptions.append(broker.subscribe_positions())
+                self._subscriptions.append(broker.subscribe_account())
+            except Exception as e:
+                modes[broker_name] = f"error: {e}"
+                print(f"[ERROR] {broker_name}: could not start streaming: {e}")
+                continue
+            modes[broker_name] = 'stream'
+        return modes
+
+    def shutdown(self):
+        """Stop streaming and the monitoring thread pool (calls still running are abandoned)"""
+        for subscription in self._subscriptions:
+            subscription.cancel()
+        self._subscriptions.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self._pending_calls.clear()
 
     def get_symbol_config(self, symbol: str, broker: str) -> Optional[Dict]:
         """
@@ -0,0 +1,133 @@
+#!/usr/bin/env python
+"""
+Test Bridge ACKs
+Drives a running bridge the way an EA does and checks acknowledged
+delivery: ACK/NACK, redelivery after the visibility timeout and
+dead-lettering after max_deliveries
+"""
+import sys
+import json
+import time
+import socket
+import logging
+import threading
+from pathlib import Path
+
+# Add python directory to path
+script_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(script_dir / "python"))
+
+import zmq
+
+from bridge.mql5_bridge import MQL5Bridge
+from bridge.signal_manager import TradeSignal, SignalManager
+
+logging.disable(logging.WARNING)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def make_signal(signal_id: str, action: str = 'BUY', symbol: str = 'EURUSD',
+                broker: str = 'EXNESS', **kwargs) -> TradeSignal:
+    return TradeSignal(symbol=symbol, action=action, broker=broker, lot_size=0.01,
+                       signal_id=signal_id, **kwargs)
+
+
+def check(passed: bool, message: str) -> bool:
+    print(f"    {'✓' if passed else '✗'} {message}")
+    return passed
+
+
+def request(sock, payload: dict) -> dict:
+    sock.send_string(json.dumps(payload))
+    return json.loads(sock.recv())
+
+
+def ids(signals) -> list:
+    return [s['signal_id'] if isinstance(s, dict) else s.signal_id for s in signals]
+
+
+def start_bridge(manager: SignalManager):
+    """Start a bridge on a free port and connect a REQ socket to it like an EA"""
+    port = free_port()
+    bridge = MQL5Bridge(port=port, host="127.0.0.1", signal_manager=manager)
+    threading.Thread(target=bridge.start, daemon=True).start()
+    bridge.wait_ready(timeout=10)
+    context = zmq.Context()
+    sock = context.socket(zmq.REQ)
+    sock.setsockopt(zmq.RCVTIMEO, 5000)
+    sock.setsockopt(zmq.LINGER, 0)
+    sock.connect(f"tcp://127.0.0.1:{port}")
+    return bridge, context, sock
+
+
+def test_acks(results: list):
+    print("[1/1] ACK/NACK redelivery and dead-lettering...")
+    manager = SignalManager(ack_timeout=0.2, max_deliveries=2)
+    bridge, context, sock = start_bridge(manager)
+    for index in range(3):
+        bridge.send_signal(make_signal(f"ack_{index}", symbol=['EURUSD', 'GBPUSD', 'USDJPY'][index]))
+
+    fetch = {'action': 'GET_SIGNALS', 'broker': 'EXNESS', 'ack': True}
+    first = request(sock, fetch)
+    results.append(check(ids(first['signals']) == ['ack_0', 'ack_1', 'ack_2'] and
+                         first['queue_size'] == 0 and manager.get_in_flight_count() == 3,
+                         "Fetched with ack: all three in flight, none queued"))
+    response = request(sock, {'action': 'ACK', 'signal_ids': ['ack_0', 'missing']})
+    results.append(check(response['acked'] == 1 and response['unknown'] == ['missing'],
+                         f"ACK: {response['acked']} acked, unknown {response['unknown']}"))
+    response = request(sock, {'action': 'NACK', 'signal_ids': ['ack_1']})
+    results.append(check(response['requeued'] == 1, "NACK requeues ack_1"))
+    again = request(sock, fetch)
+    results.append(check(ids(again['signals']) == ['ack_1'],
+                         f"NACKed signal redelivered at once: {ids(again['signals'])}"))
+
+    # ack_2 was never acknowledged: it comes back after the visibility
+    # timeout; ack_1 has had its two deliveries and is dead-lettered instead
+    time.sleep(0.3)
+    timed_out = request(sock, fetch)
+    results.append(check(ids(timed_out['signals']) == ['ack_2'] and
+                         ids(manager.get_dead_letters()) == ['ack_1'],
+                         f"Unacknowledged signal redelivered after timeout: "
+                         f"{ids(timed_out['signals'])}"))
+    time.sleep(0.3)
+    results.append(check(request(sock, fetch)['signals'] == [] and
+                         ids(manager.get_dead_letters()) == ['ack_1', 'ack_2'],
+                         "Dead-lettered after max_deliveries instead of redelivered"))
+    status = bridge.get_status()
+    stats = status['signal_manager']
+    results.append(check(stats['acked'] == 1 and stats['redelivered'] == 2 and
+                         stats['dead_lettered'] == 2 and stats['in_flight'] == 0 and
+                         stats['redelivery_latency']['count'] == 2,
+                         f"Stats: acked {stats['acked']}, redelivered {stats['redelivered']}, "
+                         f"dead-lettered {stats['dead_lettered']}"))
+    results.append(check(len(manager.get_history()) == 3,
+                         "Redeliveries don't add history entries"))
+    sock.close()
+    context.term()
+    bridge.stop()
+    print()
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Bridge ACK Test")
+    print("=" * 60)
+    print()
+    results = []
+
+    test_acks(results)
+
+    print("=" * 60)
+    passed = sum(results)
+    print(f"{'✅' if passed == len(results) else '❌'} {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
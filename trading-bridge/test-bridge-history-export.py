@@ -0,0 +1,122 @@
+#!/usr/bin/env python
+"""
+Test Bridge History Export
+Pages through delivered-signal history with EXPORT_HISTORY and checks
+cursors, chunked frames, signals evicted before export and resuming from
+a cursor after new signals arrive
+"""
+import sys
+import json
+import socket
+import logging
+import threading
+from pathlib import Path
+
+# Add python directory to path
+script_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(script_dir / "python"))
+
+import zmq
+
+from bridge.mql5_bridge import MQL5Bridge
+from bridge.signal_manager import TradeSignal, SignalManager
+
+logging.disable(logging.WARNING)
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def make_signal(signal_id: str) -> TradeSignal:
+    return TradeSignal(symbol='EURUSD', action='BUY', broker='EXNESS', lot_size=0.01,
+                       signal_id=signal_id)
+
+
+def check(passed: bool, message: str) -> bool:
+    print(f"    {'✓' if passed else '✗'} {message}")
+    return passed
+
+
+def ids(signals) -> list:
+    return [data['signal_id'] for data in signals]
+
+
+def start_bridge(manager: SignalManager):
+    """Start a bridge on a free port and connect a REQ socket to it like an EA"""
+    port = free_port()
+    bridge = MQL5Bridge(port=port, host="127.0.0.1", signal_manager=manager)
+    threading.Thread(target=bridge.start, daemon=True).start()
+    bridge.wait_ready(timeout=10)
+    context = zmq.Context()
+    sock = context.socket(zmq.REQ)
+    sock.setsockopt(zmq.RCVTIMEO, 5000)
+    sock.setsockopt(zmq.LINGER, 0)
+    sock.connect(f"tcp://127.0.0.1:{port}")
+    return bridge, context, sock
+
+
+def test_export(results: list):
+    print("[1/1] EXPORT_HISTORY cursors...")
+    manager = SignalManager(max_history=50)
+    bridge, context, sock = start_bridge(manager)
+    for index in range(120):
+        manager.add_signal(make_signal(f"h_{index}"))
+    manager.get_signals()
+
+    def export(cursor: int, limit: int, chunk_size: int):
+        sock.send_string(json.dumps({'action': 'EXPORT_HISTORY', 'cursor': cursor,
+                                     'limit': limit, 'chunk_size': chunk_size}))
+        frames = sock.recv_multipart()
+        header = json.loads(frames[0])
+        signals = [data for frame in frames[1:] for data in json.loads(frame)]
+        return header, signals
+
+    header, signals = export(0, 20, 7)
+    results.append(check(header['cursor'] == 70 and header['missed'] == 70 and
+                         ids(signals)[0] == 'h_70' and len(signals) == 20 and
+                         header['chunks'] == 3 and header['more'],
+                         f"Evicted signals reported as missed: {header['missed']}, "
+                         f"page starts at {header['cursor']}"))
+    exported = ids(signals)
+    cursor = header['next_cursor']
+    while header['more']:
+        header, signals = export(cursor, 20, 7)
+        exported += ids(signals)
+        cursor = header['next_cursor']
+    results.append(check(exported == [f"h_{index}" for index in range(70, 120)] and cursor == 120,
+                         f"Paging exports every kept signal once (next cursor {cursor})"))
+
+    for index in range(120, 130):
+        manager.add_signal(make_signal(f"h_{index}"))
+    manager.get_signals()
+    header, signals = export(cursor, 100, 250)
+    results.append(check(ids(signals) == [f"h_{index}" for index in range(120, 130)] and
+                         header['missed'] == 0 and not header['more'],
+                         "Cursor resumes with only the new signals"))
+    sock.close()
+    context.term()
+    bridge.stop()
+    print()
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Bridge History Export Test")
+    print("=" * 60)
+    print()
+    results = []
+
+    test_export(results)
+
+    print("=" * 60)
+    passed = sum(results)
+    print(f"{'✅' if passed == len(results) else '❌'} {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
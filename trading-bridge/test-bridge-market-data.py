@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""
+Test Bridge Market Data
+Pushes ticks and M1 bars through a running bridge the way PythonBridgeEA
+does, and checks that the analyzer, predictor and risk manager (which read
+H1 by default) see them
+"""
+import sys
+import json
+import time
+import socket
+import logging
+import threading
+from pathlib import Path
+
+# Add python directory to path
+script_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(script_dir / "python"))
+
+import zmq
+
+from bridge.mql5_bridge import MQL5Bridge
+from bridge.market_data import MarketDataStore, resample_bars, to_records, BAR_FIELDS
+from ai.analyzers.market_analyzer import AIMarketAnalyzer
+from ai.models.price_predictor import PricePredictor
+from ai.risk_manager import AIRiskManager
+
+logging.disable(logging.INFO)
+
+START = 1_700_000_000 // 3600 * 3600  # Hour-aligned epoch seconds
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def m1_bars(count: int, start: int = START, price: float = 1.1):
+    """Synthetic M1 bars: [time, open, high, low, close, volume]"""
+    bars = []
+    for index in range(count):
+        open_price = price + index * 0.0001
+        bars.append([start + index * 60, open_price, open_price + 0.0003,
+                     open_price - 0.0002, open_price + 0.0001, 10 + index % 5])
+    return bars
+
+
+def check(passed: bool, message: str) -> bool:
+    print(f"    {'✓' if passed else '✗'} {message}")
+    return passed
+
+
+def request(sock, payload: dict) -> dict:
+    sock.send_string(json.dumps(payload))
+    return json.loads(sock.recv())
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Bridge Market Data Test")
+    print("=" * 60)
+    print()
+    results = []
+
+    print("[1/4] Resampling M1 to H1...")
+    store = MarketDataStore()
+    bars = m1_bars(150)  # 2.5 hours: two complete H1 bars and one forming
+    store.push_bars('EURUSD', 'M1', bars)
+    hourly = store.bars('EURUSD', 'H1')
+    results.append(check(hourly is not None and len(hourly) == 2,
+                         f"{0 if hourly is None else len(hourly)} complete H1 bars from 150 M1 bars"))
+    first = bars[:60]
+    expected = (START, first[0][1], max(b[2] for b in first), min(b[3] for b in first),
+                first[-1][4], sum(b[5] for b in first))
+    results.append(check(hourly is not None and
+                         tuple(float(hourly[0][name]) for name in BAR_FIELDS) == expected,
+                         "First H1 bar has the OHLCV of its 60 M1 bars"))
+    results.append(check(len(store.bars('EURUSD', 'H1', 1)) == 1 and
+                         store.bars('EURUSD', 'H1', 1)[0]['time'] == START + 3600,
+                         "count returns the latest bars"))
+    store.push_bars('EURUSD', 'H1', [[START, 1.0, 1.0, 1.0, 1.0, 1.0]])
+    results.append(check(len(store.bars('EURUSD', 'H1')) == 1,
+                         "Pushed H1 bars take precedence over resampling"))
+    results.append(check(store.bars('EURUSD', 'W1') is None and store.bars('GBPUSD', 'H1') is None,
+                         "Unknown timeframe or symbol returns None"))
+    partial = resample_bars(to_records(m1_bars(60), BAR_FIELDS), 3600, 60)
+    results.append(check(len(partial) == 1, "An hour ending on its last M1 bar is complete"))
+    print()
+
+    print("[2/4] Starting bridge and pushing data like the EA...")
+    port = free_port()
+    bridge = MQL5Bridge(port=port, host="127.0.0.1")
+    threading.Thread(target=bridge.start, daemon=True).start()
+    results.append(check(bridge.wait_ready(timeout=10), f"Bridge listening on port {port}"))
+    context = zmq.Context()
+    sock = context.socket(zmq.REQ)
+    sock.setsockopt(zmq.RCVTIMEO, 5000)
+    sock.setsockopt(zmq.LINGER, 0)
+    sock.connect(f"tcp://127.0.0.1:{port}")
+    bar_rows = m1_bars(1500)  # 25 hours of M1 backfill
+    for symbol, price in (('EURUSD', 1.1), ('GBPUSD', 1.25)):
+        response = request(sock, {'action': 'PUSH_BARS', 'symbol': symbol, 'timeframe': 'M1',
+                                  'bars': m1_bars(1500, price=price)})
+        results.append(check(response.get('stored') == 1500, f"{symbol}: {response}"))
+    response = request(sock, {'action': 'PUSH_TICKS', 'symbol': 'EURUSD',
+                              'ticks': [[bar_rows[-1][0] + 1, 1.25, 1.2501, 0, 1]]})
+    results.append(check(response.get('stored') == 1, f"Tick pushed: {response}"))
+    missing = [request(sock, {'action': action, 'ticks': [], 'bars': []})
+               for action in ('PUSH_TICKS', 'PUSH_BARS')]
+    results.append(check(all(response == {'status': 'ERROR', 'message': 'symbol required'}
+                             for response in missing),
+                         f"Push without a symbol rejected: {missing[0]}"))
+    print()
+
+    print("[3/4] Reading through the AI components (default H1)...")
+    analysis = AIMarketAnalyzer(market_data=bridge.market_data).analyze('EURUSD')
+    results.append(check('error' not in analysis and analysis.get('timeframe') == 'H1',
+                         f"Analyzer sees data: {analysis.get('error', 'ok')}"))
+    history = PricePredictor(market_data=bridge.market_data)._get_historical_data('EURUSD', 'H1')
+    results.append(check(history is not None and len(history) == 25,
+                         f"Predictor history: {0 if history is None else len(history)} H1 bars"))
+    risk = AIRiskManager(market_data=bridge.market_data)
+    returns = risk._bar_returns('EURUSD')
+    results.append(check(returns is not None and len(returns) == 24,
+                         f"Risk manager H1 returns: {0 if returns is None else len(returns)}"))
+    risk.add_position('GBPUSD', {'risk': 1.0})
+    correlation = risk._check_correlation_risk('EURUSD')
+    results.append(check(correlation > 0.9, f"Correlation with open GBPUSD: {correlation:.3f}"))
+    print()
+
+    print("[4/4] Stopping bridge...")
+    sock.close()
+    context.term()
+    bridge.stop()
+    print("    ✓ Bridge stopped")
+    print()
+
+    print("=" * 60)
+    passed = sum(results)
+    print(f"{'✅' if passed == len(results) else '❌'} {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
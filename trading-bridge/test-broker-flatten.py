@@ -0,0 +1,192 @@
+#!/usr/bin/env python
+"""
+Test Broker Flatten
+Runs a local stand-in Exness server that answers closes after a fixed
+delay and checks that an emergency flatten sends every close at once
+(more than max_batch_concurrency) for the sync and async clients, and
+that the shared rate limiter still paces closes beyond its burst
+"""
+import sys
+import json
+import time
+import asyncio
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add python directory to path
+script_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(script_dir / "python"))
+
+from brokers.base_broker import BrokerConfig
+from brokers.exness_api import ExnessAPI
+from brokers.async_exness_api import AsyncExnessAPI
+
+POSITIONS = 20
+CLOSE_DELAY = 0.3  # Seconds the stand-in takes to answer a close
+UNLIMITED = {'requests_per_minute': 60_000_000, 'burst': 1000}
+
+
+# ===== Stand-in broker =====
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Lists POSITIONS open positions; answers closes after CLOSE_DELAY"""
+
+    protocol_version = 'HTTP/1.1'  # Keep-alive
+
+    def do_GET(self):
+        self._reply({'positions': [
+            {'symbol': 'EURUSD', 'volume': 0.1, 'type': 'BUY', 'open_price': 1.1,
+             'current_price': 1.1005, 'profit': 5.0, 'position_id': f"pos_{index}"}
+            for index in range(POSITIONS)
+        ]})
+
+    def do_DELETE(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.peak = max(server.peak, server.in_flight)
+        time.sleep(CLOSE_DELAY)
+        with server.lock:
+            server.in_flight -= 1
+            server.closes += 1
+            order_id = f"close_{server.closes}"
+        self._reply({'order_id': order_id, 'message': 'Position closed successfully'})
+
+    def _reply(self, body: dict):
+        payload = json.dumps(body).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    ThreadingHTTPServer.request_queue_size = 64
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.peak = 0
+    server.closes = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def make_config(server: ThreadingHTTPServer, account_id: str, rate_limit: dict,
+                http: dict = None) -> BrokerConfig:
+    # Fresh account id per case: fresh shared rate limit bucket
+    return BrokerConfig(name='EXNESS', account_id=account_id, http=http or {},
+                        api_url=f"http://127.0.0.1:{server.server_address[1]}",
+                        rate_limit=rate_limit)
+
+
+def reset(server: ThreadingHTTPServer):
+    with server.lock:
+        server.peak = 0
+        server.closes = 0
+
+
+def check(passed: bool, message: str) -> bool:
+    print(f"    {'✓' if passed else '✗'} {message}")
+    return passed
+
+
+# ===== Tests =====
+
+def test_sync(server: ThreadingHTTPServer, results: list):
+    print("[1/3] Sync flatten past max_batch_concurrency...")
+    reset(server)
+    api = ExnessAPI(make_config(server, 'flatten-sync', UNLIMITED))
+    api.get_positions()  # Warm up the connection pool
+    started = time.perf_counter()
+    closed = api.close_all_positions()
+    elapsed = time.perf_counter() - started
+    api.close()
+    results.append(check(len(closed) == POSITIONS and all(result.success for result in closed),
+                         f"All {POSITIONS} positions closed"))
+    results.append(check(server.peak == POSITIONS > api.max_batch_concurrency,
+                         f"{server.peak} closes in flight at once "
+                         f"(max_batch_concurrency={api.max_batch_concurrency})"))
+    results.append(check(elapsed < CLOSE_DELAY * 1.8,
+                         f"One round: {elapsed * 1000:.0f} ms for {CLOSE_DELAY * 1000:.0f} ms closes"))
+    print()
+
+
+def test_async(server: ThreadingHTTPServer, results: list):
+    print("[2/3] Async flatten past max_batch_concurrency...")
+    reset(server)
+
+    async def flatten():
+        # Async clients wait for a pooled connection, so size the pool to the book
+        api = AsyncExnessAPI(make_config(server, 'flatten-async', UNLIMITED,
+                                         http={'pool_maxsize': POSITIONS}))
+        await api.get_positions()  # Create the client and warm up its pool
+        started = time.perf_counter()
+        closed = await api.close_all_positions()
+        elapsed = time.perf_counter() - started
+        await api.close()
+        return closed, elapsed
+
+    closed, elapsed = asyncio.run(flatten())
+    results.append(check(len(closed) == POSITIONS and all(result.success for result in closed),
+                         f"All {POSITIONS} positions closed"))
+    results.append(check(server.peak == POSITIONS,
+                         f"{server.peak} closes in flight at once"))
+    results.append(check(elapsed < CLOSE_DELAY * 1.8,
+                         f"One round: {elapsed * 1000:.0f} ms for {CLOSE_DELAY * 1000:.0f} ms closes"))
+    print()
+
+
+def test_rate_limited(server: ThreadingHTTPServer, results: list):
+    print("[3/3] Flatten paced by the shared rate limiter...")
+    reset(server)
+    # Burst 10, then 20 requests/s: the listing and 9 closes go out at once,
+    # the other 11 closes follow one every 50 ms
+    rate_limit = {'requests_per_minute': 1200, 'burst': 10}
+    api = ExnessAPI(make_config(server, 'flatten-paced', rate_limit))
+    started = time.perf_counter()
+    closed = api.close_all_positions()
+    elapsed = time.perf_counter() - started
+    api.close()
+    paced = (POSITIONS + 1 - rate_limit['burst']) / (rate_limit['requests_per_minute'] / 60)
+    results.append(check(len(closed) == POSITIONS and all(result.success for result in closed),
+                         f"All {POSITIONS} positions closed"))
+    results.append(check(server.peak < POSITIONS,
+                         f"Only {server.peak} closes in flight at once"))
+    results.append(check(elapsed >= paced + CLOSE_DELAY * 0.9,
+                         f"{elapsed * 1000:.0f} ms: closes beyond the burst waited "
+                         f"~{paced * 1000:.0f} ms for tokens"))
+    print()
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Broker Flatten Test")
+    print("=" * 60)
+    print()
+    logging.getLogger('urllib3').setLevel(logging.ERROR)  # "Connection pool is full" noise
+    results = []
+
+    server = start_server()
+    try:
+        test_sync(server, results)
+        test_async(server, results)
+        test_rate_limited(server, results)
+    finally:
+        server.shutdown()
+
+    print("=" * 60)
+    passed = sum(results)
+    print(f"{'✅' if passed == len(results) else '❌'} {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
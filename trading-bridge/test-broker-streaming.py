@@ -0,0 +1,279 @@
+#!/usr/bin/env python
+"""
+Test Broker Streaming
+Runs a local stand-in broker (WebSocket position stream plus REST API) and
+checks that pushed updates reach the local position book, that the book
+falls back to REST polling when the stream drops and that streaming
+resumes when it comes back
+"""
+import sys
+import json
+import time
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+# Add python directory to path
+script_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(script_dir / "python"))
+
+try:
+    from websockets.asyncio.server import serve as ws_serve
+except ImportError:
+    print("✗ websockets is required for this test: pip install websockets")
+    sys.exit(1)
+
+from brokers.base_broker import BrokerConfig
+from brokers.exness_api import ExnessAPI
+from brokers.state_cache import BrokerStateCache
+
+ACCOUNT_ID = "12345"
+
+
+# ===== Stand-in broker =====
+
+class StandInBroker:
+    """Broker state served over REST and pushed over a WebSocket stream"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.positions = {
+            f"pos_{index}": {'symbol': symbol, 'volume': 0.1, 'type': 'BUY', 'open_price': 1.1,
+                             'current_price': 1.1005, 'profit': 5.0, 'swap': 0.0,
+                             'commission': -0.7, 'position_id': f"pos_{index}"}
+            for index, symbol in enumerate(['EURUSD', 'GBPUSD', 'XAUUSD'])
+        }
+        self.account = {'balance': 10000.0, 'equity': 10015.0, 'margin': 33.0,
+                        'free_margin': 9982.0, 'margin_level': 30348.48}
+        self.subscriptions = []
+        self.rest_requests = 0
+        self.loop = asyncio.new_event_loop()
+        self.clients = set()
+        self.ws_server = None
+        self.ws_port = 0
+        self.snapshot_delay = 0.0
+
+    # REST
+
+    def start_rest(self) -> int:
+        broker = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                with broker.lock:
+                    broker.rest_requests += 1
+                    if self.path.startswith('/positions'):
+                        body = {'positions': list(broker.positions.values())}
+                    else:
+                        body = dict(broker.account)
+                payload = json.dumps(body).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server.server_address[1]
+
+    # WebSocket
+
+    async def _handler(self, websocket):
+        subscribe = json.loads(await websocket.recv())
+        self.subscriptions.append((subscribe, websocket.request.headers.get('Authorization')))
+        await asyncio.sleep(self.snapshot_delay)
+        with self.lock:
+            snapshot = {'type': 'snapshot', 'positions': list(self.positions.values()),
+                        'account': dict(self.account)}
+        await websocket.send(json.dumps(snapshot))
+        self.clients.add(websocket)
+        try:
+            await websocket.wait_closed()
+        finally:
+            self.clients.discard(websocket)
+
+    async def _start_ws(self):
+        self.ws_server = await ws_serve(self._handler, '127.0.0.1', self.ws_port)
+        self.ws_port = self.ws_server.sockets[0].getsockname()[1]
+
+    async def _stop_ws(self):
+        self.ws_server.close()
+        await self.ws_server.wait_closed()
+        self.ws_server = None
+
+    async def _broadcast(self, message: dict):
+        frame = json.dumps(message)
+        for websocket in list(self.clients):
+            try:
+                await websocket.send(frame)
+            except Exception:
+                pass
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(10)
+
+    def start(self):
+        threading.Thread(target=self.loop.run_forever, daemon=True).start()
+        self.rest_port = self.start_rest()
+        self.start_stream()
+
+    def start_stream(self):
+        self._call(self._start_ws())
+
+    def stop_stream(self):
+        self._call(self._stop_ws())
+
+    # Broker-side changes (pushed to stream clients)
+
+    def upsert_position(self, position: dict):
+        with self.lock:
+            self.positions[position['position_id']] = position
+        self._call(self._broadcast({'type': 'position', 'position': position}))
+
+    def close_position(self, position_id: str):
+        with self.lock:
+            self.positions.pop(position_id, None)
+        self._call(self._broadcast({'type': 'position_closed', 'position_id': position_id}))
+
+    def set_account(self, **changes):
+        with self.lock:
+            self.account.update(changes)
+            account = dict(self.account)
+        self._call(self._broadcast({'type': 'account', 'account': account}))
+
+
+def wait_until(condition, timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+def check(passed: bool, message: str) -> bool:
+    print(f"    {'✓' if passed else '✗'} {message}")
+    return passed
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Broker Streaming Test")
+    print("=" * 60)
+    print()
+    results = []
+
+    print("[1/6] Starting stand-in broker (REST + WebSocket stream)...")
+    stand_in = StandInBroker()
+    stand_in.start()
+    print(f"    ✓ REST on port {stand_in.rest_port}, stream on port {stand_in.ws_port}")
+    print()
+
+    config = BrokerConfig(
+        name="EXNESS", api_url=f"http://127.0.0.1:{stand_in.rest_port}", account_id=ACCOUNT_ID,
+        api_key="test-key", rate_limit={'requests_per_minute': 6000, 'requests_per_second': 100},
+        stream_url=f"ws://127.0.0.1:{stand_in.ws_port}/stream")
+    api = ExnessAPI(config)
+    broker = BrokerStateCache(api)
+    stream = api._get_stream()
+    stream.poll_interval = 0.2  # Fallback polling, so the test doesn't wait on the 5 s default
+    stream.reconnect_delay = 0.2
+
+    events = []
+    print("[2/6] Subscribing to positions and account...")
+    position_subscription = broker.subscribe_positions(events.append)
+    account_subscription = broker.subscribe_account(events.append)
+    results.append(check(wait_until(lambda: stream.mode == 'stream'
+                                    and len(stream.book.positions()) == 3),
+                         f"Streaming, snapshot of {len(stream.book.positions())} positions"))
+    results.append(check(bool(stand_in.subscriptions) and
+                         stand_in.subscriptions[0][0].get('account_id') == ACCOUNT_ID and
+                         stand_in.subscriptions[0][1] == 'Bearer test-key',
+                         "Subscribe message and auth header received by server"))
+    account = broker.get_account_info()
+    results.append(check(account.balance == 10000.0, f"Account from book: balance {account.balance}"))
+    print()
+
+    print("[3/6] Pushing position and account changes...")
+    rest_before = stand_in.rest_requests
+    events.clear()
+    started = time.perf_counter()
+    stand_in.upsert_position({'symbol': 'USDJPY', 'volume': 0.2, 'type': 'SELL',
+                              'open_price': 150.1, 'current_price': 150.1, 'profit': 0.0,
+                              'swap': 0.0, 'commission': -1.4, 'position_id': 'pos_9'})
+    opened = wait_until(lambda: any(e.kind == 'opened' for e in events))
+    results.append(check(opened, f"'opened' delivered in {(time.perf_counter() - started) * 1000:.1f} ms"))
+    stand_in.upsert_position(dict(stand_in.positions['pos_0'], current_price=1.1020, profit=20.0))
+    results.append(check(wait_until(lambda: any(e.kind == 'updated' for e in events)) and
+                         stream.book.get_position('pos_0').profit == 20.0,
+                         "'updated' applied to book (pos_0 profit 20.0)"))
+    stand_in.close_position('pos_1')
+    results.append(check(wait_until(lambda: any(e.kind == 'closed' for e in events)) and
+                         stream.book.get_position('pos_1') is None, "'closed' removed pos_1"))
+    stand_in.set_account(equity=10030.0)
+    results.append(check(wait_until(lambda: any(e.kind == 'account' for e in events)) and
+                         broker.get_account_info().equity == 10030.0, "'account' updated equity"))
+    symbols = sorted(pos.symbol for pos in broker.get_positions())
+    results.append(check(symbols == ['EURUSD', 'USDJPY', 'XAUUSD'], f"Positions from book: {symbols}"))
+    results.append(check(stand_in.rest_requests == rest_before,
+                         f"No REST requests while streaming ({stand_in.rest_requests - rest_before})"))
+    print()
+
+    print("[4/6] Dropping the stream (fallback to polling)...")
+    stand_in.stop_stream()
+    results.append(check(wait_until(lambda: stream.mode == 'poll'), f"Mode: {stream.mode}"))
+    events.clear()
+    with stand_in.lock:
+        stand_in.positions.pop('pos_9')  # Closed while the stream is down
+    results.append(check(wait_until(lambda: any(e.kind == 'closed' and e.source == 'poll'
+                                                for e in events)),
+                         "Close seen by REST polling"))
+    results.append(check(len(stream.book.positions()) == 2, "Book kept current while polling"))
+    rest_before = stand_in.rest_requests
+    results.append(check(broker.get_streamed_positions() is None and
+                         len(broker.get_positions()) == 2 and stand_in.rest_requests > rest_before,
+                         "Reads go to the REST API while the stream is down"))
+    print()
+
+    print("[5/6] Restoring the stream...")
+    stand_in.snapshot_delay = 0.5
+    stand_in.start_stream()
+    results.append(check(wait_until(lambda: len(stand_in.subscriptions) == 2, timeout=10) and
+                         stream.mode != 'stream' and broker.get_streamed_positions() is None,
+                         "Not live until the snapshot arrives"))
+    results.append(check(wait_until(lambda: stream.mode == 'stream', timeout=10),
+                         f"Mode: {stream.mode} (connects: {stream.connects})"))
+    events.clear()
+    stand_in.close_position('pos_2')
+    results.append(check(wait_until(lambda: any(e.kind == 'closed' and e.source == 'stream'
+                                                for e in events)),
+                         "Pushed updates resume after reconnect"))
+    print()
+
+    print("[6/6] Unsubscribing...")
+    position_subscription.cancel()
+    account_subscription.cancel()
+    results.append(check(stream.mode == 'stopped' and broker.get_streamed_positions() is None,
+                         "Stream stopped with its last subscription"))
+    print(f"    - Stats: {stream.get_stats()}")
+    api.close()
+    print()
+
+    print("=" * 60)
+    passed = sum(results)
+    print(f"{'✅' if passed == len(results) else '❌'} {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python
+"""
+Test Signal Coalescing
+Checks that a newer BUY/SELL replaces the pending one for the same
+symbol@broker, that CLOSE is never coalesced, and that routed fetches
+merge the per-route queues in dequeue order
+"""
+import sys
+import logging
+from pathlib import Path
+
+# Add python directory to path
+script_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(script_dir / "python"))
+
+from bridge.signal_manager import TradeSignal, SignalManager
+
+logging.disable(logging.WARNING)
+
+
+def make_signal(signal_id: str, action: str = 'BUY', symbol: str = 'EURUSD',
+                broker: str = 'EXNESS', **kwargs) -> TradeSignal:
+    return TradeSignal(symbol=symbol, action=action, broker=broker, lot_size=0.01,
+                       signal_id=signal_id, **kwargs)
+
+
+def check(passed: bool, message: str) -> bool:
+    print(f"    {'✓' if passed else '✗'} {message}")
+    return passed
+
+
+def ids(signals) -> list:
+    return [signal.signal_id for signal in signals]
+
+
+def test_coalescing(results: list):
+    print("[1/1] Coalescing...")
+    manager = SignalManager(coalesce=True)
+    manager.add_signal(make_signal('c_buy'))
+    manager.add_signal(make_signal('c_close', action='CLOSE'))
+    manager.add_signal(make_signal('c_sell', action='SELL'))
+    manager.add_signal(make_signal('c_other', symbol='GBPUSD'))
+    manager.add_signal(make_signal('c_buy2'))
+    results.append(check(ids(manager.queue) == ['c_close', 'c_other', 'c_buy2'] and
+                         manager.coalesced == 2,
+                         f"Newer BUY/SELL replaces the pending one: {ids(manager.queue)}"))
+    manager.add_signal(make_signal('c_close2', action='CLOSE'))
+    results.append(check(ids(manager.queue) == ['c_close', 'c_other', 'c_buy2', 'c_close2'],
+                         "CLOSE is never replaced and never replaces"))
+
+    manager = SignalManager(ordering='priority', coalesce=True)
+    manager.add_signal(make_signal('p_low', priority=1))
+    manager.add_signal(make_signal('p_icm', broker='ICM', symbol='GBPUSD', priority=5))
+    manager.add_signal(make_signal('p_high', symbol='USDJPY', priority=9, terminal='T1'))
+    manager.add_signal(make_signal('p_low2', priority=3))
+    results.append(check(ids(manager.get_signals(broker='EXNESS', terminal='T2')) == ['p_low2'],
+                         "Routed fetch skips other brokers and terminals"))
+    results.append(check(ids(manager.get_signals()) == ['p_high', 'p_icm'],
+                         "Remaining signals merged across routes in priority order"))
+    print()
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Signal Coalescing Test")
+    print("=" * 60)
+    print()
+    results = []
+
+    test_coalescing(results)
+
+    print("=" * 60)
+    passed = sum(results)
+    print(f"{'✅' if passed == len(results) else '❌'} {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""
+Test Signal Dedup
+Checks that resent signals are rejected inside the dedup window, accepted
+again once it passes, and that no ID inside the window is evicted by default
+"""
+import sys
+import time
+import logging
+from pathlib import Path
+
+# Add python directory to path
+script_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(script_dir / "python"))
+
+from bridge.signal_manager import TradeSignal, SignalManager
+
+logging.disable(logging.WARNING)
+
+
+def make_signal(signal_id: str, action: str = 'BUY', symbol: str = 'EURUSD',
+                broker: str = 'EXNESS', **kwargs) -> TradeSignal:
+    return TradeSignal(symbol=symbol, action=action, broker=broker, lot_size=0.01,
+                       signal_id=signal_id, **kwargs)
+
+
+def check(passed: bool, message: str) -> bool:
+    print(f"    {'✓' if passed else '✗'} {message}")
+    return passed
+
+
+def ids(signals) -> list:
+    return [signal.signal_id for signal in signals]
+
+
+def test_dedup(results: list):
+    print("[1/1] Dedup window...")
+    manager = SignalManager(dedup_window=0.2)
+    manager.add_signal(make_signal('dup'))
+    results.append(check(manager.add_signal(make_signal('dup')) == (False, "Duplicate signal"),
+                         "Resent signal rejected inside the window"))
+    manager.get_signals()
+    time.sleep(0.3)
+    results.append(check(manager.add_signal(make_signal('dup')) == (True, None) and
+                         manager.get_stats()['dedup_entries'] == 1,
+                         "Accepted again once the window passed"))
+
+    manager = SignalManager(dedup_window=60)
+    for index in range(2000):
+        manager.add_signal(make_signal(f"many_{index}", symbol=f"SYM{index}"))
+    stats = manager.get_stats()
+    results.append(check(manager.add_signal(make_signal('many_0', symbol='SYM0'))[1] ==
+                         "Duplicate signal" and stats['dedup_evicted'] == 0,
+                         "No cap by default: every ID inside the window is remembered"))
+    print()
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Signal Dedup Test")
+    print("=" * 60)
+    print()
+    results = []
+
+    test_dedup(results)
+
+    print("=" * 60)
+    passed = sum(results)
+    print(f"{'✅' if passed == len(results) else '❌'} {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
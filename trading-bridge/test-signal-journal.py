@@ -0,0 +1,187 @@
+#!/usr/bin/env python
+"""
+Test Signal Journal
+Restarts a journaled SignalManager and checks that pending signals and
+history are replayed (even past a lowered queue limit), that a torn or
+corrupt tail is dropped without losing earlier records, and that
+compaction keeps everything live
+"""
+import sys
+import time
+import logging
+import tempfile
+import zlib
+from pathlib import Path
+
+# Add python directory to path
+script_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(script_dir / "python"))
+
+from bridge.journal import SignalJournal, RECORD_HEADER, RECORD_ADD
+from bridge.signal_manager import TradeSignal, SignalManager
+
+logging.disable(logging.WARNING)
+
+
+def make_signal(signal_id: str, symbol: str = 'EURUSD', **kwargs) -> TradeSignal:
+    return TradeSignal(symbol=symbol, action='BUY', broker='EXNESS', lot_size=0.01,
+                       signal_id=signal_id, **kwargs)
+
+
+def check(passed: bool, message: str) -> bool:
+    print(f"    {'✓' if passed else '✗'} {message}")
+    return passed
+
+
+def ids(signals) -> list:
+    return [signal.signal_id for signal in signals]
+
+
+def restart(path: Path, **kwargs):
+    """Open the journal and a SignalManager replaying it"""
+    journal = SignalJournal(path, **kwargs)
+    return journal, SignalManager(journal=journal)
+
+
+def test_replay(directory: Path, results: list):
+    print("[1/4] Replay after restart...")
+    path = directory / "replay.journal"
+    journal, manager = restart(path, sync='always')
+    for index in range(10):
+        manager.add_signal(make_signal(f"r_{index}"))
+    delivered = manager.get_signals(4)
+    in_flight = manager.get_signals(2, ack=True)
+    manager.add_signal(make_signal('r_ttl', ttl=0.2))
+    journal.close()
+    time.sleep(0.3)
+
+    journal, manager = restart(path)
+    pending = ids(manager.queue)
+    results.append(check(pending == ['r_4', 'r_5'] + [f"r_{index}" for index in range(6, 10)],
+                         f"Pending and unacknowledged signals restored in order "
+                         f"({manager.restored} in {manager.replay_seconds * 1000:.1f} ms)"))
+    results.append(check('r_ttl' not in pending and manager.get_stats()['expired'] == 1,
+                         "Signal that expired while down is not restored"))
+    results.append(check(ids(manager.get_history()) == ids(delivered) + ids(in_flight),
+                         f"History restored: {manager.restored_history} signals"))
+    results.append(check(manager.add_signal(make_signal('r_0')) == (False, "Duplicate signal"),
+                         "Delivered signals still deduplicated after restart"))
+    manager.get_signals()
+    results.append(check(len(manager.get_history()) == 10,
+                         "Redelivered in-flight signals are not added to history twice"))
+    journal.close()
+    print()
+
+
+def test_queue_limit(directory: Path, results: list):
+    print("[2/4] Replay into a smaller queue...")
+    path = directory / "limit.journal"
+    journal, manager = restart(path, sync='always')
+    for index in range(5):
+        manager.add_signal(make_signal(f"q_{index}"))
+    journal.close()
+
+    journal = SignalJournal(path, sync='always')
+    manager = SignalManager(max_queue_size=2, journal=journal)
+    results.append(check(manager.get_queue_size() == 5 and manager.restored == 5,
+                         f"All {manager.restored} pending signals restored past max_queue_size=2"))
+    results.append(check(manager.add_signal(make_signal('q_new')) == (False, "Queue is full"),
+                         "New signals refused until the queue drains"))
+    journal.close()
+
+    journal = SignalJournal(path)
+    manager = SignalManager(max_queue_size=10, journal=journal)
+    results.append(check(ids(manager.queue) == [f"q_{index}" for index in range(5)],
+                         "Nothing dropped from the journal: all 5 restored again"))
+    journal.close()
+    print()
+
+
+def test_torn_write(directory: Path, results: list):
+    print("[3/4] Torn and corrupt tails...")
+    path = directory / "torn.journal"
+    journal, manager = restart(path, sync='always')
+    for index in range(5):
+        manager.add_signal(make_signal(f"t_{index}"))
+    end = journal.get_stats()['bytes_used']
+    journal.close()
+
+    # A record whose payload never fully reached disk: CRC mismatch
+    payload = make_signal('t_torn').to_json().encode('utf-8')
+    crc = zlib.crc32(payload, zlib.crc32(bytes([RECORD_ADD])))
+    with open(path, 'r+b') as f:
+        f.seek(end)
+        f.write(RECORD_HEADER.pack(len(payload), crc, RECORD_ADD) + payload[:len(payload) // 2])
+    journal, manager = restart(path, sync='always')
+    results.append(check(ids(manager.queue) == [f"t_{index}" for index in range(5)],
+                         "Records before a torn write replayed, torn record dropped"))
+    results.append(check(journal.get_stats()['bytes_used'] == end,
+                         "Appends resume where the valid data ends"))
+    manager.add_signal(make_signal('t_after'))
+    journal.close()
+
+    # A header claiming more bytes than the segment holds
+    journal, manager = restart(path, sync='always')
+    end = journal.get_stats()['bytes_used']
+    journal.close()
+    with open(path, 'r+b') as f:
+        f.seek(end)
+        f.write(RECORD_HEADER.pack(1 << 30, 0, RECORD_ADD))
+    journal, manager = restart(path)
+    results.append(check(ids(manager.queue)[-1] == 't_after' and len(manager.queue) == 6,
+                         "Oversized header treated as the end of the journal"))
+    journal.close()
+    print()
+
+
+def test_compaction(directory: Path, results: list):
+    print("[4/4] Background compaction...")
+    path = directory / "compact.journal"
+    journal = SignalJournal(path, segment_size=64 * 1024, max_history=100)
+    manager = SignalManager(journal=journal, max_history=100)
+    for index in range(2400):
+        manager.add_signal(make_signal(f"c_{index}", comment='x' * 50))
+        if index % 3:
+            manager.get_signals(1)
+    deadline = time.monotonic() + 5
+    while journal.get_stats()['compactions'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stats = journal.get_stats()
+    results.append(check(stats['compactions'] > 0,
+                         f"Compacted on the journal thread ({stats['compactions']}x, "
+                         f"{stats['bytes_used']} of {stats['segment_size']} bytes used)"))
+    pending = ids(manager.queue)
+    history = ids(manager.get_history())
+    journal.close()
+
+    journal, manager = restart(path, max_history=100)
+    results.append(check(ids(manager.queue) == pending and ids(manager.get_history()) == history,
+                         f"Replay after compaction: {len(pending)} pending, "
+                         f"{len(history)} history"))
+    journal.close()
+    print()
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Signal Journal Test")
+    print("=" * 60)
+    print()
+    results = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        directory = Path(tmp)
+        test_replay(directory, results)
+        test_queue_limit(directory, results)
+        test_torn_write(directory, results)
+        test_compaction(directory, results)
+
+    print("=" * 60)
+    passed = sum(results)
+    print(f"{'✅' if passed == len(results) else '❌'} {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""
+Test Signal TTL
+Checks that signals past their TTL are rejected on add and dropped at
+dequeue, including expiries parsed from UTC ISO strings
+"""
+import sys
+import time
+import logging
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add python directory to path
+script_dir = Path(__file__).parent.absolute()
+sys.path.insert(0, str(script_dir / "python"))
+
+from bridge.signal_manager import TradeSignal, SignalManager
+
+logging.disable(logging.WARNING)
+
+
+def make_signal(signal_id: str, action: str = 'BUY', symbol: str = 'EURUSD',
+                broker: str = 'EXNESS', **kwargs) -> TradeSignal:
+    return TradeSignal(symbol=symbol, action=action, broker=broker, lot_size=0.01,
+                       signal_id=signal_id, **kwargs)
+
+
+def check(passed: bool, message: str) -> bool:
+    print(f"    {'✓' if passed else '✗'} {message}")
+    return passed
+
+
+def ids(signals) -> list:
+    return [signal.signal_id for signal in signals]
+
+
+def test_ttl(results: list):
+    print("[1/1] TTL expiry...")
+    manager = SignalManager(default_ttl=0.2)
+    manager.add_signal(make_signal('ttl_default'))
+    manager.add_signal(make_signal('ttl_long', symbol='GBPUSD', ttl=60))
+    time.sleep(0.3)
+    results.append(check(ids(manager.get_signals()) == ['ttl_long'] and
+                         manager.get_stats()['expired'] == 1,
+                         "Signal past default_ttl dropped at dequeue"))
+    success, error = manager.add_signal(make_signal(
+        'ttl_stale', timestamp=datetime.now() - timedelta(seconds=10), ttl=5))
+    results.append(check(not success and error == "Signal expired",
+                         f"Already-expired signal rejected: {error}"))
+
+    # Signals parsed from UTC ISO strings carry tz-aware datetimes
+    past = (datetime.now(timezone.utc) - timedelta(minutes=1)).isoformat().replace('+00:00', 'Z')
+    future = (datetime.now(timezone.utc) + timedelta(minutes=1)).isoformat()
+    aware = {'symbol': 'EURUSD', 'action': 'BUY', 'broker': 'EXNESS', 'lot_size': 0.01}
+    expired = TradeSignal.from_dict(dict(aware, signal_id='utc_past', expires_at=past))
+    valid = TradeSignal.from_dict(dict(aware, signal_id='utc_future', expires_at=future))
+    results.append(check(expired.is_expired() and not valid.is_expired() and
+                         manager.add_signal(expired) == (False, "Signal expired") and
+                         manager.add_signal(valid) == (True, None),
+                         "UTC expiry ('Z' / '+00:00') compared with local time"))
+    print()
+
+
+def main() -> int:
+    print("=" * 60)
+    print("Signal TTL Test")
+    print("=" * 60)
+    print()
+    results = []
+
+    test_ttl(results)
+
+    print("=" * 60)
+    passed = sum(results)
+    print(f"{'✅' if passed == len(results) else '❌'} {passed}/{len(results)} checks passed")
+    print("=" * 60)
+    return 0 if passed == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())